@@ -0,0 +1,134 @@
+import subprocess
+import sys
+import time
+from os import listdir, stat
+from os.path import join
+
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "openpyxl", "pdfkit", "jinja2", "requests", "prettytable")
+IMPORT_TIME_BUDGET = 0.3
+
+
+def measure_import_time(module_name, repeat=5):
+    """Замер времени импорта модуля в отдельном интерпретаторе через python -X importtime
+
+    Args:
+        module_name (str): Имя модуля
+        repeat (int): Количество замеров; берётся лучший
+
+    Returns:
+        tuple[float, set[str]]: Время импорта модуля в секундах вместе с зависимостями и имена всех
+            импортированных при этом модулей верхнего уровня
+    """
+    best_time, imported_modules = None, set()
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                                 capture_output=True, text=True, check=True)
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            (_, cumulative, name) = line[len("import time:"):].split("|")
+            name = name.strip()
+            imported_modules.add(name.split(".")[0])
+            if name == module_name and (best_time is None or int(cumulative) / 1e6 < best_time):
+                best_time = int(cumulative) / 1e6
+    return best_time, imported_modules
+
+
+def benchmark_imports(module_names=("main", "vacancy", "statistics")):
+    """Печать времени импорта точек входа и проверка бюджета времени запуска
+
+    Args:
+        module_names (tuple[str]): Имена модулей
+
+    Returns:
+        bool: Уложились ли все модули в бюджет и не загрузили ли тяжёлых зависимостей
+    """
+    success = True
+    for module_name in module_names:
+        (import_time, imported_modules) = measure_import_time(module_name)
+        heavy_modules = sorted(imported_modules.intersection(HEAVY_MODULES))
+        success = success and import_time <= IMPORT_TIME_BUDGET and len(heavy_modules) == 0
+        print(f"import {module_name}: {import_time * 1000:.1f} мс, тяжёлые зависимости: {heavy_modules or 'нет'}")
+    return success
+
+
+def benchmark_csv_engines(folder_path="years", engines=("csv", "pandas", "pyarrow"), repeat=3):
+    """Печать времени чтения csv файлов папки разными способами DataSet.iter_csv_rows и проверка, что все способы
+        читают одинаковые строки. Недоступные способы пропускаются
+
+    Args:
+        folder_path (str): Папка с csv файлами
+        engines (tuple[str]): Способы чтения
+        repeat (int): Количество замеров; берётся лучший
+
+    Returns:
+        bool: Совпали ли строки у всех доступных способов
+    """
+    from importlib.util import find_spec
+    from statistics import DataSet
+
+    file_paths = sorted(join(folder_path, file) for file in listdir(folder_path) if file.endswith(".csv"))
+    success, expected_rows = True, None
+    for engine in engines:
+        if engine != "csv" and find_spec(engine) is None:
+            print(f"{engine}: не установлен")
+            continue
+        best_time = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = [list(DataSet.iter_csv_rows(file_path, engine)) for file_path in file_paths]
+            elapsed = time.perf_counter() - start
+            best_time = elapsed if best_time is None else min(best_time, elapsed)
+        expected_rows = rows if expected_rows is None else expected_rows
+        success = success and rows == expected_rows
+        print(f"{engine}: {best_time * 1000:.1f} мс, строк: {sum(len(file_rows) - 1 for file_rows in rows)}")
+    return success
+
+
+def benchmark_compression(folder_path="years", compressions=("", ".gz", ".bz2", ".xz", ".zst"), level=None,
+                          vacancy_name="Программист", processes=2):
+    """Печать размера и времени полного расчёта статистики calculate_statistics по csv файлам папки, сжатым разными
+        способами, и проверка, что отчёты совпадают. Недоступные способы пропускаются
+
+    Args:
+        folder_path (str): Папка с csv файлами
+        compressions (tuple[str]): Расширения сжатия; "" - без сжатия
+        level (int | None): Уровень сжатия; None - из COMPRESSION_LEVELS
+        vacancy_name (str): Название профессии
+        processes (int): Количество процессов общего пула
+
+    Returns:
+        bool: Совпали ли отчёты у всех доступных способов
+    """
+    import shutil
+    import tempfile
+    from importlib.util import find_spec
+    from statistics import calculate_statistics
+    from vacancy import COMPRESSIONS, open_compressed
+
+    file_names = sorted(file for file in listdir(folder_path) if file.endswith(".csv"))
+    success, expected_report = True, None
+    with tempfile.TemporaryDirectory() as folder:
+        for compression in compressions:
+            if compression != "" and find_spec(COMPRESSIONS[compression].split(".")[0]) is None:
+                print(f"{compression}: не установлен {COMPRESSIONS[compression]}")
+                continue
+            file_paths = [join(folder, file + compression) for file in file_names]
+            for (file, file_path) in zip(file_names, file_paths):
+                with open(join(folder_path, file), "rb") as source, open_compressed(file_path, "wb", level) as target:
+                    shutil.copyfileobj(source, target)
+            size = sum(stat(file_path).st_size for file_path in file_paths)
+            start = time.perf_counter()
+            report = calculate_statistics(file_paths, vacancy_name, processes)
+            elapsed = time.perf_counter() - start
+            expected_report = vars(report) if expected_report is None else expected_report
+            success = success and vars(report) == expected_report
+            print(f"{compression or 'без сжатия'}: {size / 1024 / 1024:.1f} МБ, {elapsed * 1000:.1f} мс")
+    return success
+
+
+BENCHMARKS = {"imports": benchmark_imports, "csv": benchmark_csv_engines, "compression": benchmark_compression}
+
+if __name__ == '__main__':
+    results = [BENCHMARKS[name]() for name in (sys.argv[1:] or BENCHMARKS)]
+    sys.exit(0 if all(results) else 1)
@@ -1,10 +1,6 @@
-from vacancy import get_vacancies
-from statistics import get_statistics
-from statistics import HHruApiConnect
-
-
 def main_function():
-    """Выбор типа анализа данных из csv-файла
+    """Выбор типа анализа данных из csv-файла. Модули анализа импортируются только на выбранном пути, чтобы
+        не загружать pandas, matplotlib и прочие тяжёлые зависимости там, где они не нужны
 
     """
     main_input_request = "Выберите тип вывода: "
@@ -14,12 +10,15 @@ def main_function():
         print("Введён неправильный тип вывода")
         return
     # if main_input_info == "Вакансии":
+    #     from vacancy import get_vacancies
     #     get_vacancies()
     # else:
+    from statistics import get_statistics
     get_statistics()
 
 
 def test():
+    from statistics import HHruApiConnect
     hh = HHruApiConnect()
     hh.save_vacancy_data_for_past_day()
 
@@ -1,22 +1,42 @@
+import atexit
 import operator
 import multiprocessing
 import time
-import pdfkit
-import requests
 import csv
+import re
 import json
+import shutil
+import hashlib
+import heapq
+import io
+import math
+import pickle
 import sqlite3
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+import tempfile
+import threading
+import queue
+import traceback
+import warnings
 import xml.etree.ElementTree as ET
-from os import listdir, stat
+from multiprocessing import shared_memory
+from os import listdir, stat, fstat, replace, makedirs, remove, scandir, utime, getpid, name as os_name
 from os.path import isfile, join
-from functools import reduce, cmp_to_key
-from openpyxl import Workbook
-from openpyxl.styles import Font, Border, Side
-from jinja2 import Environment, FileSystemLoader
-from locale import atof, setlocale, LC_NUMERIC
+from pathlib import Path
+from functools import reduce, cmp_to_key, lru_cache
+from itertools import zip_longest
+from vacancy import find_csv_chunk_borders, read_csv_chunk, CHUNK_SIZE, COMPRESSIONS, get_compression, \
+    open_compressed, open_text_file
+
+CSV_ENGINES = ("auto", "csv", "pandas", "pyarrow")
+PARTITIONS = ("year", "month")
+PARTITION_MANIFEST = "manifest.json"
+PUBLISHED_AT_PATTERN = re.compile(rb'(\d{4})-\d\d-\d\dT\d\d:\d\d:\d\d')
+HTTP_CACHE_DIR = ".http_cache"
+HTTP_CACHE_MAX_SIZE = 256 * 1024 * 1024
+CBR_CURRENT_MONTH_TTL = 24 * 60 * 60
+HHRU_TTL = 10 * 60
+HHRU_CLOSED_DAY_TTL = 7 * 24 * 60 * 60
+WORKER_POLL_INTERVAL = 1.0
 
 
 class Vacancy:
@@ -60,6 +80,189 @@ class Vacancy:
         self.published_at = published_at
 
 
+class HttpCacheMiss(LookupError):
+    """Ответа нет в кэше, а кэш работает в автономном режиме"""
+
+
+class HttpCache:
+    """Кэш ответов HTTP на диске, общий для ApiReader и HHruApiConnect. Ключ - адрес и параметры запроса. Запись
+        свежа, пока не истёк её срок (ttl), заданный источником; записи без срока не устаревают. Устаревшая запись
+        проверяется условным запросом по ETag и Last-Modified, если сервер их прислал, и при ответе 304 не
+        скачивается заново. Самые давно использованные записи вытесняются, пока кэш больше max_size; папка
+        просматривается только при первой записи и когда оценка её размера превышает max_size. В автономном
+        режиме ответы берутся только из кэша, в том числе устаревшие
+
+    Attributes:
+        cache_dir (str): Папка с файлами кэша
+        max_size (int): Наибольший размер папки кэша в байтах
+        offline (bool): Автономный режим: без запросов к серверу
+        size (int | None): Оценка размера папки кэша в байтах: размер при последнем просмотре плюс записи этого
+            объекта; None - папка ещё не просматривалась
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_size=HTTP_CACHE_MAX_SIZE, offline=False):
+        """Инициализация объекта HttpCache
+
+        Args:
+            cache_dir (str): Папка с файлами кэша; создаётся при первой записи
+            max_size (int): Наибольший размер папки кэша в байтах
+            offline (bool): Автономный режим
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.offline = offline
+        self.size = None
+
+    @staticmethod
+    def get_key(url, params=None):
+        """Ключ записи: хэш адреса и параметров, не зависящий от порядка параметров
+
+        Args:
+            url (str): Адрес
+            params (dict[str: object] | None): Параметры запроса
+
+        Returns:
+            str: Ключ записи
+        """
+        request = json.dumps([url, sorted((params or {}).items())], ensure_ascii=False, default=str)
+        return hashlib.blake2b(request.encode(), digest_size=16).hexdigest()
+
+    def get_path(self, url, params=None):
+        """Путь к файлу записи
+
+        Args:
+            url (str): Адрес
+            params (dict[str: object] | None): Параметры запроса
+
+        Returns:
+            str: Путь к файлу записи
+        """
+        return join(self.cache_dir, f"{self.get_key(url, params)}.pickle")
+
+    @staticmethod
+    def read_entry(path):
+        """Чтение записи; использованная запись становится самой новой для вытеснения
+
+        Args:
+            path (str): Путь к файлу записи
+
+        Returns:
+            dict[str: object] | None: Запись с ключами body, etag, last_modified, expires_at; None - записи нет
+        """
+        try:
+            with open(path, 'rb') as file:
+                entry = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        utime(path)
+        return entry
+
+    def write_entry(self, path, entry):
+        """Запись через временный файл. Оценка размера кэша увеличивается на разницу размеров новой и прежней
+            записи; самые старые записи вытесняются, только если оценка больше max_size
+
+        Args:
+            path (str): Путь к файлу записи
+            entry (dict[str: object]): Запись
+        """
+        makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{path}.{getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(entry, file, pickle.HIGHEST_PROTOCOL)
+            entry_size = file.tell()
+        try:
+            old_size = stat(path).st_size
+        except FileNotFoundError:
+            old_size = 0
+        replace(temp_path, path)
+        if self.size is not None:
+            self.size += entry_size - old_size
+        if self.size is None or self.size > self.max_size:
+            self.evict(path)
+
+    def evict(self, kept_path):
+        """Просмотр папки кэша и вытеснение самых давно использованных записей, пока кэш больше max_size. Записи,
+            которые за это время удалил другой процесс, пропускаются
+
+        Args:
+            kept_path (str): Путь к только что сохранённой записи, которая не вытесняется
+        """
+        (size, entries) = (0, [])
+        for cache_entry in scandir(self.cache_dir):
+            if not cache_entry.name.endswith(".pickle"):
+                continue
+            try:
+                entry_stat = cache_entry.stat()
+            except FileNotFoundError:
+                continue
+            size += entry_stat.st_size
+            if cache_entry.path != kept_path:
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, cache_entry.path))
+        for (_, entry_size, entry_path) in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                remove(entry_path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self.size = size
+
+    def store(self, url, body, params=None, ttl=None, etag=None, last_modified=None):
+        """Сохранение ответа
+
+        Args:
+            url (str): Адрес
+            body (bytes): Тело ответа
+            params (dict[str: object] | None): Параметры запроса
+            ttl (float | None): Срок свежести в секундах; None - не устаревает
+            etag (str | None): Заголовок ETag ответа
+            last_modified (str | None): Заголовок Last-Modified ответа
+        """
+        self.write_entry(self.get_path(url, params), {
+            "url": url, "params": params, "body": body, "etag": etag, "last_modified": last_modified,
+            "expires_at": None if ttl is None else time.time() + ttl})
+
+    def get(self, url, params=None, ttl=None, delay=0):
+        """Получение тела ответа на GET запрос из кэша или с сервера
+
+        Args:
+            url (str): Адрес
+            params (dict[str: object] | None): Параметры запроса
+            ttl (float | None): Срок свежести нового или проверенного ответа в секундах; None - не устаревает
+            delay (float): Пауза после запроса к серверу в секундах, чтобы не превышать ограничения источника
+
+        Returns:
+            bytes: Тело ответа
+        """
+        path = self.get_path(url, params)
+        entry = self.read_entry(path)
+        if entry is not None and (self.offline or entry["expires_at"] is None or time.time() < entry["expires_at"]):
+            return entry["body"]
+        if self.offline:
+            raise HttpCacheMiss(f"Нет ответа в кэше: {url} {params or ''}")
+        import requests
+
+        headers = {}
+        if entry is not None and entry["etag"] is not None:
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry["last_modified"] is not None:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        response = requests.get(url, params, headers=headers)
+        try:
+            if response.status_code == 304 and entry is not None:
+                (body, etag, last_modified) = (entry["body"], entry["etag"], entry["last_modified"])
+            else:
+                response.raise_for_status()
+                (body, etag, last_modified) = (response.content, response.headers.get("ETag"),
+                                               response.headers.get("Last-Modified"))
+        finally:
+            response.close()
+        self.store(url, body, params, ttl, etag, last_modified)
+        time.sleep(delay)
+        return body
+
+
 class ApiReader:
     """Класс для получения данных из внешних api и формировании по ним файлов
 
@@ -67,16 +270,21 @@ class ApiReader:
         connect (sqlite3.connect): Объект управления базой данных
         cursor (sqlite3.connect): Объект управления базой данных
         db_path (str): Путь к базе данных
+        http_cache (HttpCache): Кэш ответов ЦБ РФ
     """
-    def __init__(self, db_path):
+    CBR_URL = "http://www.cbr.ru/scripts/XML_daily.asp"
+
+    def __init__(self, db_path, http_cache=None):
         """Инициализация объекта CurrencyApiConnect
 
         Args:
             db_path (str): Путь к базе данных
+            http_cache (HttpCache | None): Кэш ответов; None - кэш в папке HTTP_CACHE_DIR
         """
         self.connect = sqlite3.connect(db_path)
         self.cursor = self.connect.cursor()
         self.db_path = db_path
+        self.http_cache = http_cache or HttpCache()
 
     def get_currency_quotes(self, year_borders):
         """Получение обозначений валют и соответствующих им значений котировок по диапазону годов
@@ -87,19 +295,76 @@ class ApiReader:
         Returns:
             dict[str: dict[str: float]]: Месяц и соответствующие котировки валют по месяцам
         """
-        setlocale(LC_NUMERIC, 'French_Canada.1252')
-        quotes_for_months = {}
-        for year in range(int(year_borders[0]), int(year_borders[1]) + 1):
-            for month in range(1, 13):
-                month = format(month, '02d')
-                req = requests.get(f"http://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{month}/{year}")
-                root_node = ET.ElementTree(ET.fromstring(req.text)).getroot()
-                quotes = {tag.find('CharCode').text: atof(tag.find('Value').text) / atof(tag.find('Nominal').text)
-                          for tag in root_node.findall('Valute')}
-                quotes_for_months[f"{year}-{month}"] = quotes
-                req.close()
-                time.sleep(0.03)
-        return quotes_for_months
+        return {month: self.get_month_quotes(month) for month in self.get_months(year_borders)}
+
+    def get_month_quotes(self, month):
+        """Получение котировок всех валют ЦБ РФ на первое число месяца через кэш ответов (см. get_month_ttl)
+
+        Args:
+            month (str): Месяц вида "2022-01"
+
+        Returns:
+            dict[str: float]: Котировки валют
+        """
+        (year, month_number) = month.split("-")
+        body = self.http_cache.get(self.CBR_URL, {"date_req": f"01/{month_number}/{year}"},
+                                   self.get_month_ttl(month), delay=0.03)
+        root_node = ET.ElementTree(ET.fromstring(body)).getroot()
+        return {tag.find('CharCode').text: self.parse_quote(tag.find('Value').text) / self.parse_quote(
+            tag.find('Nominal').text) for tag in root_node.findall('Valute')}
+
+    @staticmethod
+    def parse_quote(value):
+        """Разбор числа из ответа ЦБ РФ, в котором дробная часть отделяется запятой, без смены локали
+
+        Args:
+            value (str): Число вида "60,5000"
+
+        Returns:
+            float: Число
+        """
+        return float(value.replace(",", ".").replace("\xa0", "").replace(" ", ""))
+
+    @staticmethod
+    def get_month_ttl(month, today=None):
+        """Срок свежести котировок месяца: котировки прошедших месяцев уже не меняются и не устаревают
+
+        Args:
+            month (str): Месяц вида "2022-01"
+            today (str | None): Текущая дата вида "2022-01-31"; None - сегодня
+
+        Returns:
+            int | None: Срок в секундах; None - не устаревает
+        """
+        today = today or time.strftime('%Y-%m-%d')
+        return None if month < today[:7] else CBR_CURRENT_MONTH_TTL
+
+    @staticmethod
+    def get_months(year_borders):
+        """Получение всех месяцев диапазона годов
+
+        Args:
+            year_borders (tuple[str, str]): Первый и последний год
+
+        Returns:
+            list[str]: Месяцы вида "2022-01" по возрастанию
+        """
+        return [f"{year}-{month:02d}" for year in range(int(year_borders[0]), int(year_borders[1]) + 1)
+                for month in range(1, 13)]
+
+    @staticmethod
+    def select_currency_quotes(quotes_for_month, currencies):
+        """Выбор котировок нужных валют за месяц в том виде, в каком они хранятся в db файле: у рубля котировка 1,
+            у отсутствующей валюты - None
+
+        Args:
+            quotes_for_month (dict[str: float]): Котировки всех валют за месяц
+            currencies (list[str]): Названия валют
+
+        Returns:
+            dict[str: float | None]: Котировки нужных валют
+        """
+        return {currency: quotes_for_month.get(currency, None) if currency != 'RUR' else 1 for currency in currencies}
 
     def save_currency_quotes_in_db(self, quotes_for_months, currencies):
         """Запись котировок валют в db файл
@@ -128,8 +393,7 @@ class ApiReader:
         query = db_query_join("INSERT INTO quotes\nVALUES(?, ", '', ', ', ['?' for _ in currencies])
         for (date, quotes_for_month) in quotes_for_months.items():
             quotes = tuple([date])
-            quotes += tuple(list(map(lambda currency: quotes_for_month.get(currency, None)
-            if currency != 'RUR' else 1, currencies)))
+            quotes += tuple(self.select_currency_quotes(quotes_for_month, currencies).values())
             self.cursor.execute(query, quotes)
         self.connect.commit()
 
@@ -151,7 +415,115 @@ class ApiReader:
         return quotes_for_years
 
 
+class QuotesPrefetcher(threading.Thread):
+    """Фоновый поток, который скачивает котировки ЦБ РФ по запрошенным месяцам, пока основной поток разбирает
+        csv файл. Месяцы скачиваются в порядке запроса, каждый один раз
+
+    Attributes:
+        api_reader (ApiReader): Объект для запросов котировок
+        quotes (dict[str: dict[str: float]]): Скачанные котировки по месяцам в порядке запроса
+        requested (list[str]): Запрошенные месяцы в порядке запроса
+        error (Exception | None): Ошибка скачивания
+    """
+
+    def __init__(self, api_reader):
+        """Инициализация объекта QuotesPrefetcher
+
+        Args:
+            api_reader (ApiReader): Объект для запросов котировок
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.api_reader = api_reader
+        self.quotes = {}
+        self.requested = []
+        self.error = None
+        self.stopped = False
+        self.months = queue.Queue()
+        self.condition = threading.Condition()
+
+    def request(self, months):
+        """Добавление месяцев в очередь скачивания; уже запрошенные месяцы пропускаются
+
+        Args:
+            months (Iterable[str]): Месяцы вида "2022-01"
+        """
+        for month in months:
+            if month not in self.requested:
+                self.requested.append(month)
+                self.months.put(month)
+
+    def run(self):
+        """Скачивает котировки месяцев из очереди до остановки или первой ошибки
+
+        """
+        while True:
+            month = self.months.get()
+            if month is None or self.stopped:
+                break
+            try:
+                quotes = self.api_reader.get_month_quotes(month)
+            except Exception as exception:
+                with self.condition:
+                    self.error = exception
+                    self.condition.notify_all()
+                break
+            with self.condition:
+                self.quotes[month] = quotes
+                self.condition.notify_all()
+
+    def get(self, month):
+        """Ожидание котировок запрошенного месяца
+
+        Args:
+            month (str): Месяц вида "2022-01"
+
+        Returns:
+            dict[str: float]: Котировки всех валют за месяц
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: month in self.quotes or self.error is not None)
+            if month not in self.quotes:
+                raise self.error
+            return self.quotes[month]
+
+    def stop(self):
+        """Остановка потока после текущего запроса
+
+        """
+        self.stopped = True
+        self.months.put(None)
+
+
 class HHruApiConnect:
+    """Класс для выгрузки вакансий HH.ru за прошедший день
+
+    Attributes:
+        http_cache (HttpCache): Кэш ответов HH.ru
+    """
+    HHRU_URL = 'https://api.hh.ru/vacancies'
+
+    def __init__(self, http_cache=None):
+        """Инициализация объекта HHruApiConnect
+
+        Args:
+            http_cache (HttpCache | None): Кэш ответов; None - кэш в папке HTTP_CACHE_DIR
+        """
+        self.http_cache = http_cache or HttpCache()
+
+    @staticmethod
+    def get_day_ttl(date, today=None):
+        """Срок свежести страниц вакансий за день: страницы закончившегося дня меняются редко
+
+        Args:
+            date (str): День вида "2022-01-31"
+            today (str | None): Текущий день по UTC; None - сегодня
+
+        Returns:
+            int: Срок в секундах
+        """
+        today = today or time.strftime('%Y-%m-%d', time.gmtime())
+        return HHRU_CLOSED_DAY_TTL if date < today else HHRU_TTL
+
     def save_vacancy_data_for_past_day(self):
         yesterday = time.strftime('%Y-%m-%d', time.gmtime(time.time() - 86400))
         with open("vacancies_for_past_day.csv", mode="w", encoding='utf-8') as file:
@@ -164,7 +536,6 @@ class HHruApiConnect:
                     for item in vacancy_data['items']:
                         fileWriter.writerow([item['name'], item['salary']['from'], item['salary']['to'],
                                              item['salary']['currency'], item['area']['name'], item['published_at']])
-                    time.sleep(0.05)
 
     def _get_vacancy_data_from_HHru(self, date, time_from, time_to, page):
         params = {
@@ -175,306 +546,1552 @@ class HHruApiConnect:
             'per_page': 100,
             'page': page
         }
-        req = requests.get('https://api.hh.ru/vacancies', params)
-        vacancy_data = req.content.decode()
-        req.close()
-        return vacancy_data
+        return self.http_cache.get(self.HHRU_URL, params, self.get_day_ttl(date), delay=0.05).decode()
 
 class DataSet:
     """Класс для получения информации из файла csv формата и базовой работы над данными из него
 
+    Attributes:
+        engine (str): Способ чтения csv файлов, см. iter_csv_rows
     """
 
-    def split_csv_by_year(self, file_path):
-        """Разделение csv файла по годам.
+    def __init__(self, engine="csv"):
+        """Инициализация объекта DataSet
 
         Args:
-            file_path (str): Путь к csv файлу
+            engine (str): Способ чтения csv файлов из CSV_ENGINES
         """
-        (headers, years_vacancy_info) = self.big_csv_reader(file_path)
-        popular_currencies = self.get_most_popular_currencies(years_vacancy_info)
-        currency_db = ApiReader('currency_quotes.db')
-        quotes = currency_db.get_currency_quotes(self.get_year_borders(years_vacancy_info))
-        currency_db.save_currency_quotes_in_db(quotes, popular_currencies)
-        popular_currency_quotes = currency_db.read_currency_quotes_from_db(popular_currencies)
-
-        filtered_years_vacancy_info = {}
-        currency_to_rur = {
-            "AZN": 35.68,
-            "BYR": 23.91,
-            "EUR": 59.90,
-            "GEL": 21.74,
-            "KGS": 0.76,
-            "KZT": 0.13,
-            "RUR": 1,
-            "UAH": 1.64,
-            "USD": 60.66,
-            "UZS": 0.0055
-        }
-
-        for year, year_info in years_vacancy_info.items():
-            filtered_year_info = []
-            for vacancy_info in year_info:
-                if vacancy_info[3] not in popular_currencies \
-                        or any(map(lambda x: x == '',
-                                   (vacancy_info[0], vacancy_info[3], vacancy_info[-2], vacancy_info[-1]))): continue
-                quote_value = popular_currency_quotes[vacancy_info[-1][:7]][vacancy_info[3]]
-                salary = float(quote_value if quote_value != '' else currency_to_rur[vacancy_info[3]]) \
-                         * (self.int_or_default(vacancy_info[1], 0) + self.int_or_default(vacancy_info[2], 0)) / 2
-                if salary == 0: continue
-                filtered_year_info.append([vacancy_info[0], salary, vacancy_info[4], vacancy_info[5]])
-            filtered_years_vacancy_info[year] = filtered_year_info
-        self.csv_create_years(['name', 'salary', 'area_name', 'published_at'], filtered_years_vacancy_info)
-
-    @staticmethod
-    def big_csv_reader(file_path):
-        headers = []
-        years_info = {}
-        with open(file_path, encoding="utf-8-sig") as f:
-            for row in map(lambda x: x, csv.reader(f)):
-                if len(headers) == 0:
-                    headers = row
-                    continue
-                if len(row) != len(headers):
-                    continue
-                year = row[-1][0:4]
-                if year in years_info:
-                    years_info[year].append(row)
-                else:
-                    years_info[year] = [row]
-        return headers, years_info
-
-    def get_most_popular_currencies(self, years_vacancy_info):
-        currency_count = {}
-        for year_info in years_vacancy_info.values():
-            for vacancy_info in year_info:
-                if vacancy_info[3] not in currency_count:
-                    currency_count[vacancy_info[3]] = 1
-                else:
-                    currency_count[vacancy_info[3]] += 1
-        return [pair[0] for pair in currency_count.items() if pair[1] >= 5000]
+        self.engine = engine
+
+    YEAR_HEADERS = ['name', 'salary', 'area_name', 'published_at']
+    POPULAR_CURRENCY_MIN_COUNT = 5000
+    CURRENCY_TO_RUR = {
+        "AZN": 35.68,
+        "BYR": 23.91,
+        "EUR": 59.90,
+        "GEL": 21.74,
+        "KGS": 0.76,
+        "KZT": 0.13,
+        "RUR": 1,
+        "UAH": 1.64,
+        "USD": 60.66,
+        "UZS": 0.0055
+    }
+
+    def split_csv_by_year(self, file_path, processes=1, chunk_size=CHUNK_SIZE, output_dir="years", pipelined=False,
+                          partition="year", compression=None, compression_level=None):
+        """Разделение csv файла по годам или месяцам. В папку также пишется манифест частей, см. csv_create_years.
+            Сжатый файл (см. open_compressed) нельзя делить на диапазоны байтов, поэтому он всегда разбирается
+            в текущем процессе
 
-    def get_year_borders(self, years_vacancy_info):
-        keys = list(years_vacancy_info.keys())
-        return years_vacancy_info[keys[0]][0][-1][:4], years_vacancy_info[keys[-1]][0][-1][:4]
+        Args:
+            file_path (str): Путь к csv файлу; может быть сжат, сжатие определяется по расширению
+            processes (int | None): 1 - в текущем процессе; иначе размер общего пула процессов, см. get_worker_pool
+            chunk_size (int): Размер диапазона байтов для одного процесса
+            output_dir (str): Папка для файлов частей
+            pipelined (bool): Скачивать котировки в фоне во время разбора файла, см. split_csv_by_year_pipelined
+            partition (str): "year" - файл на каждый год; "month" - файл на каждый месяц с вакансиями
+            compression (str | None): Сжатие файлов частей - расширение из COMPRESSIONS, например ".gz"; None - без
+                сжатия
+            compression_level (int | None): Уровень сжатия файлов частей; None - из COMPRESSION_LEVELS
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"Неизвестное разбиение: {partition}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Неизвестное сжатие: {compression}")
+        prefetcher = self.start_quotes_prefetcher(file_path) if pipelined else None
+        compression_info = (compression, compression_level)
+        try:
+            if processes != 1 and get_compression(file_path) is None:
+                self.split_csv_by_year_parallel(file_path, get_worker_pool(processes), chunk_size, output_dir,
+                                                prefetcher, partition, *compression_info)
+            elif pipelined:
+                self.split_csv_by_year_pipelined(file_path, prefetcher, output_dir, partition, *compression_info)
+            else:
+                self.split_csv_by_year_serial(file_path, output_dir, partition, *compression_info)
+        finally:
+            if prefetcher is not None:
+                prefetcher.stop()
 
-    def int_or_default(self, value, default):
-        return int(value[:value.find('.')]) if value != '' else default
+    def split_csv_by_year_serial(self, file_path, output_dir="years", partition="year", compression=None,
+                                 compression_level=None):
+        """Разделение csv файла по годам в текущем процессе: разбор файла, затем скачивание котировок, затем
+            перевод зарплат
 
-    def csv_create_years(self, headers, years_vacancy_info):
-        for year, info in years_vacancy_info.items():
-            with open(f"years/{year}.csv", mode="w", encoding='utf-8-sig') as csv_year:
-                file_writer = csv.writer(csv_year, delimiter=",", lineterminator="\r")
-                file_writer.writerow(headers)
-                file_writer.writerows(info)
+        Args:
+            file_path (str): Путь к csv файлу
+            output_dir (str): Папка для файлов частей
+            partition (str): Разбиение на части: "year" или "month"
+            compression (str | None): Сжатие файлов частей
+            compression_level (int | None): Уровень сжатия файлов частей
+        """
+        (headers, years_vacancy_info) = self.big_csv_reader(file_path, self.engine)
+        popular_currencies = self.get_most_popular_currencies(years_vacancy_info)
+        popular_currency_quotes = self.load_currency_quotes(self.get_year_borders(years_vacancy_info),
+                                                            popular_currencies)
+        filtered_years_vacancy_info = {
+            year: self.convert_vacancy_rows(year_info, popular_currencies, popular_currency_quotes)
+            for year, year_info in years_vacancy_info.items()}
+        self.csv_create_years(self.YEAR_HEADERS, filtered_years_vacancy_info, output_dir, partition, compression,
+                              compression_level)
+
+    def split_csv_by_year_pipelined(self, file_path, prefetcher, output_dir="years", partition="year",
+                                    compression=None, compression_level=None):
+        """Разделение csv файла по годам в текущем процессе, при котором котировки скачиваются в фоне. Скачивание
+            перекрывается только с разбором файла: строки переводятся после разбора всего файла, зато зарплаты
+            месяца переводятся, как только готовы его котировки, не дожидаясь остальных месяцев. Результат
+            и сохранённые в db файле месяцы совпадают с split_csv_by_year_serial, даже если по началу и концу файла
+            (см. sample_year_borders) заранее скачивались лишние месяцы; месяцы данных вне границ годов тоже
+            скачиваются, а не приводят к ошибке
 
-    def get_vacancies_from_file(self, csv_year_file_path):
-        """Чтение информации из csv файла определённого года и запись в список списков, в котором каждому внутреннему
-            списку соответствует одна строка из файла
+        Args:
+            file_path (str): Путь к csv файлу
+            prefetcher (QuotesPrefetcher): Запущенный поток скачивания котировок
+            output_dir (str): Папка для файлов частей
+            partition (str): Разбиение на части: "year" или "month"
+            compression (str | None): Сжатие файлов частей
+            compression_level (int | None): Уровень сжатия файлов частей
+        """
+        (headers, years_vacancy_info) = self.big_csv_reader(file_path, self.engine)
+        popular_currencies = self.get_most_popular_currencies(years_vacancy_info)
+        rows_by_month = {}
+        for (year, year_info) in years_vacancy_info.items():
+            for (index, vacancy_info) in enumerate(year_info):
+                if self.is_convertible(vacancy_info, popular_currencies):
+                    rows_by_month.setdefault(vacancy_info[-1][:7], []).append((year, index))
+        months = ApiReader.get_months(self.get_year_borders(years_vacancy_info))
+        prefetcher.request(months)
+        prefetcher.request(sorted(rows_by_month))
+
+        converted_years_vacancy_info = {year: [None] * len(year_info) for (year, year_info) in
+                                        years_vacancy_info.items()}
+        for month in list(prefetcher.requested):
+            quotes = ApiReader.select_currency_quotes(prefetcher.get(month), popular_currencies)
+            for (year, index) in rows_by_month.get(month, []):
+                converted_years_vacancy_info[year][index] = self.convert_vacancy_row(years_vacancy_info[year][index],
+                                                                                     quotes)
+        prefetcher.api_reader.save_currency_quotes_in_db({month: prefetcher.get(month) for month in months},
+                                                         popular_currencies)
+        self.csv_create_years(self.YEAR_HEADERS, {year: [row for row in year_info if row is not None]
+                                                  for (year, year_info) in converted_years_vacancy_info.items()},
+                              output_dir, partition, compression, compression_level)
+
+    def start_quotes_prefetcher(self, file_path):
+        """Запуск фонового скачивания котировок по годам первой и последней даты в начале и конце файла
 
         Args:
-            csv_year_file_path (str): Путь к csv файлу определённого года
+            file_path (str): Путь к csv файлу
 
         Returns:
-            list[list[str]]: Форматированный список вакансий
+            QuotesPrefetcher: Запущенный поток скачивания
         """
-        info = self.csv_reader(csv_year_file_path)[1:]
-        return self.create_vacancy(info)
+        prefetcher = QuotesPrefetcher(self.get_currency_db())
+        prefetcher.start()
+        year_borders = self.sample_year_borders(file_path)
+        if year_borders is not None:
+            prefetcher.request(ApiReader.get_months(year_borders))
+        return prefetcher
 
-    def csv_reader(self, file_path):
-        """Чтение информации из csv файла я запись в список списков, в котором каждому внутреннему списку
-            соответствует одна строка из файла
+    @staticmethod
+    def sample_year_borders(file_path, sample_size=64 * 1024):
+        """Быстрая оценка границ годов по первой дате публикации в начале файла и последней в конце файла. У сжатого
+            файла конец без распаковки всего файла не прочитать, поэтому он не оценивается
 
         Args:
             file_path (str): Путь к csv файлу
+            sample_size (int): Сколько байтов читать с начала и с конца файла
 
         Returns:
-            list[list[str]]: Форматированный список вакансий
+            tuple[str, str] | None: Первый и последний год; None - дат не нашлось или файл сжат
         """
-        with open(file_path, encoding="utf-8-sig") as f:
-            reader_info = [x for x in csv.reader(f)]
-            reader_info.pop(0)
-            f.close()
-        return reader_info
+        if get_compression(file_path) is not None:
+            return None
+        with open(file_path, 'rb') as file:
+            head = file.read(sample_size)
+            file.seek(max(0, fstat(file.fileno()).st_size - sample_size))
+            tail = file.read()
+        first = PUBLISHED_AT_PATTERN.search(head)
+        last = None
+        for last in PUBLISHED_AT_PATTERN.finditer(tail):
+            pass
+        if first is None or last is None:
+            return None
+        return first.group(1).decode(), last.group(1).decode()
+
+    def split_csv_by_year_parallel(self, file_path, pool, chunk_size=CHUNK_SIZE, output_dir="years",
+                                   prefetcher=None, partition="year", compression=None, compression_level=None):
+        """Разделение csv файла по годам пулом процессов; результат совпадает с split_csv_by_year в одном процессе.
+            Файл делится на диапазоны байтов по границам записей. Первый проход собирает годы и количество валют
+            по диапазонам, второй переводит зарплаты в рубли и пишет файлы-части по годам или месяцам, которые затем
+            склеиваются в порядке диапазонов
 
-    def create_vacancy(self, info):
-        """Преобразование данных из csv файла в список вакансий, в котором каждой вакансии соответствует одна строка
-            из файла (для статистики)
+        Args:
+            file_path (str): Путь к csv файлу
+            pool (WorkerPool): Пул процессов
+            chunk_size (int): Размер диапазона байтов для одного процесса
+            output_dir (str): Папка для файлов частей
+            prefetcher (QuotesPrefetcher | None): Поток, заранее скачивающий котировки во время первого прохода
+            partition (str): Разбиение на части: "year" или "month"
+            compression (str | None): Сжатие файлов частей; части процессов не сжимаются, сжимаются только
+                склеенные файлы
+            compression_level (int | None): Уровень сжатия файлов частей
+        """
+        header_borders = find_csv_chunk_borders(file_path, 1, max_count=1)
+        if len(header_borders) == 0:
+            return
+        header_end = header_borders[0][1]
+        fields_count = len(read_csv_chunk(file_path, 0, header_end, "utf-8-sig")[0])
+        chunks = find_csv_chunk_borders(file_path, chunk_size, header_end)
+        scans = pool.map(SplitScanTask(file_path, start, end, fields_count) for (start, end) in chunks)
+
+        years = {}
+        for chunk_years in scans:
+            years.update(dict.fromkeys(chunk_years))
+        currency_count = {}
+        for year in years:
+            for chunk_years in scans:
+                for (currency, count) in chunk_years.get(year, {}).items():
+                    currency_count[currency] = currency_count.get(currency, 0) + count
+        popular_currencies = [currency for (currency, count) in currency_count.items()
+                              if count >= self.POPULAR_CURRENCY_MIN_COUNT]
+        year_keys = list(years)
+        popular_currency_quotes = self.load_currency_quotes((year_keys[0], year_keys[-1]), popular_currencies,
+                                                            prefetcher)
+
+        makedirs(output_dir, exist_ok=True)
+        shard_dir = tempfile.mkdtemp(dir=output_dir)
+        try:
+            chunk_statistics = pool.map(SplitWriteTask(file_path, start, end, fields_count, popular_currencies,
+                                                       popular_currency_quotes, join(shard_dir, str(index)), partition)
+                                        for (index, (start, end)) in enumerate(chunks))
+            keys = years if partition == "year" else sorted(set().union(*chunk_statistics))
+            partition_statistics = {key: reduce(self.merge_partition_statistics,
+                                                [statistics[key] for statistics in chunk_statistics
+                                                 if key in statistics], self.get_partition_statistics([]))
+                                    for key in keys}
+            header = io.StringIO()
+            csv.writer(header, delimiter=",", lineterminator="\r").writerow(self.YEAR_HEADERS)
+            for key in keys:
+                with open_compressed(join(output_dir, self.get_partition_file_name(key, compression)), "wb",
+                                     compression_level) as csv_partition:
+                    csv_partition.write(header.getvalue().encode('utf-8-sig'))
+                    for (index, statistics) in enumerate(chunk_statistics):
+                        if key in statistics:
+                            with open(join(shard_dir, f"{index}.{key}.csv"), mode="rb") as shard:
+                                shutil.copyfileobj(shard, csv_partition)
+            self.write_partition_manifest(output_dir, partition, partition_statistics, compression)
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+    def load_currency_quotes(self, year_borders, currencies, prefetcher=None):
+        """Получение котировок валют ЦБ РФ по месяцам, сохранение их в currency_quotes.db и чтение обратно
 
         Args:
-            info (list[list[str]]): Строки csv файла
+            year_borders (tuple[str, str]): Первый и последний год
+            currencies (list[str]): Названия валют
+            prefetcher (QuotesPrefetcher | None): Поток, в котором котировки уже скачиваются
 
         Returns:
-            list[Vacancy]: Форматированный список вакансий
+            dict[str: dict[str: float]]: Котировки валют по месяцам
         """
-        return [Vacancy(info_row[0], None, None, None, None, None, info_row[1], info_row[2], info_row[3])
-                for info_row in info]
-
+        if prefetcher is None:
+            currency_db = self.get_currency_db()
+            quotes = currency_db.get_currency_quotes(year_borders)
+            currency_db.save_currency_quotes_in_db(quotes, currencies)
+            return currency_db.read_currency_quotes_from_db(currencies)
+        prefetcher.request(ApiReader.get_months(year_borders))
+        quotes = {month: prefetcher.get(month) for month in ApiReader.get_months(year_borders)}
+        prefetcher.api_reader.save_currency_quotes_in_db(quotes, currencies)
+        return {month: ApiReader.select_currency_quotes(quotes_for_month, currencies)
+                for (month, quotes_for_month) in quotes.items()}
+
+    def get_currency_db(self):
+        """Создание объекта для скачивания и хранения котировок
 
-class InputConnect:
-    """Класс для работы над списком Vacancy
-
-    """
+        Returns:
+            ApiReader: Объект с базой currency_quotes.db
+        """
+        return ApiReader('currency_quotes.db')
 
-    def info_formatter(self, vacancies):
-        """Нормализация данных в вакансиях
+    def convert_vacancy_rows(self, year_info, popular_currencies, popular_currency_quotes):
+        """Отбор строк с популярной валютой и заполненными полями и перевод зарплаты в рубли по котировке месяца
+            публикации
 
         Args:
-            vacancies (list[Vacancy]): Список вакансий
+            year_info (list[list[str]]): Строки исходного csv файла
+            popular_currencies (list[str]): Популярные валюты
+            popular_currency_quotes (dict[str: dict[str: float]]): Котировки валют по месяцам
 
         Returns:
-            list[Vacancy]: Результат форматирования
+            list[list]: Строки вида [name, salary, area_name, published_at]
         """
+        filtered_year_info = []
+        for vacancy_info in year_info:
+            if not self.is_convertible(vacancy_info, popular_currencies): continue
+            row = self.convert_vacancy_row(vacancy_info, popular_currency_quotes[vacancy_info[-1][:7]])
+            if row is None: continue
+            filtered_year_info.append(row)
+        return filtered_year_info
 
-        def formatter_published_at(attr_value):
-            """Получение года из строки, содержащей дату
+    @staticmethod
+    def is_convertible(vacancy_info, popular_currencies):
+        """Проверка, что у строки популярная валюта и заполнены название, валюта, город и дата
 
+        Args:
+            vacancy_info (list[str]): Строка исходного csv файла
+            popular_currencies (list[str]): Популярные валюты
 
-            """
-            return attr_value[0:4]
+        Returns:
+            bool: Можно ли переводить зарплату строки
+        """
+        return vacancy_info[3] in popular_currencies \
+            and not any(map(lambda x: x == '', (vacancy_info[0], vacancy_info[3], vacancy_info[-2], vacancy_info[-1])))
 
-        for vacancy in vacancies:
-            setattr(vacancy, "published_at", formatter_published_at(getattr(vacancy, "published_at")))
-        return vacancies
+    def convert_vacancy_row(self, vacancy_info, quotes):
+        """Перевод средней зарплаты строки в рубли
 
-    def year_info_finder(self, vacancies, finder_parameter):
-        """Формирование информации по годам о вакансиях: уровень зарплат по годам, уровень зарплат по годам для
-            выбранной вакансии, количество вакансий по годам, количество вакансий по годам для выбранной вакансии,
-            уровень зарплат по городам, количество вакансий по городам, общее количество вакансий
+        Args:
+            vacancy_info (list[str]): Строка исходного csv файла
+            quotes (dict[str: float]): Котировки популярных валют за месяц публикации
 
+        Returns:
+            list | None: Строка вида [name, salary, area_name, published_at]; None - зарплата нулевая
         """
-        year = int(vacancies[0].published_at)
-        salaries_year_level, selected_salary_year_level, vacancies_year_count, selected_vacancy_year_count, = \
-            {}, {}, {}, {}
-        for vacancy in vacancies:
-            salary = float(vacancy.salary)
-            if year not in salaries_year_level:
-                salaries_year_level[year] = (salary, 1)
-                vacancies_year_count[year] = 1
-                selected_salary_year_level[year] = (0, 0)
-                selected_vacancy_year_count[year] = 0
-            else:
-                sal_yr_lvl = salaries_year_level[year]
-                salaries_year_level[year] = (sal_yr_lvl[0] + salary, sal_yr_lvl[1] + 1)
-                vacancies_year_count[year] += 1
-            if finder_parameter in vacancy.name:
-                sel_sal_ye_lvl = selected_salary_year_level[year]
-                selected_salary_year_level[year] = (sel_sal_ye_lvl[0] + salary, sel_sal_ye_lvl[1] + 1)
-                selected_vacancy_year_count[year] += 1
-        return self.year_info_calculating(salaries_year_level, selected_salary_year_level, vacancies_year_count,
-                                          selected_vacancy_year_count)
+        quote_value = quotes[vacancy_info[3]]
+        salary = float(quote_value if quote_value != '' else self.CURRENCY_TO_RUR[vacancy_info[3]]) \
+                 * (self.int_or_default(vacancy_info[1], 0) + self.int_or_default(vacancy_info[2], 0)) / 2
+        if salary == 0:
+            return None
+        return [vacancy_info[0], salary, vacancy_info[4], vacancy_info[5]]
 
-    def city_info_finder(self, vacancies):
-        """Формирование информации по годам о вакансиях: уровень зарплат по годам, уровень зарплат по годам для
-            выбранной вакансии, количество вакансий по годам, количество вакансий по годам для выбранной вакансии,
-            уровень зарплат по городам, количество вакансий по городам, общее количество вакансий
+    @staticmethod
+    def big_csv_reader(file_path, engine="csv"):
+        """Чтение csv файла с группировкой строк по году публикации
 
         Args:
-            vacancies (list[Vacancy]): Список вакансий
+            file_path (str): Путь к csv файлу
+            engine (str): Способ чтения, см. iter_csv_rows
 
         Returns:
-            tuple[ dict[str: tuple[int, int]], dict[str: int] ]: Группа списков
+            tuple[list[str], dict[str: list[list[str]]]]: Заголовки и строки по годам
         """
-        salaries_city_level, vacancies_city_count = {}, {}
-        for vacancy in vacancies:
-            salary = float(vacancy.salary)
-            if vacancy.area_name not in salaries_city_level:
-                vacancies_city_count[vacancy.area_name] = 1
-                salaries_city_level[vacancy.area_name] = (salary, 1)
+        rows = DataSet.iter_csv_rows(file_path, engine)
+        headers = next(rows, [])
+        years_info = {}
+        for row in rows:
+            year = row[-1][0:4]
+            if year in years_info:
+                years_info[year].append(row)
             else:
-                sal_ct_lvl = salaries_city_level[vacancy.area_name]
-                salaries_city_level[vacancy.area_name] = (sal_ct_lvl[0] + salary, sal_ct_lvl[1] + 1)
-                vacancies_city_count[vacancy.area_name] += 1
-        return self._city_info_calculating(salaries_city_level, vacancies_city_count, len(vacancies))
+                years_info[year] = [row]
+        return headers, years_info
 
-    def year_info_calculating(self, salaries_year_level, selected_salary_year_level, vacancies_year_count,
-                              selected_vacancy_year_count):
-        """Окончательное форматирование словарей, фильтрация, сортировка, выборка первого десятка для некоторых
+    @staticmethod
+    def resolve_csv_engine(engine):
+        """Выбор способа чтения csv: для "auto" - модуль csv. pyarrow и pandas выбираются только явно: C-парсер pandas
+            на строковых столбцах файлов years/ медленнее модуля csv (см. benchmark.py), а совпадение строк pyarrow
+            со строками модуля csv проверяется, только если pyarrow установлен (см. CsvEngineTests)
 
         Args:
-            salaries_year_level (dict[int: tuple[int, int]]): Уровень зарплат по годам
-            selected_salary_year_level (dict[int: tuple[int, int]]): Уровень зарплат по годам для выбранной вакансии
-            vacancies_year_count (dict[int: int]): Количество вакансий по годам
-            selected_vacancy_year_count (dict[int: int]): Количество вакансий по годам для выбранной вакансии
+            engine (str): Способ чтения из CSV_ENGINES
 
         Returns:
-            tuple[ dict[int: tuple[int, int]], dict[int: tuple[int, int]], dict[int: int], dict[int: int] ]:
-                Уровень зарплат по годам, Уровень зарплат по годам для выбранной вакансии, Количество вакансий по годам,
-                Количество вакансий по годам для выбранной вакансии
+            str: Способ чтения, который будет использован
         """
-
-        (salaries_year_level, selected_salary_year_level) = [
-            {dict_pair[0]: int(dict_pair[1][0] / dict_pair[1][1]) if dict_pair[1][1] != 0 else int(dict_pair[1][0])
-             for dict_pair in dictionary.items()}
-            for dictionary in (salaries_year_level, selected_salary_year_level)]
-
-        return salaries_year_level, selected_salary_year_level, vacancies_year_count, selected_vacancy_year_count
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Неизвестный способ чтения csv: {engine}")
+        return "csv" if engine == "auto" else engine
 
     @staticmethod
-    def _city_info_calculating(salaries_city_level, vacancies_city_count, vacancies_count):
-        """Окончательное форматирование словарей, фильтрация, сортировка, выборка первого десятка для некоторых
+    def iter_csv_rows(file_path, engine="csv", chunk_size=CHUNK_SIZE):
+        """Чтение csv файла в кодировке utf-8 (в том числе с BOM). Первой выдаётся строка заголовков, затем строки,
+            количество полей в которых совпадает с заголовком; остальные пропускаются. Переводы строк внутри полей
+            приводятся к "\\n", как при чтении файла в текстовом режиме
 
         Args:
-            salaries_city_level (dict[str: tuple[int, int]]): Уровень зарплат по городам
-            vacancies_city_count (dict[str: int]): Количество вакансий по городам
-            vacancies_count (int): Общее количество вакансий
+            file_path (str): Путь к csv файлу
+            engine (str): "csv" - модуль csv; "pandas" - C-парсер pandas по частям; "pyarrow" - потоковое чтение
+                pyarrow; "auto" - см. resolve_csv_engine. Сжатые файлы (см. open_compressed) читаются потоком
+                модулем csv при любом способе
+            chunk_size (int): Размер части файла в байтах для pandas и pyarrow
 
         Returns:
-            tuple[ dict[str: tuple[int, int]], dict[str: int] ]: Уровень зарплат по городам, Количество вакансий
-                по городам
+            Iterator[list[str]]: Заголовки и строки файла
         """
+        engine = DataSet.resolve_csv_engine(engine)
+        if engine == "csv" or get_compression(file_path) is not None:
+            with open_text_file(file_path, encoding="utf-8-sig") as f:
+                reader = csv.reader(f)
+                headers = next(reader, None)
+                if headers is None:
+                    return
+                yield headers
+                for row in reader:
+                    if len(row) == len(headers):
+                        yield row
+            return
+        header_borders = find_csv_chunk_borders(file_path, 1, max_count=1)
+        if len(header_borders) == 0:
+            return
+        header_end = header_borders[0][1]
+        headers = read_csv_chunk(file_path, 0, header_end, "utf-8-sig")[0]
+        yield headers
+        if engine == "pyarrow":
+            yield from DataSet._iter_pyarrow_rows(file_path, header_end, len(headers), chunk_size)
+            return
+        with open(file_path, 'rb') as file:
+            for (start, end) in find_csv_chunk_borders(file_path, chunk_size, header_end):
+                file.seek(start)
+                yield from DataSet._read_pandas_rows(file.read(end - start), len(headers))
 
-        def sort_dict(dictionary):
-            """Сортировка словаря лексикографически
+    @staticmethod
+    def _read_pandas_rows(data, fields_count):
+        """Разбор части csv файла C-парсером pandas. Парсер дополняет короткие строки пустыми полями, поэтому
+            количество полей каждой записи считается отдельно по байтам с учётом кавычек. Части с пустыми строками
+            (после них C-парсер может сдвигать поля), части, которые pandas не смог разобрать, и части, разбиение
+            которых не совпало с подсчётом (например, кавычка посреди поля без кавычек), читаются модулем csv
 
-            Args:
-                dictionary (dict[str: int]): Словарь для сортировки
+        Args:
+            data (bytes): Записи csv файла без заголовка
+            fields_count (int): Количество полей в заголовке
 
-            Returns:
-                tuple[dict[str: int], dict[str: int]]: Отсортированный словарь
-            """
-            dict_pairs = [(key, value) for key, value in dictionary.items()]
-            dict_pairs.sort(key=cmp_to_key(lambda x, y: -1 if x[1] <= y[1] else 1))
-            return dict(dict_pairs)
-
-        vacancies_city_count = {dict_pair[0]: float(f"{dict_pair[1] / vacancies_count:.4f}")
-                                for dict_pair in vacancies_city_count.items()}
-        vacancies_city_count = {dict_pair[0]: dict_pair[1] for dict_pair in vacancies_city_count.items() if
-                                dict_pair[1] >= 0.01}
-        vacancies_city_count = sort_dict(vacancies_city_count)
-        vacancies_city_count = {dict_pair[0]: f"{round(dict_pair[1] * 100, 2)}%" for dict_pair in
-                                vacancies_city_count.items()}
-        salaries_city_level = {dict_pair[0]:
-                                   int(dict_pair[1][0] / dict_pair[1][1]) if dict_pair[1][1] != 0 else int(
-                                       dict_pair[1][0])
-                               for dict_pair in salaries_city_level.items()}
-        salaries_city_level = {dict_pair[0]: dict_pair[1] for dict_pair in salaries_city_level.items() if
-                               dict_pair[0] in vacancies_city_count}
-        salaries_city_level = sort_dict(salaries_city_level)
-        vacancies_city_count = {k: vacancies_city_count[k] for k in list(vacancies_city_count)[-10:][::-1]}
-        salaries_city_level = {k: salaries_city_level[k] for k in list(salaries_city_level)[-10:][::-1]}
-        return salaries_city_level, vacancies_city_count
+        Returns:
+            list[list[str]]: Строки с нужным количеством полей
+        """
+        import numpy as np
+        import pandas as pd
+
+        symbols = np.frombuffer(data, np.uint8)
+        quotes = np.flatnonzero(symbols == ord('"'))
+        separators = np.flatnonzero((symbols == ord(",")) | (symbols == ord("\r")) | (symbols == ord("\n")))
+        quoted = np.searchsorted(quotes, separators) % 2 == 1
+        quoted_carriage_return = (quoted & (symbols[separators] == ord("\r"))).any()
+        separators = separators[~quoted]
+        commas = separators[symbols[separators] == ord(",")]
+        ends = separators[symbols[separators] != ord(",")]
+        previous = symbols[np.maximum(ends - 1, 0)]
+        ends = ends[(symbols[ends] == ord("\r")) | (ends == 0) | (previous != ord("\r"))]
+        following = symbols[np.minimum(ends + 1, len(symbols) - 1)]
+        pairs = (symbols[ends] == ord("\r")) & (ends + 1 < len(symbols)) & (following == ord("\n"))
+        (starts, ends) = (np.concatenate(([0], ends + 1 + pairs)), np.append(ends, len(symbols)))
+        blank = ends == starts
+        counts = (np.searchsorted(commas, ends) - np.searchsorted(commas, starts) + 1)[~blank]
+        counts = counts[counts <= fields_count]
+
+        frame = None
+        if not blank[:-1].any():
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", pd.errors.ParserWarning)
+                    frame = pd.read_csv(io.BytesIO(data), header=None, names=range(fields_count), index_col=False,
+                                        dtype=str, na_filter=False, on_bad_lines="skip", engine="c",
+                                        encoding="utf-8")
+            except pd.errors.ParserError:
+                pass
+        if frame is None or len(frame) != len(counts):
+            return [row for row in csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"))
+                    if len(row) == fields_count]
+        frame = frame[counts == fields_count]
+        if quoted_carriage_return:
+            frame = frame.replace("\r\n?", "\n", regex=True)
+        return frame.values.tolist()
 
+    @staticmethod
+    def _iter_pyarrow_rows(file_path, header_end, fields_count, chunk_size):
+        """Потоковое чтение строк csv файла после заголовка через pyarrow; все столбцы читаются как строки,
+            строки с другим количеством полей пропускаются
 
-class Report:
-    """Класс для генерации файлов по анализу статистики: графиков, excel таблиц, общего pdf-файла
+        Args:
+            file_path (str): Путь к csv файлу
+            header_end (int): Смещение конца заголовка
+            fields_count (int): Количество полей в заголовке
+            chunk_size (int): Размер блока чтения в байтах
 
-    Attributes:
+        Returns:
+            Iterator[list[str]]: Строки файла
+        """
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+
+        column_names = [str(i) for i in range(fields_count)]
+        read_options = pa_csv.ReadOptions(column_names=column_names, block_size=chunk_size)
+        parse_options = pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: "skip")
+        convert_options = pa_csv.ConvertOptions(column_types={name: pa.string() for name in column_names},
+                                                null_values=[], strings_can_be_null=False,
+                                                quoted_strings_can_be_null=False)
+        with open(file_path, 'rb') as file:
+            file.seek(header_end)
+            for batch in pa_csv.open_csv(file, read_options, parse_options, convert_options):
+                columns = [[value.replace("\r\n", "\n").replace("\r", "\n") for value in column.to_pylist()]
+                           for column in batch.columns]
+                yield from map(list, zip(*columns))
+
+    def get_most_popular_currencies(self, years_vacancy_info):
+        currency_count = {}
+        for year_info in years_vacancy_info.values():
+            for vacancy_info in year_info:
+                if vacancy_info[3] not in currency_count:
+                    currency_count[vacancy_info[3]] = 1
+                else:
+                    currency_count[vacancy_info[3]] += 1
+        return [pair[0] for pair in currency_count.items() if pair[1] >= self.POPULAR_CURRENCY_MIN_COUNT]
+
+    def get_year_borders(self, years_vacancy_info):
+        keys = list(years_vacancy_info.keys())
+        return years_vacancy_info[keys[0]][0][-1][:4], years_vacancy_info[keys[-1]][0][-1][:4]
+
+    def int_or_default(self, value, default):
+        return int(value[:value.find('.')]) if value != '' else default
+
+    def csv_create_years(self, headers, years_vacancy_info, output_dir="years", partition="year", compression=None,
+                         compression_level=None):
+        """Запись строк в файлы частей {ключ}.csv и манифеста частей. При разбиении по годам файл пишется
+            для каждого года, даже без строк; при разбиении по месяцам - для каждого месяца со строками
+
+        Args:
+            headers (list[str]): Заголовки
+            years_vacancy_info (dict[str: list[list]]): Строки вида [name, salary, area_name, published_at] по годам
+            output_dir (str): Папка для файлов частей
+            partition (str): Разбиение на части: "year" или "month"
+            compression (str | None): Сжатие файлов частей {ключ}.csv{compression}; None - без сжатия
+            compression_level (int | None): Уровень сжатия; None - из COMPRESSION_LEVELS
+        """
+        partitions_info = years_vacancy_info if partition == "year" else {}
+        if partition == "month":
+            for row in (row for info in years_vacancy_info.values() for row in info):
+                partitions_info.setdefault(self.get_partition_key(row[3], partition), []).append(row)
+            partitions_info = dict(sorted(partitions_info.items()))
+        for key, info in partitions_info.items():
+            with open_text_file(join(output_dir, self.get_partition_file_name(key, compression)), mode="w",
+                                encoding='utf-8-sig', level=compression_level) as csv_year:
+                file_writer = csv.writer(csv_year, delimiter=",", lineterminator="\r")
+                file_writer.writerow(headers)
+                file_writer.writerows(info)
+        self.write_partition_manifest(output_dir, partition, {key: self.get_partition_statistics(info)
+                                                              for key, info in partitions_info.items()}, compression)
+
+    @staticmethod
+    def get_partition_file_name(key, compression=None):
+        """Имя файла части
+
+        Args:
+            key (str): Ключ части: год или месяц
+            compression (str | None): Сжатие файла части
+
+        Returns:
+            str: Имя вида "2022.csv" или "2022-01.csv.gz"
+        """
+        return f"{key}.csv{compression or ''}"
+
+    @staticmethod
+    def get_partition_key(published_at, partition):
+        """Ключ части для даты публикации
+
+        Args:
+            published_at (str): Дата публикации
+            partition (str): Разбиение на части: "year" или "month"
+
+        Returns:
+            str: Год вида "2022" или месяц вида "2022-01"
+        """
+        return published_at[:4] if partition == "year" else published_at[:7]
+
+    @staticmethod
+    def get_partition_statistics(rows):
+        """Сведения о части для манифеста: количество строк, наименьшая и наибольшая дата публикации и зарплата,
+            города
+
+        Args:
+            rows (list[list]): Строки вида [name, salary, area_name, published_at]
+
+        Returns:
+            dict[str: int | str | float | list[str] | None]: Сведения о части
+        """
+        dates = [row[3] for row in rows]
+        salaries = [float(row[1]) for row in rows]
+        return {"rows": len(rows), "min_published_at": min(dates, default=None),
+                "max_published_at": max(dates, default=None), "min_salary": min(salaries, default=None),
+                "max_salary": max(salaries, default=None), "areas": sorted(set(row[2] for row in rows))}
+
+    @staticmethod
+    def merge_partition_statistics(first, second):
+        """Объединение сведений о частях одного ключа из разных диапазонов файла
+
+        Args:
+            first (dict[str: int | str | float | list[str] | None]): Сведения о части
+            second (dict[str: int | str | float | list[str] | None]): Сведения о части
+
+        Returns:
+            dict[str: int | str | float | list[str] | None]: Объединённые сведения
+        """
+        merged = {"rows": first["rows"] + second["rows"]}
+        for name in ("published_at", "salary"):
+            values = [value for value in (first[f"min_{name}"], second[f"min_{name}"], first[f"max_{name}"],
+                                          second[f"max_{name}"]) if value is not None]
+            merged[f"min_{name}"] = min(values, default=None)
+            merged[f"max_{name}"] = max(values, default=None)
+        merged["areas"] = sorted(set(first["areas"]).union(second["areas"]))
+        return merged
+
+    @staticmethod
+    def write_partition_manifest(output_dir, partition, partition_statistics, compression=None):
+        """Запись манифеста частей: разбиение и сведения о каждом файле
+
+        Args:
+            output_dir (str): Папка для файлов частей
+            partition (str): Разбиение на части: "year" или "month"
+            partition_statistics (dict[str: dict[str: int | str | None]]): Сведения о частях по ключам
+            compression (str | None): Сжатие файлов частей
+        """
+        manifest = {"partition": partition,
+                    "files": {DataSet.get_partition_file_name(key, compression): partition_statistics[key]
+                              for key in sorted(partition_statistics)}}
+        with open(join(output_dir, PARTITION_MANIFEST), mode="w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=1)
+
+    def get_vacancies_from_file(self, csv_year_file_path, start=0, end=None, vacancy_filter=None):
+        """Чтение информации из csv файла определённого года и запись в список списков, в котором каждому внутреннему
+            списку соответствует одна строка из файла
+
+        Args:
+            csv_year_file_path (str): Путь к csv файлу определённого года
+            start (int): Начало диапазона байтов, который нужно прочитать
+            end (int | None): Конец диапазона байтов; None - читать весь файл
+            vacancy_filter (VacancyFilter | None): Условия отбора строк, проверяемые до создания вакансий
+
+        Returns:
+            list[list[str]]: Форматированный список вакансий
+        """
+        return self.create_vacancy(self.get_rows_from_file(csv_year_file_path, start, end, vacancy_filter))
+
+    def get_rows_from_file(self, csv_year_file_path, start=0, end=None, vacancy_filter=None):
+        """Чтение строк csv файла определённого года без создания вакансий (см. get_vacancies_from_file). Сжатый
+            файл всегда читается целиком: у него один диапазон, см. get_file_chunks
+
+        Args:
+            csv_year_file_path (str): Путь к csv файлу определённого года
+            start (int): Начало диапазона байтов, который нужно прочитать
+            end (int | None): Конец диапазона байтов; None - читать весь файл
+            vacancy_filter (VacancyFilter | None): Условия отбора строк
+
+        Returns:
+            list[list[str]]: Строки вида [name, salary, area_name, published_at]
+        """
+        if end is None or get_compression(csv_year_file_path) is not None:
+            info = self.csv_reader(csv_year_file_path)[1:]
+        elif start == 0:
+            info = read_csv_chunk(csv_year_file_path, start, end, "utf-8-sig")[2:]
+        else:
+            info = read_csv_chunk(csv_year_file_path, start, end)
+        if vacancy_filter is not None:
+            info = [row for row in info if vacancy_filter.accepts_row(row)]
+        return info
+
+    @staticmethod
+    def get_file_chunks(file_path, chunk_size):
+        """Разбиение csv файла на диапазоны байтов примерно по chunk_size по границам записей. Первый диапазон
+            начинается с заголовка. Сжатый файл - один диапазон во весь сжатый размер
+
+        Args:
+            file_path (str): Путь к csv файлу
+            chunk_size (int): Желаемый размер диапазона в байтах
+
+        Returns:
+            list[tuple[int, int]]: Начало и конец каждого диапазона
+        """
+        if get_compression(file_path) is not None:
+            return [(0, stat(file_path).st_size)]
+        return find_csv_chunk_borders(file_path, chunk_size)
+
+    def csv_reader(self, file_path):
+        """Чтение информации из csv файла я запись в список списков, в котором каждому внутреннему списку
+            соответствует одна строка из файла
+
+        Args:
+            file_path (str): Путь к csv файлу
+
+        Returns:
+            list[list[str]]: Форматированный список вакансий
+        """
+        reader_info = list(self.iter_csv_rows(file_path, self.engine))
+        reader_info.pop(0)
+        return reader_info
+
+    def create_vacancy(self, info):
+        """Преобразование данных из csv файла в список вакансий, в котором каждой вакансии соответствует одна строка
+            из файла (для статистики)
+
+        Args:
+            info (list[list[str]]): Строки csv файла
+
+        Returns:
+            list[Vacancy]: Форматированный список вакансий
+        """
+        return [Vacancy(info_row[0], None, None, None, None, None, info_row[1], info_row[2], info_row[3])
+                for info_row in info]
+
+
+class VacancyFilter:
+    """Условия отбора вакансий для статистики. Проверяются по строкам файла частей до создания объектов Vacancy
+        и по сведениям манифеста частей, чтобы не открывать части без подходящих вакансий
+
+    Attributes:
+        areas (frozenset[str] | None): Названия городов; None - все города
+        date_range (tuple[str | None, str | None] | None): Первая и последняя дата публикации вида "ГГГГ-ММ-ДД"
+            включительно; None вместо даты - без ограничения с этой стороны
+        salary_range (tuple[float | None, float | None] | None): Наименьшая и наибольшая зарплата в рублях
+            включительно; None вместо значения - без ограничения с этой стороны
+    """
+
+    def __init__(self, areas=None, date_range=None, salary_range=None):
+        """Инициализация объекта VacancyFilter
+
+        Args:
+            areas (Iterable[str] | None): Названия городов; None - все города
+            date_range (tuple[str | None, str | None] | None): Диапазон дат публикации
+            salary_range (tuple[float | None, float | None] | None): Диапазон зарплат
+        """
+        self.areas = frozenset(areas) if areas is not None else None
+        self.date_range = date_range
+        self.salary_range = salary_range
+
+    @staticmethod
+    def in_range(value, value_range):
+        """Попадание значения в диапазон с необязательными границами
+
+        Args:
+            value (str | float): Значение
+            value_range (tuple | None): Нижняя и верхняя граница включительно; None - без ограничения
+
+        Returns:
+            bool: Попадает ли значение в диапазон
+        """
+        return VacancyFilter.ranges_overlap(value, value, value_range)
+
+    @staticmethod
+    def ranges_overlap(minimum, maximum, value_range):
+        """Пересечение отрезка значений с диапазоном с необязательными границами
+
+        Args:
+            minimum (str | float): Наименьшее значение отрезка
+            maximum (str | float): Наибольшее значение отрезка
+            value_range (tuple | None): Нижняя и верхняя граница включительно; None - без ограничения
+
+        Returns:
+            bool: Есть ли у отрезка общие значения с диапазоном
+        """
+        (first, last) = value_range or (None, None)
+        return (first is None or maximum >= first) and (last is None or minimum <= last)
+
+    def accepts_row(self, row):
+        """Проверка строки файла частей
+
+        Args:
+            row (list[str]): Строка вида [name, salary, area_name, published_at]
+
+        Returns:
+            bool: Подходит ли вакансия
+        """
+        return (self.areas is None or row[2] in self.areas) and self.in_range(row[3][:10], self.date_range) \
+            and (self.salary_range is None or self.in_range(float(row[1]), self.salary_range))
+
+    def accepts_partition(self, info):
+        """Проверка сведений о части из манифеста: может ли в части быть подходящая вакансия. Сведения, которых нет
+            в манифесте, не учитываются
+
+        Args:
+            info (dict[str: int | str | float | list[str] | None]): Сведения о части, см.
+                DataSet.get_partition_statistics
+
+        Returns:
+            bool: Нужно ли открывать часть
+        """
+        if info["rows"] == 0:
+            return False
+        if self.areas is not None and "areas" in info and self.areas.isdisjoint(info["areas"]):
+            return False
+        if not self.ranges_overlap(info["min_published_at"][:10], info["max_published_at"][:10], self.date_range):
+            return False
+        return "min_salary" not in info or self.ranges_overlap(info["min_salary"], info["max_salary"],
+                                                               self.salary_range)
+
+
+class QuantileSketch:
+    """Потоковый квантильный эскиз с относительной точностью (DDSketch). Положительное значение x попадает
+        в корзину i = ceil(log_gamma(x)), то есть gamma^(i-1) < x <= gamma^i, где gamma = (1 + a) / (1 - a),
+        а a - относительная точность; корзина хранит только количество значений. Оценка квантиля q - середина
+        2 * gamma^i / (gamma + 1) корзины, в которую попадает значение с номером floor(q * (n - 1)) среди n
+        упорядоченных значений, поэтому она отличается от точного значения с этим номером не более чем на a * x.
+        Количество корзин не зависит от количества значений: на отрезок зарплат от 1 до 10^9 при a = 0.01
+        приходится не больше 1037 корзин, а сверх max_bins самые младшие корзины сливаются, и гарантия
+        сохраняется для квантилей, не попавших в слитые корзины. Объединение эскизов с одинаковой точностью
+        точное: корзины складываются, поэтому не зависит от порядка и разбиения данных
+
+    Attributes:
+        relative_accuracy (float): Относительная точность a, от 0 до 1
+        max_bins (int): Наибольшее количество корзин
+        bins (dict[int: int]): Количество значений по номерам корзин
+        zero_count (int): Количество неположительных значений; они оцениваются как 0
+    """
+    RELATIVE_ACCURACY = 0.01
+    MAX_BINS = 2048
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, max_bins=MAX_BINS, bins=None, zero_count=0):
+        """Инициализация объекта QuantileSketch
+
+        Args:
+            relative_accuracy (float): Относительная точность, от 0 до 1
+            max_bins (int): Наибольшее количество корзин
+            bins (dict[int: int] | None): Количество значений по номерам корзин
+            zero_count (int): Количество неположительных значений
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Относительная точность должна быть от 0 до 1: {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.bins = bins if bins is not None else {}
+        self.zero_count = zero_count
+
+    def __eq__(self, other):
+        return isinstance(other, QuantileSketch) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"QuantileSketch({self.relative_accuracy}, {self.max_bins}, {self.bins}, {self.zero_count})"
+
+    def get_gamma(self):
+        """Отношение границ соседних корзин
+
+        Returns:
+            float: gamma = (1 + a) / (1 - a)
+        """
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_log_gamma(relative_accuracy):
+        """Натуральный логарифм gamma для относительной точности; вычисляется один раз на точность
+
+        Args:
+            relative_accuracy (float): Относительная точность
+
+        Returns:
+            float: ln((1 + a) / (1 - a))
+        """
+        return math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+
+    def get_key(self, value):
+        """Номер корзины положительного значения
+
+        Args:
+            value (float): Значение больше 0
+
+        Returns:
+            int: Номер корзины
+        """
+        return math.ceil(math.log(value) / self.get_log_gamma(self.relative_accuracy))
+
+    def count(self):
+        """Количество учтённых значений
+
+        Returns:
+            int: Количество значений
+        """
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value, key=None):
+        """Учёт одного значения
+
+        Args:
+            value (float): Значение
+            key (int | None): Номер корзины значения, если он уже вычислен методом get_key эскиза с той же
+                точностью; None - вычислить
+        """
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = self.get_key(value) if key is None else key
+        if key in self.bins:
+            self.bins[key] += 1
+            return
+        self.bins[key] = 1
+        if len(self.bins) > self.max_bins:
+            self.collapse()
+
+    def collapse(self):
+        """Слияние самых младших корзин в одну, пока корзин больше max_bins
+
+        """
+        keys = sorted(self.bins)
+        collapsed_keys = keys[:len(keys) - self.max_bins + 1]
+        self.bins[collapsed_keys[-1]] = sum(self.bins.pop(key) for key in collapsed_keys)
+
+    def merge(self, other):
+        """Объединение с эскизом другой части данных
+
+        Args:
+            other (QuantileSketch): Эскиз с той же относительной точностью
+
+        Returns:
+            QuantileSketch: Новый эскиз для объединения данных
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Можно объединять только эскизы с одинаковой относительной точностью")
+        bins = dict(self.bins)
+        for (key, count) in other.bins.items():
+            bins[key] = bins.get(key, 0) + count
+        sketch = QuantileSketch(self.relative_accuracy, min(self.max_bins, other.max_bins), bins,
+                                self.zero_count + other.zero_count)
+        if len(sketch.bins) > sketch.max_bins:
+            sketch.collapse()
+        return sketch
+
+    def quantile(self, q):
+        """Оценка квантиля с относительной ошибкой не больше relative_accuracy (см. описание класса)
+
+        Args:
+            q (float): Уровень квантиля от 0 до 1
+
+        Returns:
+            float: Оценка квантиля; 0, если значений нет
+        """
+        rank = math.floor(q * (self.count() - 1)) if self.count() > 0 else 0
+        if rank < self.zero_count or len(self.bins) == 0:
+            return 0
+        passed = self.zero_count
+        gamma = self.get_gamma()
+        for key in sorted(self.bins):
+            passed += self.bins[key]
+            if passed > rank:
+                return 2 * gamma ** key / (gamma + 1)
+        return 0
+
+
+class SalaryAccumulator:
+    """Накопитель статистики зарплат: количество, сумма, минимум, максимум, сумма квадратов отклонений от среднего
+        (M2) для дисперсии и квантильный эскиз. Объединение накопителей ассоциативно и коммутативно (с точностью
+        до округления сумм), поэтому части данных можно обрабатывать в любом порядке и разбиении
+
+    Attributes:
+        count (int): Количество зарплат
+        total (float): Сумма зарплат
+        minimum (float | None): Наименьшая зарплата; None - зарплат нет
+        maximum (float | None): Наибольшая зарплата; None - зарплат нет
+        m2 (float): Сумма квадратов отклонений зарплат от среднего
+        sketch (QuantileSketch): Квантильный эскиз зарплат для медианы и квартилей
+    """
+
+    def __init__(self, count=0, total=0.0, minimum=None, maximum=None, m2=0.0, sketch=None):
+        """Инициализация объекта SalaryAccumulator
+
+        Args:
+            count (int): Количество зарплат
+            total (float): Сумма зарплат
+            minimum (float | None): Наименьшая зарплата
+            maximum (float | None): Наибольшая зарплата
+            m2 (float): Сумма квадратов отклонений зарплат от среднего
+            sketch (QuantileSketch | None): Квантильный эскиз тех же зарплат; None - пустой эскиз
+        """
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+        self.m2 = m2
+        self.sketch = sketch if sketch is not None else QuantileSketch()
+
+    def __eq__(self, other):
+        return isinstance(other, SalaryAccumulator) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"SalaryAccumulator({self.count}, {self.total}, {self.minimum}, {self.maximum}, {self.m2})"
+
+    def add(self, salary, sketch_key=None):
+        """Добавление зарплаты (алгоритм Уэлфорда)
+
+        Args:
+            salary (float): Зарплата
+            sketch_key (int | None): Номер корзины зарплаты в эскизе, см. QuantileSketch.add
+        """
+        delta = salary - self.mean()
+        self.count += 1
+        self.total += salary
+        self.m2 += delta * (salary - self.mean())
+        self.minimum = salary if self.minimum is None else min(self.minimum, salary)
+        self.maximum = salary if self.maximum is None else max(self.maximum, salary)
+        self.sketch.add(salary, sketch_key)
+
+    def merge(self, other):
+        """Объединение с другим накопителем (формула Чана для M2)
+
+        Args:
+            other (SalaryAccumulator): Накопитель другой части данных
+
+        Returns:
+            SalaryAccumulator: Новый накопитель для объединения данных
+        """
+        sketch = self.sketch.merge(other.sketch)
+        if other.count == 0 or self.count == 0:
+            (accumulator, _) = (other, self) if self.count == 0 else (self, other)
+            return SalaryAccumulator(accumulator.count, accumulator.total, accumulator.minimum, accumulator.maximum,
+                                     accumulator.m2, sketch)
+        count = self.count + other.count
+        delta = other.mean() - self.mean()
+        return SalaryAccumulator(count, self.total + other.total, min(self.minimum, other.minimum),
+                                 max(self.maximum, other.maximum),
+                                 self.m2 + other.m2 + delta * delta * self.count * other.count / count, sketch)
+
+    def mean(self):
+        """Средняя зарплата; 0, если зарплат нет
+
+        Returns:
+            float: Средняя зарплата
+        """
+        return self.total / self.count if self.count != 0 else 0
+
+    def variance(self):
+        """Выборочная дисперсия зарплат; 0, если зарплат меньше двух
+
+        Returns:
+            float: Дисперсия
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0
+
+    def quantiles(self, levels=(0.25, 0.5, 0.75)):
+        """Оценки квантилей зарплат по эскизу
+
+        Args:
+            levels (tuple[float]): Уровни квантилей от 0 до 1
+
+        Returns:
+            tuple[float]: Оценки квантилей; 0, если зарплат нет
+        """
+        return tuple(self.sketch.quantile(level) for level in levels)
+
+
+class SpaceSaving:
+    """Сводка частых элементов Space-Saving с ограниченной памятью: хранит не больше capacity счётчиков. Счётчик
+        элемента не меньше его настоящего количества и больше него не более чем на error; каждый элемент, который
+        встречается больше total / capacity раз, гарантированно есть в сводке. Сводки частей данных объединяются
+        по схеме параллельного Space-Saving: отсутствующий в заполненной сводке элемент считается равным её
+        наименьшему счётчику, затем остаются capacity наибольших счётчиков, и гарантии сохраняются. Наименьший
+        счётчик ищется по куче с отложенным обновлением: у каждого элемента в куче одна запись со счётчиком не
+        больше настоящего, и устаревшая запись обновляется, только когда оказывается на вершине. Поэтому учёт
+        элемента стоит O(1), а вытеснение и поиск наименьшего счётчика - O(log capacity) в среднем
+
+    Attributes:
+        capacity (int): Наибольшее количество счётчиков
+        counts (dict[str: int]): Счётчики элементов в порядке первого появления
+        errors (dict[str: int]): Наибольшее завышение счётчиков
+        total (int): Количество всех учтённых элементов
+        heap (list[tuple[int, int, str]]): Куча записей (счётчик, номер записи, элемент)
+        pushes (int): Количество созданных записей кучи; номер записи разрешает равенство счётчиков в пользу
+            более старой записи
+    """
+
+    def __init__(self, capacity, counts=None, errors=None, total=0):
+        """Инициализация объекта SpaceSaving
+
+        Args:
+            capacity (int): Наибольшее количество счётчиков, не меньше 1
+            counts (dict[str: int] | None): Счётчики элементов
+            errors (dict[str: int] | None): Наибольшее завышение счётчиков
+            total (int): Количество всех учтённых элементов
+        """
+        if capacity < 1:
+            raise ValueError(f"Количество счётчиков должно быть не меньше 1: {capacity}")
+        self.capacity = capacity
+        self.counts = counts if counts is not None else {}
+        self.errors = errors if errors is not None else {}
+        self.total = total
+        self.heap = [(count, i, item) for (i, (item, count)) in enumerate(self.counts.items())]
+        heapq.heapify(self.heap)
+        self.pushes = len(self.heap)
+
+    def __eq__(self, other):
+        return isinstance(other, SpaceSaving) and (self.capacity, self.counts, self.errors, self.total) == \
+            (other.capacity, other.counts, other.errors, other.total)
+
+    def __repr__(self):
+        return f"SpaceSaving({self.capacity}, {self.counts}, {self.errors}, {self.total})"
+
+    def get_floor(self):
+        """Наименьший счётчик заполненной сводки: столько раз мог встретиться любой элемент не из сводки
+
+        Returns:
+            int: Наименьший счётчик; 0, если сводка не заполнена
+        """
+        return self.get_min()[0] if len(self.counts) >= self.capacity else 0
+
+    def get_min(self):
+        """Обновление устаревших записей на вершине кучи, пока вершина не совпадёт с настоящим счётчиком
+
+        Returns:
+            tuple[int, int, str]: Запись кучи с наименьшим счётчиком
+        """
+        while self.heap[0][0] != self.counts[self.heap[0][2]]:
+            item = self.heap[0][2]
+            heapq.heapreplace(self.heap, (self.counts[item], self.pushes, item))
+            self.pushes += 1
+        return self.heap[0]
+
+    def add(self, item, count=1):
+        """Учёт элемента. Если сводка заполнена, элемент заменяет элемент с наименьшим счётчиком и получает его
+            счётчик плюс count
+
+        Args:
+            item (str): Элемент
+            count (int): Сколько раз элемент встретился
+        """
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+            return
+        error = 0
+        if len(self.counts) >= self.capacity:
+            (error, _, replaced) = self.get_min()
+            heapq.heappop(self.heap)
+            del self.counts[replaced]
+            del self.errors[replaced]
+        self.counts[item] = error + count
+        self.errors[item] = error
+        heapq.heappush(self.heap, (error + count, self.pushes, item))
+        self.pushes += 1
+
+    def merge(self, other):
+        """Объединение со сводкой другой части данных
+
+        Args:
+            other (SpaceSaving): Сводка другой части данных
+
+        Returns:
+            SpaceSaving: Новая сводка с наименьшей из двух вместимостью
+        """
+        (floor, other_floor) = (self.get_floor(), other.get_floor())
+        items = list(self.counts) + [item for item in other.counts if item not in self.counts]
+        counts = {item: self.counts.get(item, floor) + other.counts.get(item, other_floor) for item in items}
+        errors = {item: self.errors.get(item, floor) + other.errors.get(item, other_floor) for item in items}
+        capacity = min(self.capacity, other.capacity)
+        kept = set(item for (item, _) in heapq.nlargest(capacity, counts.items(), key=lambda pair: pair[1]))
+        return SpaceSaving(capacity, {item: count for (item, count) in counts.items() if item in kept},
+                           {item: error for (item, error) in errors.items() if item in kept}, self.total + other.total)
+
+    def candidates(self, min_count):
+        """Элементы, которые могут встречаться не меньше min_count раз; все такие элементы есть среди них, если
+            min_count больше total / capacity
+
+        Args:
+            min_count (float): Наименьшее количество
+
+        Returns:
+            list[str]: Элементы в порядке первого появления
+        """
+        return [item for (item, count) in self.counts.items() if count >= min_count]
+
+
+class VacancyStatistics:
+    """Накопленная статистика зарплат по годам, городам и месяцам, общая и для выбранной профессии. Для выбранной
+        профессии хранятся все годы и месяцы, в том числе без её вакансий. Если задана сводка частых городов
+        city_counter, города учитываются только в ней, а cities остаётся пустым: память на города ограничена
+        вместимостью сводки
+
+    Attributes:
+        years (dict[int: SalaryAccumulator]): Статистика по годам
+        selected_years (dict[int: SalaryAccumulator]): Статистика по годам для выбранной профессии
+        cities (dict[str: SalaryAccumulator]): Статистика по городам в порядке первого появления
+        months (dict[str: SalaryAccumulator]): Статистика по месяцам вида "2022-01"
+        selected_months (dict[str: SalaryAccumulator]): Статистика по месяцам для выбранной профессии
+        city_counter (SpaceSaving | None): Сводка частых городов; None - города хранятся в cities
+    """
+    GROUPS = ("years", "selected_years", "cities", "months", "selected_months")
+    SKETCH = QuantileSketch()
+
+    def __init__(self, years=None, selected_years=None, cities=None, months=None, selected_months=None,
+                 city_counter=None):
+        """Инициализация объекта VacancyStatistics
+
+        Args:
+            years (dict[int: SalaryAccumulator] | None): Статистика по годам
+            selected_years (dict[int: SalaryAccumulator] | None): Статистика по годам для выбранной профессии
+            cities (dict[str: SalaryAccumulator] | None): Статистика по городам
+            months (dict[str: SalaryAccumulator] | None): Статистика по месяцам
+            selected_months (dict[str: SalaryAccumulator] | None): Статистика по месяцам для выбранной профессии
+            city_counter (SpaceSaving | None): Сводка частых городов
+        """
+        self.years = years if years is not None else {}
+        self.selected_years = selected_years if selected_years is not None else {}
+        self.cities = cities if cities is not None else {}
+        self.months = months if months is not None else {}
+        self.selected_months = selected_months if selected_months is not None else {}
+        self.city_counter = city_counter
+
+    def __eq__(self, other):
+        return isinstance(other, VacancyStatistics) and vars(self) == vars(other)
+
+    def add(self, salary, published_at, area_name, selected):
+        """Учёт одной вакансии
+
+        Args:
+            salary (float): Зарплата
+            published_at (str): Дата публикации; может быть обрезана до года
+            area_name (str): Название города
+            selected (bool): Относится ли вакансия к выбранной профессии
+        """
+        keys = [(self.years, self.selected_years, int(published_at[:4]))]
+        if self.city_counter is not None:
+            self.city_counter.add(area_name)
+        else:
+            keys.append((self.cities, None, area_name))
+        if len(published_at) >= 7:
+            keys.append((self.months, self.selected_months, published_at[:7]))
+        sketch_key = self.SKETCH.get_key(salary) if salary > 0 else None
+        for (group, selected_group, key) in keys:
+            if key not in group:
+                group[key] = SalaryAccumulator()
+            group[key].add(salary, sketch_key)
+            if selected_group is not None:
+                if key not in selected_group:
+                    selected_group[key] = SalaryAccumulator()
+                if selected:
+                    selected_group[key].add(salary, sketch_key)
+
+    def merge(self, other):
+        """Объединение со статистикой другой части данных. Ключи нового объекта идут в порядке первого появления:
+            сначала ключи self, затем новые ключи other
+
+        Args:
+            other (VacancyStatistics): Статистика другой части данных
+
+        Returns:
+            VacancyStatistics: Новая объединённая статистика
+        """
+
+        def merge_groups(first, second):
+            merged = {key: accumulator.merge(second.get(key, SalaryAccumulator()))
+                      for (key, accumulator) in first.items()}
+            merged.update({key: accumulator.merge(SalaryAccumulator())
+                           for (key, accumulator) in second.items() if key not in first})
+            return merged
+
+        city_counters = [counter for counter in (self.city_counter, other.city_counter) if counter is not None]
+        return VacancyStatistics(*(merge_groups(getattr(self, group), getattr(other, group))
+                                   for group in self.GROUPS),
+                                 reduce(SpaceSaving.merge, city_counters) if len(city_counters) > 0 else None)
+
+    @staticmethod
+    def from_columns(columns, area_names, city_capacity=None):
+        """Накопление статистики по столбцам вакансий через NumPy
+
+        Args:
+            columns (dict[str: numpy.ndarray]): Столбцы salary, year, month, area_code и selected
+            area_names (list[str]): Названия городов по кодам столбца area_code
+            city_capacity (int | None): Вместимость сводки частых городов: количества вакансий по городам
+                передаются в SpaceSaving без статистики зарплат; None - статистика по всем городам
+
+        Returns:
+            VacancyStatistics: Накопленная статистика
+        """
+        import numpy as np
+
+        def group_sketches(indexes, bin_keys, positive, keys):
+            sketches = [QuantileSketch() for _ in keys]
+            if positive.any():
+                (pairs, pair_counts) = np.unique(np.stack([indexes[positive], bin_keys[positive]]), axis=1,
+                                                 return_counts=True)
+                for (i, key, count) in zip(pairs[0].tolist(), pairs[1].tolist(), pair_counts.tolist()):
+                    sketches[i].bins[key] = count
+            for (i, zero_count) in enumerate(np.bincount(indexes[~positive], minlength=len(keys)).tolist()):
+                sketches[i].zero_count = zero_count
+                if len(sketches[i].bins) > sketches[i].max_bins:
+                    sketches[i].collapse()
+            return sketches
+
+        def group_accumulators(indexes, salaries, keys, bin_keys, positive):
+            sketches = group_sketches(indexes, bin_keys, positive, keys)
+            counts = np.bincount(indexes, minlength=len(keys))
+            totals = np.bincount(indexes, weights=salaries, minlength=len(keys))
+            means = np.divide(totals, counts, out=np.zeros(len(keys)), where=counts != 0)
+            m2 = np.bincount(indexes, weights=(salaries - means[indexes]) ** 2, minlength=len(keys))
+            (minimums, maximums) = (np.full(len(keys), np.inf), np.full(len(keys), -np.inf))
+            np.minimum.at(minimums, indexes, salaries)
+            np.maximum.at(maximums, indexes, salaries)
+            return {key: SalaryAccumulator(int(counts[i]), float(totals[i]), float(minimums[i]), float(maximums[i]),
+                                           float(m2[i]), sketches[i]) if counts[i] != 0 else SalaryAccumulator()
+                    for (i, key) in enumerate(keys)}
+
+        (salaries, selected) = (columns["salary"], columns["selected"])
+        positive = salaries > 0
+        (unique_salaries, salary_indexes) = np.unique(np.where(positive, salaries, 1.0), return_inverse=True)
+        bin_keys = np.array([VacancyStatistics.SKETCH.get_key(salary) for salary in unique_salaries.tolist()],
+                            dtype=np.int64)[salary_indexes.reshape(-1)]
+        (years, year_indexes) = np.unique(columns["year"], return_inverse=True)
+        (months, month_indexes) = np.unique(columns["year"] * 100 + columns["month"], return_inverse=True)
+        (years, months) = (years.tolist(), [f"{month // 100}-{month % 100:02d}" for month in months.tolist()])
+        if city_capacity is not None:
+            (cities, city_counter) = ({}, SpaceSaving(city_capacity))
+            city_counts = np.bincount(columns["area_code"], minlength=len(area_names)).tolist()
+            for (city, count) in zip(area_names, city_counts):
+                if count != 0:
+                    city_counter.add(city, count)
+        else:
+            cities = group_accumulators(columns["area_code"], salaries, area_names, bin_keys, positive)
+            city_counter = None
+        return VacancyStatistics(group_accumulators(year_indexes, salaries, years, bin_keys, positive),
+                                 group_accumulators(year_indexes[selected], salaries[selected], years,
+                                                    bin_keys[selected], positive[selected]),
+                                 cities,
+                                 group_accumulators(month_indexes, salaries, months, bin_keys, positive),
+                                 group_accumulators(month_indexes[selected], salaries[selected], months,
+                                                    bin_keys[selected], positive[selected]),
+                                 city_counter)
+
+
+class InputConnect:
+    """Класс для работы над списком Vacancy
+
+    """
+
+    def info_formatter(self, vacancies):
+        """Нормализация данных в вакансиях
+
+        Args:
+            vacancies (list[Vacancy]): Список вакансий
+
+        Returns:
+            list[Vacancy]: Результат форматирования
+        """
+
+        def formatter_published_at(attr_value):
+            """Получение года из строки, содержащей дату
+
+
+            """
+            return attr_value[0:4]
+
+        for vacancy in vacancies:
+            setattr(vacancy, "published_at", formatter_published_at(getattr(vacancy, "published_at")))
+        return vacancies
+
+    def year_info_finder(self, vacancies, finder_parameter):
+        """Формирование информации по годам о вакансиях: уровень зарплат по годам, уровень зарплат по годам для
+            выбранной вакансии, количество вакансий по годам, количество вакансий по годам для выбранной вакансии,
+            уровень зарплат по городам, количество вакансий по городам, общее количество вакансий
+
+        """
+        vacancy_statistics = self.accumulate_statistics(vacancies, finder_parameter)
+        return self.year_info_calculating(vacancy_statistics.years, vacancy_statistics.selected_years)
+
+    def city_info_finder(self, vacancies):
+        """Формирование информации по городам о вакансиях: уровень зарплат по городам, доля вакансий по городам
+
+        Args:
+            vacancies (list[Vacancy]): Список вакансий
+
+        Returns:
+            tuple[ dict[str: tuple[int, int]], dict[str: int] ]: Группа списков
+        """
+        return self._city_info_calculating(self.accumulate_statistics(vacancies, "").cities)
+
+    @staticmethod
+    def accumulate_statistics(vacancies, finder_parameter, city_capacity=None):
+        """Накопление статистики зарплат по годам, городам и месяцам. Результаты по частям данных объединяются
+            методом VacancyStatistics.merge
+
+        Args:
+            vacancies (list[Vacancy]): Вакансии; месяцы учитываются, только если дата публикации не обрезана до года
+            finder_parameter (str): Название выбранной вакансии
+            city_capacity (int | None): Вместимость сводки частых городов, в которой учитываются города вместо
+                статистики по всем городам; None - статистика по всем городам
+
+        Returns:
+            VacancyStatistics: Накопленная статистика
+        """
+        vacancy_statistics = VacancyStatistics(city_counter=SpaceSaving(city_capacity)
+                                               if city_capacity is not None else None)
+        for vacancy in vacancies:
+            vacancy_statistics.add(float(vacancy.salary), vacancy.published_at, vacancy.area_name,
+                                   finder_parameter in vacancy.name)
+        return vacancy_statistics
+
+    def year_info_calculating(self, salaries_year_level, selected_salary_year_level):
+        """Вычисление средних зарплат и количеств вакансий по годам из накопленной статистики
+
+        Args:
+            salaries_year_level (dict[int: SalaryAccumulator]): Статистика зарплат по годам
+            selected_salary_year_level (dict[int: SalaryAccumulator]): Статистика зарплат по годам для выбранной
+                вакансии
+
+        Returns:
+            tuple[ dict[int: int], dict[int: int], dict[int: int], dict[int: int] ]:
+                Уровень зарплат по годам, Уровень зарплат по годам для выбранной вакансии, Количество вакансий по годам,
+                Количество вакансий по годам для выбранной вакансии
+        """
+        (vacancies_year_count, selected_vacancy_year_count) = [
+            {year: accumulator.count for (year, accumulator) in dictionary.items()}
+            for dictionary in (salaries_year_level, selected_salary_year_level)]
+        (salaries_year_level, selected_salary_year_level) = [
+            {year: int(accumulator.mean()) for (year, accumulator) in dictionary.items()}
+            for dictionary in (salaries_year_level, selected_salary_year_level)]
+
+        return salaries_year_level, selected_salary_year_level, vacancies_year_count, selected_vacancy_year_count
+
+    @staticmethod
+    def _city_info_calculating(salaries_city_level, vacancies_count=None):
+        """Окончательное форматирование словарей, фильтрация городов с долей вакансий от 1% и выборка первого
+            десятка через heapq.nlargest; при равных значениях раньше идёт город, появившийся раньше
+
+        Args:
+            salaries_city_level (dict[str: SalaryAccumulator]): Статистика зарплат по городам; может содержать
+                только города-кандидаты (см. collect_statistics)
+            vacancies_count (int | None): Количество всех вакансий; None - сумма по salaries_city_level
+
+        Returns:
+            tuple[ dict[str: tuple[int, int]], dict[str: int] ]: Уровень зарплат по городам, Количество вакансий
+                по городам
+        """
+        if vacancies_count is None:
+            vacancies_count = sum(accumulator.count for accumulator in salaries_city_level.values())
+        vacancies_city_share = {city: float(f"{accumulator.count / vacancies_count:.4f}")
+                                for (city, accumulator) in salaries_city_level.items()}
+        vacancies_city_share = {city: share for (city, share) in vacancies_city_share.items() if share >= 0.01}
+        vacancies_city_count = {city: f"{round(share * 100, 2)}%" for (city, share) in
+                                heapq.nlargest(10, vacancies_city_share.items(), key=lambda pair: pair[1])}
+        salaries_city_level = {city: int(salaries_city_level[city].mean()) for city in vacancies_city_share}
+        salaries_city_level = dict(heapq.nlargest(10, salaries_city_level.items(), key=lambda pair: pair[1]))
+        return salaries_city_level, vacancies_city_count
+
+    @staticmethod
+    def quantile_info_calculating(salaries_level, keys=None):
+        """Вычисление квартилей и медианы зарплат по квантильным эскизам накопленной статистики
+
+        Args:
+            salaries_level (dict[object: SalaryAccumulator]): Статистика зарплат по годам, городам или месяцам
+            keys (Iterable | None): Ключи, для которых нужны квантили; None - все ключи
+
+        Returns:
+            dict[object: tuple[int, int, int]]: 25-й процентиль, медиана и 75-й процентиль зарплат по ключам
+        """
+        keys = salaries_level.keys() if keys is None else keys
+        return {key: tuple(int(quantile) for quantile in salaries_level[key].quantiles()) for key in keys}
+
+
+class ExcelSheetWriter:
+    """Класс для потоковой записи листа excel-файла. Строки складываются во временный файл на диске, пока
+        считаются ширины столбцов, и переносятся в write-only лист openpyxl при записи книги
+
+    Attributes:
+        title (str): Название листа
+        widths (list[int]): Наибольшая длина значения в каждом столбце
+        bordered_columns (list[bool]): Нужны ли границы ячейкам столбца; определяется по первой строке данных
+        rows_count (int): Количество добавленных строк
+        spool (tempfile.TemporaryFile): Временный файл со строками
+    """
+
+    def __init__(self, title):
+        """Инициализация объекта ExcelSheetWriter
+
+        Args:
+            title (str): Название листа
+        """
+        self.title = title
+        self.widths = []
+        self.bordered_columns = []
+        self.rows_count = 0
+        self.spool = tempfile.TemporaryFile()
+
+    def append(self, row):
+        """Добавление строки в лист с обновлением ширин столбцов
+
+        Args:
+            row (list[str | int | float | None]): Значения ячеек строки
+        """
+        row = list(row)
+        self.widths.extend([0] * (len(row) - len(self.widths)))
+        for i, value in enumerate(row):
+            self.widths[i] = max(self.widths[i], len(str(value)) if value is not None else 0)
+        if self.rows_count == 1:
+            self.bordered_columns = [value is not None for value in row]
+        pickle.dump(row, self.spool, pickle.HIGHEST_PROTOCOL)
+        self.rows_count += 1
+
+    def write(self, workbook):
+        """Перенос строк в write-only лист книги. Ширины задаются до первой строки, стили - по столбцам:
+            заголовок жирный, у столбцов с данными в первой строке данных есть границы
+
+        Args:
+            workbook (Workbook): Книга openpyxl в режиме write_only
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Border, Side
+        from openpyxl.utils import get_column_letter
+
+        worksheet = workbook.create_sheet(self.title)
+        for i, width in enumerate(self.widths, 1):
+            worksheet.column_dimensions[get_column_letter(i)].width = width + 3
+        bold_font = Font(bold=True)
+        thin = Side(border_style="thin", color="000000")
+        outline = Border(top=thin, left=thin, right=thin, bottom=thin)
+        bordered_columns = self.bordered_columns + [False] * (len(self.widths) - len(self.bordered_columns))
+
+        self.spool.seek(0)
+        for row_index in range(self.rows_count):
+            row = pickle.load(self.spool)
+            row += [None] * (len(self.widths) - len(row))
+            cells = []
+            for value, bordered in zip(row, bordered_columns):
+                cell = WriteOnlyCell(worksheet, value=value)
+                if row_index == 0:
+                    cell.font = bold_font
+                if bordered:
+                    cell.border = outline
+                cells.append(cell)
+            worksheet.append(cells)
+        self.spool.close()
+
+
+class Report:
+    """Класс для генерации файлов по анализу статистики: графиков, excel таблиц, общего pdf-файла
+
+    Attributes:
         salaries_year_level (dict[int: tuple[int, int]]): Уровень зарплат по годам
         selected_salary_year_level (dict[int: tuple[int, int]]): Уровень зарплат по годам для выбранной вакансии
         vacancies_year_count (dict[int: int]): Количество вакансий по годам
         selected_vacancy_year_count (dict[int: int]): Количество вакансий по годам для выбранной вакансии
         salaries_city_level (dict[str: tuple[int, int]]): Уровень зарплат по городам
         vacancies_city_count (dict[str: int]): Количество вакансий по городам
+        salaries_month_level (dict[str: int]): Уровень зарплат по месяцам вида "2022-01"
+        vacancies_month_count (dict[str: int]): Количество вакансий по месяцам
+        selected_salary_month_level (dict[str: int]): Уровень зарплат по месяцам для выбранной вакансии
+        selected_vacancy_month_count (dict[str: int]): Количество вакансий по месяцам для выбранной вакансии
+        salary_quantiles_year_level (dict[int: tuple[int, int, int]]): 25-й процентиль, медиана и 75-й процентиль
+            зарплат по годам
+        selected_salary_quantiles_year_level (dict[int: tuple[int, int, int]]): Квантили зарплат по годам для
+            выбранной вакансии
+        salary_quantiles_city_level (dict[str: tuple[int, int, int]]): Квантили зарплат по городам
+        sample_fraction (float | None): Доля вакансий в выборке, если отчёт - оценка по выборке; None - точный отчёт
+        confidence (float | None): Доверительная вероятность интервалов оценки
+        confidence_intervals (dict[str: dict[object: tuple[float, float]]]): Нижняя и верхняя граница
+            доверительного интервала по показателям (см. ESTIMATE_LABELS) и ключам
     """
+    ESTIMATE_LABELS = {"salaries_year_level": "Уровень зарплат по годам",
+                       "selected_salary_year_level": "Уровень зарплат по годам для выбранной профессии",
+                       "selected_vacancy_year_count": "Количество вакансий по годам для выбранной профессии",
+                       "salaries_city_level": "Уровень зарплат по городам",
+                       "vacancies_city_count": "Доля вакансий по городам, %"}
 
-    def __init__(self, vacancy_info):
+    def __init__(self, vacancy_info, month_info=None, quantile_info=None, estimate_info=None):
         """Инициализация объекта Report
 
         Args:
             vacancy_info (tuple[dict[int: tuple[int, int]], dict[int: tuple[int, int]], dict[int: int],
              dict[int: int], dict[str: tuple[int, int]], dict[str: int]]):
              Все словари созданные методом info_finder класса Input_Connect
+            month_info (tuple[dict[str: int], dict[str: int], dict[str: int], dict[str: int]] | None): Уровень
+                зарплат, количество вакансий, уровень зарплат и количество вакансий для выбранной вакансии
+                по месяцам; None - отчёт без статистики по месяцам
+            quantile_info (tuple[dict[int: tuple[int, int, int]], dict[int: tuple[int, int, int]],
+                dict[str: tuple[int, int, int]]] | None): Квантили зарплат по годам, по годам для выбранной вакансии
+                и по городам; None - отчёт без квантилей
+            estimate_info (tuple[float, float, dict[str: dict[object: tuple[float, float]]]] | None): Доля вакансий
+                в выборке, доверительная вероятность и доверительные интервалы; None - точный отчёт
         """
         self.salaries_year_level = vacancy_info[0]
         self.vacancies_year_count = vacancy_info[1]
@@ -482,24 +2099,114 @@ class Report:
         self.selected_vacancy_year_count = vacancy_info[3]
         self.salaries_city_level = vacancy_info[4]
         self.vacancies_city_count = vacancy_info[5]
+        (self.salaries_month_level, self.vacancies_month_count, self.selected_salary_month_level,
+         self.selected_vacancy_month_count) = month_info or ({}, {}, {}, {})
+        (self.salary_quantiles_year_level, self.selected_salary_quantiles_year_level,
+         self.salary_quantiles_city_level) = quantile_info or ({}, {}, {})
+        (self.sample_fraction, self.confidence, self.confidence_intervals) = estimate_info or (None, None, {})
+
+    def get_estimate_note(self):
+        """Пометка отчёта-оценки по выборке
+
+        Returns:
+            str: Пометка; пустая строка для точного отчёта
+        """
+        if self.sample_fraction is None:
+            return ""
+        return (f"Оценка по выборке {self.sample_fraction:.0%} вакансий, доверительные интервалы "
+                f"с вероятностью {self.confidence:.0%}")
+
+    def get_month_rows(self):
+        """Строки таблицы статистики по месяцам
+
+        Returns:
+            list[list[str | int]]: Месяц, уровень зарплат, уровень зарплат для выбранной вакансии, количество
+                вакансий, количество вакансий для выбранной вакансии
+        """
+        return [[month] + [dictionary.get(month, 0) for dictionary in
+                           (self.salaries_month_level, self.selected_salary_month_level, self.vacancies_month_count,
+                            self.selected_vacancy_month_count)]
+                for month in self.salaries_month_level.keys()]
+
+    def get_extra_tables(self, vacancy_name):
+        """Дополнительные таблицы отчёта, для которых есть данные: статистика по месяцам и квантили зарплат
+
+        Args:
+            vacancy_name (str): Название выбранной вакансии
+
+        Returns:
+            list[tuple[str, list[str], list[list]]]: Название, заголовки и строки каждой таблицы
+        """
+        quantile_headers = ["25-й процентиль", "Медиана", "75-й процентиль"]
+        tables = []
+        if len(self.salaries_month_level) > 0:
+            tables.append(("Статистика по месяцам",
+                           ["Месяц", "Средняя зарплата", f"Средняя зарплата - {vacancy_name}", "Количество вакансий",
+                            f"Количество вакансий - {vacancy_name}"], self.get_month_rows()))
+        if len(self.salary_quantiles_year_level) > 0:
+            tables.append(("Квантили зарплат по годам",
+                           ["Год"] + quantile_headers + [f"{header} - {vacancy_name}" for header in quantile_headers],
+                           [[year, *quantiles, *self.selected_salary_quantiles_year_level.get(year, (0, 0, 0))]
+                            for (year, quantiles) in self.salary_quantiles_year_level.items()]))
+        if len(self.salary_quantiles_city_level) > 0:
+            tables.append(("Квантили зарплат по городам", ["Город"] + quantile_headers,
+                           [[city, *quantiles] for (city, quantiles) in self.salary_quantiles_city_level.items()]))
+        if self.sample_fraction is not None:
+            tables.append(("Доверительные интервалы", ["Показатель", "Ключ", "Нижняя граница", "Верхняя граница"],
+                           [[self.ESTIMATE_LABELS[name], key, *interval]
+                            for (name, intervals) in self.confidence_intervals.items()
+                            for (key, interval) in intervals.items()]))
+        return tables
+
+    def get_graph_rows(self):
+        """Количество строк сетки графиков: графики по месяцам добавляют третью строку
+
+        Returns:
+            int: 2 или 3
+        """
+        return 3 if len(self.salaries_month_level) > 0 else 2
 
     def print_statistics(self):
         """Выводит на печать все статистику
 
         """
+        if self.sample_fraction is not None:
+            print(f"{self.get_estimate_note()}:")
         print("Динамика уровня зарплат по годам:", self.salaries_year_level)
         print("Динамика количества вакансий по годам:", self.vacancies_year_count)
         print("Динамика уровня зарплат по годам для выбранной профессии:", self.selected_salary_year_level)
         print("Динамика количества вакансий по годам для выбранной профессии:", self.selected_vacancy_year_count)
         print("Уровень зарплат по городам (в порядке убывания):", self.salaries_city_level)
         print("Доля вакансий по городам (в порядке убывания):", self.vacancies_city_count)
-
-    def generate_excel(self, vacancy_name):
+        if len(self.salaries_month_level) > 0:
+            print("Динамика уровня зарплат по месяцам:", self.salaries_month_level)
+            print("Динамика количества вакансий по месяцам:", self.vacancies_month_count)
+            print("Динамика уровня зарплат по месяцам для выбранной профессии:", self.selected_salary_month_level)
+            print("Динамика количества вакансий по месяцам для выбранной профессии:",
+                  self.selected_vacancy_month_count)
+        if len(self.salary_quantiles_year_level) > 0:
+            print("Квартили и медиана зарплат по годам:", self.salary_quantiles_year_level)
+            print("Квартили и медиана зарплат по годам для выбранной профессии:",
+                  self.selected_salary_quantiles_year_level)
+            print("Квартили и медиана зарплат по городам:", self.salary_quantiles_city_level)
+        for (name, intervals) in self.confidence_intervals.items():
+            print(f"Доверительные интервалы - {self.ESTIMATE_LABELS[name].lower()}:", intervals)
+
+    def generate_excel(self, vacancy_name, file_name='report.xlsx', write_only=False, detail_sheets=None):
         """Создание excel-файла основываясь на словарях аттрибутов объекта Report
 
         Args:
             vacancy_name (str): Название выбранной вакансии
+            file_name (str): Имя excel-файла
+            write_only (bool): Писать книгу потоково, не держа её целиком в памяти
+            detail_sheets (dict[str: tuple[list[str], Iterable[list]]] | None): Дополнительные листы: название
+                листа и пара из заголовков и строк
         """
+        from openpyxl import Workbook
+
+        if write_only:
+            self.generate_excel_write_only(vacancy_name, file_name, detail_sheets)
+            return
         workbook = Workbook()
         stats_by_year = workbook.worksheets[0]
         stats_by_year.title = "Cтатистика по годам"
@@ -521,14 +2228,73 @@ class Report:
             stats_by_city.cell(row=i, column=4, value=city)
             stats_by_city.cell(row=i, column=5, value=self.vacancies_city_count[city])
 
+        for (title, headers, rows) in self.get_extra_tables(vacancy_name):
+            extra_sheet = workbook.create_sheet(title)
+            extra_sheet.append(headers)
+            for row in rows:
+                extra_sheet.append(row)
+
+        for (title, (headers, rows)) in (detail_sheets or {}).items():
+            detail_sheet = workbook.create_sheet(title)
+            detail_sheet.append(headers)
+            for row in rows:
+                detail_sheet.append(row)
+
         self.workbook(workbook)
-        workbook.save('report.xlsx')
+        workbook.save(file_name)
+
+    def generate_excel_write_only(self, vacancy_name, file_name='report.xlsx', detail_sheets=None):
+        """Потоковое создание excel-файла: ширины столбцов считаются по мере добавления строк, стили задаются
+            по столбцам, книга пишется в режиме write_only
+
+        Args:
+            vacancy_name (str): Название выбранной вакансии
+            file_name (str): Имя excel-файла
+            detail_sheets (dict[str: tuple[list[str], Iterable[list]]] | None): Дополнительные листы: название
+                листа и пара из заголовков и строк
+        """
+        from openpyxl import Workbook
+
+        stats_by_year = ExcelSheetWriter("Cтатистика по годам")
+        stats_by_year.append(["Год", "Средняя зарплата", f"Средняя зарплата - {vacancy_name}",
+                              "Количество вакансий", f"Количество вакансий - {vacancy_name}"])
+        for year in self.salaries_year_level.keys():
+            stats_by_year.append([year] + [dictionary[year] for dictionary in
+                                           (self.salaries_year_level, self.vacancies_year_count,
+                                            self.selected_salary_year_level, self.selected_vacancy_year_count)])
+
+        stats_by_city = ExcelSheetWriter("Cтатистика по городам")
+        stats_by_city.append(["Город", "Уровень зарплат", "", "Город", "Доля вакансий"])
+        for (salary_pair, count_pair) in zip_longest(self.salaries_city_level.items(),
+                                                     self.vacancies_city_count.items(), fillvalue=(None, None)):
+            stats_by_city.append([salary_pair[0], salary_pair[1], None, count_pair[0], count_pair[1]])
+
+        sheets = [stats_by_year, stats_by_city]
+        for (title, headers, rows) in self.get_extra_tables(vacancy_name):
+            extra_sheet = ExcelSheetWriter(title)
+            extra_sheet.append(headers)
+            for row in rows:
+                extra_sheet.append(row)
+            sheets.append(extra_sheet)
+        for (title, (headers, rows)) in (detail_sheets or {}).items():
+            detail_sheet = ExcelSheetWriter(title)
+            detail_sheet.append(headers)
+            for row in rows:
+                detail_sheet.append(row)
+            sheets.append(detail_sheet)
+
+        workbook = Workbook(write_only=True)
+        for sheet in sheets:
+            sheet.write(workbook)
+        workbook.save(file_name)
 
     @staticmethod
     def workbook(wb):
         """Создание графиков
 
         """
+        from openpyxl.styles import Font, Border, Side
+
         bold_font = Font(bold=True)
         thin = Side(border_style="thin", color="000000")
         outline = Border(top=thin, left=thin, right=thin, bottom=thin)
@@ -544,18 +2310,82 @@ class Report:
                 for cell in column:
                     cell.border = outline
 
-    def generate_image(self, vacancy_name):
+    def generate_image(self, vacancy_name, file_name='graph.png'):
         """Создание графиков основываясь на словарях аттрибутов объекта Report
 
         Args:
             vacancy_name (str): Название выбранной вакансии
+            file_name (str): Имя файла с графиками
         """
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 7.5), layout='constrained')
+        import matplotlib.pyplot as plt
+
+        rows = self.get_graph_rows()
+        fig, axes = plt.subplots(rows, 2, figsize=(12, 3.75 * rows), layout='constrained')
+        self.draw_graphs(axes, vacancy_name)
+        plt.savefig(file_name)
+        plt.close(fig)
+
+    def draw_graphs(self, axes, vacancy_name):
+        """Отрисовка всех графиков на сетке осей 2x2 или 3x2. Графики по месяцам рисуются в третьей строке; если
+            статистики по месяцам нет, оси третьей строки скрываются
+
+        Args:
+            axes (numpy.ndarray[Ax]): Сетка осей 2x2 или 3x2
+            vacancy_name (str): Название выбранной вакансии
+        """
+        ((ax1, ax2), (ax3, ax4)) = axes[:2]
         self.generate_salary_year_levels_graph(ax1, vacancy_name)
         self.generate_vacancy_year_count_graph(ax2, vacancy_name)
         self.generate_salary_city_levels_graph(ax3)
         self.generate_vacancy_city_count_graph(ax4)
-        plt.savefig('graph.png')
+        for (ax, draw_graph) in zip(axes[2:].flat, (self.generate_salary_month_levels_graph,
+                                                    self.generate_vacancy_month_count_graph)):
+            ax.set_visible(len(self.salaries_month_level) > 0)
+            if ax.get_visible():
+                draw_graph(ax, vacancy_name)
+
+    @staticmethod
+    def set_month_ticks(ax, months):
+        """Подписи оси месяцев: не больше 24 подписей, чтобы длинные ряды оставались читаемыми
+
+        Args:
+            ax (Ax): Объект графика
+            months (list[str]): Месяцы вида "2022-01"
+        """
+        step = max(1, -(-len(months) // 24))
+        ax.set_xticks(range(0, len(months), step), months[::step], fontsize=8, rotation=90, ha='right')
+
+    def generate_salary_month_levels_graph(self, ax, vacancy_name):
+        """Создание графика уровня зарплат по месяцам
+
+        Args:
+            ax (Ax): Объект графика
+            vacancy_name (str): Название выбранной вакансии
+        """
+        months = list(self.salaries_month_level.keys())
+        ax.plot(range(len(months)), self.salaries_month_level.values(), label='Средняя з/п')
+        ax.plot(range(len(months)), [self.selected_salary_month_level.get(month, 0) for month in months],
+                label=f'З/п {vacancy_name}')
+        self.set_month_ticks(ax, months)
+        ax.set_title("Уровень зарплат по месяцам")
+        ax.yaxis.grid(True)
+        ax.legend(fontsize=8, loc='upper left')
+
+    def generate_vacancy_month_count_graph(self, ax, vacancy_name):
+        """Создание графика количества вакансий по месяцам
+
+        Args:
+            ax (Ax): Объект графика
+            vacancy_name (str): Название выбранной вакансии
+        """
+        months = list(self.vacancies_month_count.keys())
+        ax.plot(range(len(months)), self.vacancies_month_count.values(), label='Количество вакансий')
+        ax.plot(range(len(months)), [self.selected_vacancy_month_count.get(month, 0) for month in months],
+                label=f'Количество вакансий {vacancy_name}')
+        self.set_month_ticks(ax, months)
+        ax.set_title("Количество вакансий по месяцам")
+        ax.yaxis.grid(True)
+        ax.legend(fontsize=8, loc='upper left')
 
     def generate_salary_year_levels_graph(self, ax, vacancy_name):
         """Создание графика уровня зарплат по годам
@@ -564,6 +2394,8 @@ class Report:
             ax (Ax): Объект графика
             vacancy_name (str): Название выбранной вакансии
         """
+        import numpy as np
+
         ax_labels = self.salaries_year_level.keys()
         x = np.arange(len(ax_labels))
         width = 0.35
@@ -574,212 +2406,1047 @@ class Report:
         ax.yaxis.grid(True)
         ax.legend(fontsize=8, loc='upper left')
 
-    def generate_vacancy_year_count_graph(self, ax, vacancy_name):
-        """Создание графика количества вакансий по годам
+    def generate_vacancy_year_count_graph(self, ax, vacancy_name):
+        """Создание графика количества вакансий по годам
+
+        Args:
+            ax (Ax): Объект графика
+            vacancy_name (str): Название выбранной вакансии
+        """
+        import numpy as np
+
+        ax_labels = self.vacancies_year_count.keys()
+        x = np.arange(len(ax_labels))
+        width = 0.35
+        ax.bar(x - width / 2, self.vacancies_year_count.values(), width, label='Количество вакансий')
+        ax.bar(x + width / 2, self.selected_vacancy_year_count.values(), label=f'Количество вакансий {vacancy_name}')
+        ax.set_xticks(x, ax_labels, fontsize=8, rotation=90, ha='right')
+        ax.set_title("Количество вакансий по годам")
+        ax.yaxis.grid(True)
+        ax.legend(fontsize=8, loc='upper left')
+
+    def generate_salary_city_levels_graph(self, ax):
+        """Создание графика уровня зарплат по городам
+
+        Args:
+            ax (Ax): Объект графика
+        """
+        import numpy as np
+
+        ax_labels = self.salaries_city_level.keys()
+        y_pos = np.arange(len(ax_labels))
+        ax.barh(y_pos, self.salaries_city_level.values(), align='center')
+        ax.set_yticks(y_pos, fontsize=8, labels=ax_labels)
+        ax.invert_yaxis()
+        ax.set_title("Уровень зарплат по городам")
+
+    def generate_vacancy_city_count_graph(self, ax):
+        """Создание графика количества вакансий по городам
+
+        Args:
+            ax (Ax): Объект графика
+        """
+        ax_labels, values = list(self.vacancies_city_count.keys()), self.vacancies_city_count.values()
+        ax_labels.append('Другие')
+        values = list(map(lambda value: float(value[:-1]), values))
+        values.append(100 - sum(values))
+        ax.pie(values, labels=ax_labels)
+        ax.set_title("Доля вакансий по городам")
+
+    def generate_pdf(self, vacancy_name, file_name='report.pdf', graph_name='graph.png'):
+        """Создание pdf-файла основываясь на словарях аттрибутов объекта Report
+
+        Args:
+            vacancy_name (str): Название выбранной вакансии
+            file_name (str): Имя pdf-файла
+            graph_name (str): Имя файла с графиками для вставки в pdf-файл
+        """
+        from jinja2 import Environment, FileSystemLoader
+
+        env = Environment(loader=FileSystemLoader('.'))
+        template = env.get_template("pdf_template.html")
+        self.html_to_pdf(self.render_html(template, vacancy_name, graph_name), file_name)
+
+    def render_html(self, template, vacancy_name, graph_name='graph.png'):
+        """Заполнение html-шаблона pdf-файла данными отчёта. Файл с графиками вставляется по абсолютному адресу
+            file://, поэтому находится из любой папки отчётов
+
+        Args:
+            template (jinja2.Template): Загруженный шаблон pdf_template.html
+            vacancy_name (str): Название выбранной вакансии
+            graph_name (str | None): Имя файла с графиками для вставки в pdf-файл; None - pdf-файл без графиков
+
+        Returns:
+            str: Готовая html-страница
+        """
+        headers1, headers2, headers3 = (["Год", "Средняя зарплата", f"Средняя зарплата - {vacancy_name}",
+                                         "Количество вакансий", f"Количество вакансий - {vacancy_name}"],
+                                        ["Город", "Уровень зарплат"], ["Город", "Доля вакансий"])
+        rows1 = list(map(lambda year: [year] + [dictionary[year] for dictionary in
+                                                (self.salaries_year_level, self.vacancies_year_count,
+                                                 self.selected_salary_year_level, self.selected_vacancy_year_count)]
+                         , self.salaries_year_level.keys()))
+        rows2 = list(map(lambda city: [city, self.salaries_city_level[city]], self.salaries_city_level.keys()))
+        rows3 = list(map(lambda city: [city, self.vacancies_city_count[city]], self.vacancies_city_count.keys()))
+        graph_uri = Path(graph_name).resolve().as_uri() if graph_name is not None else None
+        return template.render(graph_uri=graph_uri,
+                               vacancy_name=vacancy_name, headers1=headers1, headers2=headers2,
+                               headers3=headers3, rows1=rows1, rows2=rows2, rows3=rows3,
+                               tables=self.get_extra_tables(vacancy_name), estimate_note=self.get_estimate_note())
+
+    @staticmethod
+    def get_wkhtmltopdf_path():
+        """Поиск программы wkhtmltopdf в PATH
+
+        Returns:
+            str: Путь к wkhtmltopdf
+
+        Raises:
+            FileNotFoundError: wkhtmltopdf не найден в PATH
+        """
+        path = shutil.which('wkhtmltopdf')
+        if path is None:
+            raise FileNotFoundError("Программа wkhtmltopdf не найдена в PATH; установите её для создания pdf-файлов")
+        return path
+
+    @staticmethod
+    def html_to_pdf(html, file_name):
+        """Преобразование html-страницы в pdf-файл с помощью wkhtmltopdf
+
+        Args:
+            html (str): html-страница
+            file_name (str): Имя pdf-файла
+        """
+        import pdfkit
+
+        config = pdfkit.configuration(wkhtmltopdf=Report.get_wkhtmltopdf_path())
+        options = {'enable-local-file-access': None}
+        pdfkit.from_string(html, file_name, options=options, configuration=config)
+
+    @staticmethod
+    def generate_batch(reports, output_dir='reports', processes=None, artifacts=('image', 'excel', 'pdf')):
+        """Создание отчётов сразу для многих профессий. Одна фигура Agg и её оси переиспользуются для всех
+            графиков, шаблон загружается один раз, pdf-файлы создаются пулом процессов wkhtmltopdf. Файлы
+            называются по профессии: graph_<профессия>.png, report_<профессия>.xlsx, report_<профессия>.pdf,
+            см. get_batch_slugs. Без 'image' pdf-файлы создаются без графиков. Наличие wkhtmltopdf проверяется до
+            создания файлов
+
+        Args:
+            reports (dict[str: Report]): Профессия и её отчёт
+            output_dir (str): Папка для файлов отчётов
+            processes (int | None): Количество процессов для pdf-файлов; None - по числу ядер
+            artifacts (tuple[str]): Какие файлы создавать: 'image', 'excel', 'pdf'
+
+        Returns:
+            dict[str: dict[str: str]]: Профессия и имена созданных для неё файлов
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from jinja2 import Environment, FileSystemLoader
+
+        if 'pdf' in artifacts:
+            Report.get_wkhtmltopdf_path()
+        makedirs(output_dir, exist_ok=True)
+        file_names = {}
+        for (vacancy_name, slug) in Report.get_batch_slugs(reports).items():
+            file_names[vacancy_name] = {'image': join(output_dir, f"graph_{slug}.png"),
+                                        'excel': join(output_dir, f"report_{slug}.xlsx"),
+                                        'pdf': join(output_dir, f"report_{slug}.pdf")}
+
+        if 'image' in artifacts:
+            rows = max(report.get_graph_rows() for report in reports.values())
+            fig = Figure(figsize=(12, 3.75 * rows), layout='constrained')
+            FigureCanvasAgg(fig)
+            axes = fig.subplots(rows, 2)
+            for (vacancy_name, report) in reports.items():
+                for ax in axes.flat:
+                    ax.clear()
+                report.draw_graphs(axes, vacancy_name)
+                fig.savefig(file_names[vacancy_name]['image'])
+        if 'excel' in artifacts:
+            for (vacancy_name, report) in reports.items():
+                report.generate_excel(vacancy_name, file_names[vacancy_name]['excel'])
+        if 'pdf' in artifacts:
+            template = Environment(loader=FileSystemLoader('.')).get_template("pdf_template.html")
+            pages = [(report.render_html(template, vacancy_name,
+                                         file_names[vacancy_name]['image'] if 'image' in artifacts else None),
+                      file_names[vacancy_name]['pdf']) for (vacancy_name, report) in reports.items()]
+            with multiprocessing.Pool(processes) as pool:
+                pool.starmap(Report.html_to_pdf, pages)
+        return {vacancy_name: {artifact: names[artifact] for artifact in artifacts}
+                for (vacancy_name, names) in file_names.items()}
+
+    @staticmethod
+    def get_batch_slugs(vacancy_names):
+        """Части имён файлов для профессий: название, в котором всё, кроме букв, цифр и дефиса, заменено на "_".
+            Если названия совпадают после замены (например, "C++ разработчик" и "C# разработчик"), к каждому из них
+            добавляется начало хэша названия, чтобы файлы одной профессии не перезаписывали файлы другой
+
+        Args:
+            vacancy_names (Iterable[str]): Названия профессий
+
+        Returns:
+            dict[str: str]: Профессия и часть имени файла
+        """
+        slugs = {vacancy_name: re.sub(r'[^\w-]+', '_', vacancy_name).strip('_') for vacancy_name in vacancy_names}
+        counts = {}
+        for slug in slugs.values():
+            counts[slug] = counts.get(slug, 0) + 1
+        return {vacancy_name: slug if counts[slug] == 1 else
+                f"{slug}_{hashlib.blake2b(vacancy_name.encode(), digest_size=3).hexdigest()}"
+                for (vacancy_name, slug) in slugs.items()}
+
+    def get_input_hash(self, vacancy_name):
+        """Получение хэша входных данных отчёта: названия профессии и всех словарей статистики
+
+        Args:
+            vacancy_name (str): Название выбранной вакансии
+
+        Returns:
+            str: Хэш входных данных
+        """
+        input_data = [vacancy_name] + [list(dictionary.items()) for dictionary in
+                                       (self.salaries_year_level, self.vacancies_year_count,
+                                        self.selected_salary_year_level, self.selected_vacancy_year_count,
+                                        self.salaries_city_level, self.vacancies_city_count,
+                                        self.salaries_month_level, self.vacancies_month_count,
+                                        self.selected_salary_month_level, self.selected_vacancy_month_count,
+                                        self.salary_quantiles_year_level, self.selected_salary_quantiles_year_level,
+                                        self.salary_quantiles_city_level, self.confidence_intervals)]
+        input_data.append(self.get_estimate_note())
+        return hashlib.sha256(json.dumps(input_data, ensure_ascii=False, default=str).encode()).hexdigest()
+
+    def generate_reports(self, vacancy_name, artifacts=('image', 'excel', 'pdf'), file_names=None,
+                         manifest_path='report_hashes.json', processes=3):
+        """Параллельное создание графиков, excel-файла и pdf-файла в отдельных процессах. Файл пропускается, если
+            он существует и хэш входных данных совпадает с записанным в манифесте при прошлой сборке. pdf-файл
+            создаётся после графиков, так как вставляет их в себя
+
+        Args:
+            vacancy_name (str): Название выбранной вакансии
+            artifacts (tuple[str]): Какие файлы создавать: 'image', 'excel', 'pdf'
+            file_names (dict[str: str] | None): Имена файлов для каждого вида; по умолчанию graph.png, report.xlsx
+                и report.pdf
+            manifest_path (str): Путь к манифесту с хэшами прошлой сборки
+            processes (int): Количество процессов
+
+        Returns:
+            list[str]: Виды файлов, которые были созданы заново
+        """
+        file_names = {'image': 'graph.png', 'excel': 'report.xlsx', 'pdf': 'report.pdf'} | (file_names or {})
+        input_hash = self.get_input_hash(vacancy_name)
+        manifest = {}
+        if isfile(manifest_path):
+            with open(manifest_path, encoding='utf-8') as file:
+                manifest = json.load(file)
+        stale_artifacts = [artifact for artifact in artifacts
+                           if manifest.get(file_names[artifact]) != input_hash or not isfile(file_names[artifact])]
+        if len(stale_artifacts) == 0:
+            return stale_artifacts
+
+        try:
+            with multiprocessing.Pool(max(1, min(processes, len(stale_artifacts)))) as pool:
+                results = {artifact: pool.apply_async(getattr(self, f"generate_{artifact}"),
+                                                      (vacancy_name, file_names[artifact]))
+                           for artifact in stale_artifacts if artifact != 'pdf'}
+                if 'pdf' in stale_artifacts:
+                    if 'image' in results:
+                        results['image'].get()
+                    results['pdf'] = pool.apply_async(self.generate_pdf,
+                                                      (vacancy_name, file_names['pdf'], file_names['image']))
+                for (artifact, result) in results.items():
+                    result.get()
+                    manifest[file_names[artifact]] = input_hash
+        finally:
+            with open(f"{manifest_path}.tmp", mode='w', encoding='utf-8') as file:
+                json.dump(manifest, file, ensure_ascii=False, indent=2)
+            replace(f"{manifest_path}.tmp", manifest_path)
+        return stale_artifacts
+
+
+######################################################################################################################
+
+
+class WorkerPoolError(RuntimeError):
+    """Процесс пула завершился, не вернув результат, или результат задачи нельзя передать в основной процесс"""
+
+
+class Consumer(multiprocessing.Process):
+    """Служит для представления одного процесса, который берёт одну задачу из очереди задач и после выполнения кладёт
+        результат в очереди результатов
+
+    Attributes:
+        task_queue (multiprocessing.JoinableQueue): Очередь задач
+        results (multiprocessing.Queue): Очередь, куда будут складываться результаты
+        context (dict[str: object]): Общие для всех задач объекты; передаются процессу один раз при запуске
+    """
+
+    def __init__(self, task_queue, results, context):
+        """Инициализация объекта Consumer
+
+        Args:
+            task_queue (multiprocessing.JoinableQueue): Очередь задач
+            results (multiprocessing.Queue): Очередь, куда будут складываться результаты
+            context (dict[str: object]): Общие для всех задач объекты
+        """
+        multiprocessing.Process.__init__(self, daemon=True)
+        self.task_queue = task_queue
+        self.results = results
+        self.context = context
+
+    def run(self):
+        """Выполняет задачи, полученные из очереди задач, и сохраняет результат вместе с номером задачи в очереди
+            результатов. Исключение задачи возвращается вместо результата. Ответ сериализуется здесь же, а не
+            в фоновом потоке очереди, чтобы ошибка сериализации тоже вернулась как исключение задачи
+
+        """
+        while True:
+            temp_task = self.task_queue.get()
+
+            if temp_task is None:
+                self.task_queue.task_done()
+                break
+
+            (index, task) = temp_task
+            try:
+                answer = (index, task.process(self.context), None)
+            except Exception as exception:
+                answer = (index, None, exception)
+            try:
+                data = pickle.dumps(answer, pickle.HIGHEST_PROTOCOL)
+            except Exception as exception:
+                data = pickle.dumps((index, None, WorkerPoolError(f"Результат задачи {index} нельзя передать: "
+                                                                  f"{exception!r}")), pickle.HIGHEST_PROTOCOL)
+            self.task_queue.task_done()
+            self.results.put(data)
+
+
+class WorkerPool:
+    """Пул постоянных процессов Consumer, который переиспользуется всеми этапами get_statistics и последующими
+        запросами в том же процессе
+
+    Attributes:
+        processes (int): Количество процессов
+        tasks (multiprocessing.JoinableQueue): Очередь задач
+        results (multiprocessing.Queue): Очередь результатов
+        consumers (list[Consumer]): Процессы пула
+    """
+
+    def __init__(self, processes=None, context=None):
+        """Инициализация объекта WorkerPool и запуск процессов
+
+        Args:
+            processes (int | None): Количество процессов, не меньше 1; None - число ядер без одного
+            context (dict[str: object] | None): Общие для всех задач объекты; по умолчанию DataSet и InputConnect
+        """
+        self.processes = max(1, processes if processes is not None else multiprocessing.cpu_count() - 1)
+        if context is None:
+            context = {'data_set': DataSet(), 'input_connect': InputConnect()}
+        if os_name == "posix":
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        self.tasks = multiprocessing.JoinableQueue()
+        self.results = multiprocessing.Queue()
+        self.consumers = [Consumer(self.tasks, self.results, context) for _ in range(self.processes)]
+        for consumer in self.consumers:
+            consumer.start()
+
+    def is_alive(self):
+        """Проверка, что все процессы пула работают
+
+        Returns:
+            bool: Все процессы пула работают
+        """
+        return len(self.consumers) == self.processes and all(consumer.is_alive() for consumer in self.consumers)
+
+    def map(self, tasks):
+        """Выполнение задач процессами пула. Если хотя бы одна задача завершилась ошибкой, сегменты разделяемой
+            памяти из результатов остальных задач освобождаются. Пока результатов нет, раз в WORKER_POLL_INTERVAL
+            секунд проверяется, что процессы пула живы; если какой-то процесс завершился, пул останавливается
+            и get_worker_pool создаст новый
+
+        Args:
+            tasks (Iterable[ReadTask | CalculateTask]): Задачи с методом process(context)
+
+        Returns:
+            list: Результаты задач в порядке задач
+
+        Raises:
+            WorkerPoolError: Процесс пула завершился или результат задачи нельзя передать
+        """
+        tasks_count = 0
+        for tasks_count, task in enumerate(tasks, 1):
+            self.tasks.put((tasks_count - 1, task))
+        answers = [None] * tasks_count
+        errors = []
+        received = 0
+        while received < tasks_count:
+            try:
+                (index, answer, error) = pickle.loads(self.results.get(timeout=WORKER_POLL_INTERVAL))
+            except queue.Empty:
+                dead = [consumer for consumer in self.consumers if not consumer.is_alive()]
+                if len(dead) == 0:
+                    continue
+                self.terminate()
+                errors.append(WorkerPoolError(f"Процесс пула {dead[0].pid} завершился с кодом {dead[0].exitcode}"))
+                break
+            received += 1
+            answers[index] = answer
+            if error is not None:
+                errors.append(error)
+        if len(errors) != 0:
+            for answer in answers:
+                if isinstance(answer, SharedColumns):
+                    answer.release()
+            raise errors[0]
+        return answers
+
+    def close(self):
+        """Остановка процессов пула
+
+        """
+        for _ in self.consumers:
+            self.tasks.put(None)
+        for consumer in self.consumers:
+            consumer.join()
+        self.consumers.clear()
+
+    def terminate(self):
+        """Принудительная остановка процессов пула, когда очереди пула уже нельзя доверять
+
+        """
+        for consumer in self.consumers:
+            consumer.terminate()
+        for consumer in self.consumers:
+            consumer.join()
+        self.consumers.clear()
+
+
+worker_pool = None
+
+
+def get_worker_pool(processes=None):
+    """Получение общего пула процессов; пул создаётся при первом вызове и пересоздаётся при смене размера или
+        если какой-то его процесс завершился
+
+    Args:
+        processes (int | None): Количество процессов, не меньше 1; None - число ядер без одного
+
+    Returns:
+        WorkerPool: Пул процессов
+    """
+    global worker_pool
+    processes = max(1, processes if processes is not None else multiprocessing.cpu_count() - 1)
+    if worker_pool is not None and not worker_pool.is_alive():
+        worker_pool.terminate()
+        worker_pool = None
+    if worker_pool is not None and worker_pool.processes != processes:
+        worker_pool.close()
+        worker_pool = None
+    if worker_pool is None:
+        worker_pool = WorkerPool(processes)
+        atexit.register(worker_pool.close)
+    return worker_pool
+
+
+class SplitScanTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; собирает годы публикации и количество
+        валют по годам в диапазоне исходного csv файла
+
+    Attributes:
+        file_name (str): Название исходного файла
+        start (int): Начало диапазона байтов файла
+        end (int): Конец диапазона байтов файла
+        fields_count (int): Количество полей в заголовке
+    """
+
+    def __init__(self, file_name, start, end, fields_count):
+        """Инициализирует один объект класса Task
+
+        Args:
+            file_name (str): Название исходного файла
+            start (int): Начало диапазона байтов файла
+            end (int): Конец диапазона байтов файла
+            fields_count (int): Количество полей в заголовке
+        """
+        self.file_name = file_name
+        self.start = start
+        self.end = end
+        self.fields_count = fields_count
+
+    def process(self, context):
+        """Служит командой, которую нужно будет выполнять процессу Consumer
+
+        Args:
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
+
+        Returns:
+            dict[str: dict[str: int]]: Годы в порядке первого появления и количество валют по годам в порядке
+                первого появления
+        """
+        years = {}
+        for row in read_csv_chunk(self.file_name, self.start, self.end):
+            if len(row) == self.fields_count:
+                currency_count = years.setdefault(row[-1][0:4], {})
+                currency_count[row[3]] = currency_count.get(row[3], 0) + 1
+        return years
+
+
+class SplitWriteTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; переводит зарплаты диапазона исходного
+        csv файла в рубли и пишет строки каждого года в отдельный файл-часть
+
+    Attributes:
+        file_name (str): Название исходного файла
+        start (int): Начало диапазона байтов файла
+        end (int): Конец диапазона байтов файла
+        fields_count (int): Количество полей в заголовке
+        popular_currencies (list[str]): Популярные валюты
+        popular_currency_quotes (dict[str: dict[str: float]]): Котировки валют по месяцам
+        shard_prefix (str): Начало пути файлов-частей; часть с ключом key пишется в {shard_prefix}.{key}.csv
+        partition (str): Разбиение на части: "year" или "month"
+    """
+
+    def __init__(self, file_name, start, end, fields_count, popular_currencies, popular_currency_quotes,
+                 shard_prefix, partition="year"):
+        """Инициализирует один объект класса Task
+
+        Args:
+            file_name (str): Название исходного файла
+            start (int): Начало диапазона байтов файла
+            end (int): Конец диапазона байтов файла
+            fields_count (int): Количество полей в заголовке
+            popular_currencies (list[str]): Популярные валюты
+            popular_currency_quotes (dict[str: dict[str: float]]): Котировки валют по месяцам
+            shard_prefix (str): Начало пути файлов-частей
+            partition (str): Разбиение на части: "year" или "month"
+        """
+        self.file_name = file_name
+        self.start = start
+        self.end = end
+        self.fields_count = fields_count
+        self.popular_currencies = popular_currencies
+        self.popular_currency_quotes = popular_currency_quotes
+        self.shard_prefix = shard_prefix
+        self.partition = partition
+
+    def process(self, context):
+        """Служит командой, которую нужно будет выполнять процессу Consumer
+
+        Args:
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
+
+        Returns:
+            dict[str: dict[str: int | str | None]]: Сведения о записанных файлах-частях по ключам; при разбиении
+                по годам есть все годы диапазона
+        """
+        data_set = context['data_set']
+        years_info = {}
+        for row in read_csv_chunk(self.file_name, self.start, self.end):
+            if len(row) == self.fields_count:
+                years_info.setdefault(row[-1][0:4], []).append(row)
+        partitions_info = {}
+        for (year, year_info) in years_info.items():
+            if self.partition == "year":
+                partitions_info.setdefault(year, [])
+            for row in data_set.convert_vacancy_rows(year_info, self.popular_currencies, self.popular_currency_quotes):
+                partitions_info.setdefault(data_set.get_partition_key(row[3], self.partition), []).append(row)
+        for (key, rows) in partitions_info.items():
+            with open(f"{self.shard_prefix}.{key}.csv", mode="w", encoding='utf-8') as shard:
+                csv.writer(shard, delimiter=",", lineterminator="\r").writerows(rows)
+        return {key: data_set.get_partition_statistics(rows) for (key, rows) in partitions_info.items()}
+
+
+class ReadTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; читает данные из заданного csv файла и
+        форматирует их в вакансии
+
+    Attributes:
+        file_name (str): Название файла, из которого нужно брать данные
+        start (int): Начало диапазона байтов файла
+        end (int | None): Конец диапазона байтов; None - весь файл
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+    """
+
+    def __init__(self, file_name, start=0, end=None, vacancy_filter=None):
+        """Инициализирует один объект класса Task
+
+        Args:
+            file_name (str): Название файла, из которого нужно брать данные
+            start (int): Начало диапазона байтов файла
+            end (int | None): Конец диапазона байтов; None - весь файл
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+        """
+        self.file_name = file_name
+        self.start = start
+        self.end = end
+        self.vacancy_filter = vacancy_filter
+
+    def process(self, context):
+        """Служит командой, которую нужно будет выполнять процессу Consumer
 
         Args:
-            ax (Ax): Объект графика
-            vacancy_name (str): Название выбранной вакансии
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
+
+        Returns:
+            list[Vacancy]: Список вакансий за соответствующий год и словари, содержащие статистику
         """
-        ax_labels = self.vacancies_year_count.keys()
-        x = np.arange(len(ax_labels))
-        width = 0.35
-        ax.bar(x - width / 2, self.vacancies_year_count.values(), width, label='Количество вакансий')
-        ax.bar(x + width / 2, self.selected_vacancy_year_count.values(), label=f'Количество вакансий {vacancy_name}')
-        ax.set_xticks(x, ax_labels, fontsize=8, rotation=90, ha='right')
-        ax.set_title("Количество вакансий по годам")
-        ax.yaxis.grid(True)
-        ax.legend(fontsize=8, loc='upper left')
+        vacancies = context['data_set'].get_vacancies_from_file(self.file_name, self.start, self.end,
+                                                                self.vacancy_filter)
+        formatted_vacancies = context['input_connect'].info_formatter(vacancies)
+        return formatted_vacancies
 
-    def generate_salary_city_levels_graph(self, ax):
-        """Создание графика уровня зарплат по городам
+
+class CalculateTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; накапливает статистику зарплат
+        по вакансиям и заданной профессии
+
+    Attributes:
+        vacancy_name (str): Название вакансии для составления статистики
+        vacancies (list[Vacancy]): Вакансии для анализа
+    """
+
+    def __init__(self, vacancy_name, vacancies):
+        """Инициализирует один объект класса Task
 
         Args:
-            ax (Ax): Объект графика
+            vacancy_name (str): Название вакансии для составления статистики
+            vacancies (list[Vacancy]): Вакансии для анализа
         """
-        ax_labels = self.salaries_city_level.keys()
-        y_pos = np.arange(len(ax_labels))
-        ax.barh(y_pos, self.salaries_city_level.values(), align='center')
-        ax.set_yticks(y_pos, fontsize=8, labels=ax_labels)
-        ax.invert_yaxis()
-        ax.set_title("Уровень зарплат по городам")
+        self.vacancy_name = vacancy_name
+        self.vacancies = vacancies
 
-    def generate_vacancy_city_count_graph(self, ax):
-        """Создание графика количества вакансий по городам
+    def process(self, context):
+        """Служит командой, которую нужно будет выполнять процессу Consumer
 
         Args:
-            ax (Ax): Объект графика
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
+
+        Returns:
+            VacancyStatistics: Накопленная статистика для объединения методом VacancyStatistics.merge
         """
-        ax_labels, values = list(self.vacancies_city_count.keys()), self.vacancies_city_count.values()
-        ax_labels.append('Другие')
-        values = list(map(lambda value: float(value[:-1]), values))
-        values.append(100 - sum(values))
-        ax.pie(values, labels=ax_labels)
-        ax.set_title("Доля вакансий по городам")
+        return context['input_connect'].accumulate_statistics(self.vacancies, self.vacancy_name)
 
-    def generate_pdf(self, vacancy_name):
-        """Создание pdf-файла основываясь на словарях аттрибутов объекта Report
+
+class AccumulateTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; читает вакансии из диапазона csv файла и
+        возвращает только накопленную по ним статистику
+
+    Attributes:
+        vacancy_name (str): Название вакансии для составления статистики
+        file_name (str): Название файла, из которого нужно брать данные
+        start (int): Начало диапазона байтов файла
+        end (int | None): Конец диапазона байтов; None - весь файл
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+        city_capacity (int | None): Вместимость сводки частых городов, в которой города учитываются вместо
+            статистики по всем городам, см. VacancyStatistics; None - статистика по всем городам
+    """
+
+    def __init__(self, vacancy_name, file_name, start=0, end=None, vacancy_filter=None, city_capacity=None):
+        """Инициализирует один объект класса Task
 
         Args:
-            vacancy_name (str): Название выбранной вакансии
+            vacancy_name (str): Название вакансии для составления статистики
+            file_name (str): Название файла, из которого нужно брать данные
+            start (int): Начало диапазона байтов файла
+            end (int | None): Конец диапазона байтов; None - весь файл
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+            city_capacity (int | None): Вместимость сводки частых городов
         """
-        headers1, headers2, headers3 = (["Год", "Средняя зарплата", f"Средняя зарплата - {vacancy_name}",
-                                         "Количество вакансий", f"Количество вакансий - {vacancy_name}"],
-                                        ["Город", "Уровень зарплат"], ["Город", "Доля вакансий"])
-        rows1 = list(map(lambda year: [year] + [dictionary[year] for dictionary in
-                                                (self.salaries_year_level, self.vacancies_year_count,
-                                                 self.selected_salary_year_level, self.selected_vacancy_year_count)]
-                         , self.salaries_year_level.keys()))
-        rows2 = list(map(lambda city: [city, self.salaries_city_level[city]], self.salaries_city_level.keys()))
-        rows3 = list(map(lambda city: [city, self.vacancies_city_count[city]], self.vacancies_city_count.keys()))
+        self.vacancy_name = vacancy_name
+        self.file_name = file_name
+        self.start = start
+        self.end = end
+        self.vacancy_filter = vacancy_filter
+        self.city_capacity = city_capacity
 
-        env = Environment(loader=FileSystemLoader('.'))
-        template = env.get_template("pdf_template.html")
-        pdf_template = template.render(graph_name='graph.png',
-                                       vacancy_name=vacancy_name, headers1=headers1, headers2=headers2,
-                                       headers3=headers3, rows1=rows1, rows2=rows2, rows3=rows3)
-        config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        options = {'enable-local-file-access': None}
-        pdfkit.from_string(pdf_template, 'report.pdf', options=options, configuration=config)
+    def process(self, context):
+        """Служит командой, которую нужно будет выполнять процессу Consumer
 
+        Args:
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
 
-######################################################################################################################
+        Returns:
+            VacancyStatistics: Накопленная статистика для объединения методом VacancyStatistics.merge
+        """
+        vacancies = context['data_set'].get_vacancies_from_file(self.file_name, self.start, self.end,
+                                                                self.vacancy_filter)
+        return context['input_connect'].accumulate_statistics(vacancies, self.vacancy_name, self.city_capacity)
 
 
-class Consumer(multiprocessing.Process):
-    """Служит для представления одного процесса, который берёт одну задачу из очереди задач и после выполнения кладёт
-        результат в очереди результатов
+class SharedColumns:
+    """Описание столбцов вакансий части файла в сегменте разделяемой памяти. Между процессами передаётся только
+        это описание, а сами столбцы читаются через NumPy-представления сегмента без копирования
 
     Attributes:
-        task_queue (multiprocessing.JoinableQueue): Очередь задач
-        results (multiprocessing.Queue): Очередь, куда будут складываться результаты
+        name (str): Имя сегмента разделяемой памяти
+        length (int): Количество вакансий
+        area_names (list[str]): Названия городов по кодам столбца area_code
     """
+    DTYPES = (("salary", "float64"), ("year", "int32"), ("month", "int32"), ("area_code", "int32"),
+              ("selected", "bool"))
 
-    def __init__(self, task_queue, results):
-        """Инициализация объекта Consumer
+    def __init__(self, name, length, area_names):
+        """Инициализация объекта SharedColumns
 
         Args:
-            task_queue (multiprocessing.JoinableQueue): Очередь задач
-            vacancies_info (multiprocessing.Queue): Очередь, куда будут складываться результаты
+            name (str): Имя сегмента разделяемой памяти
+            length (int): Количество вакансий
+            area_names (list[str]): Названия городов по кодам столбца area_code
         """
-        multiprocessing.Process.__init__(self)
-        self.task_queue = task_queue
-        self.results = results
+        self.name = name
+        self.length = length
+        self.area_names = area_names
 
-    def run(self):
-        """Выполняет одну задачу, полученную из списка задач, и сохраняет результат в соответствующих
-            очередях результатов
+    @staticmethod
+    def create(vacancies, vacancy_name):
+        """Запись столбцов вакансий в новый сегмент разделяемой памяти. Сегмент остаётся существовать после
+            выхода и должен быть освобождён методом release получателем
+
+        Args:
+            vacancies (list[Vacancy]): Вакансии с полной датой публикации
+            vacancy_name (str): Название профессии для столбца selected
 
+        Returns:
+            SharedColumns: Описание сегмента
         """
-        while True:
-            temp_task = self.task_queue.get()
+        import numpy as np
 
-            if temp_task is None:
-                self.task_queue.task_done()
-                break
+        def fill_views(views):
+            """Копирование значений столбцов в представления сегмента
 
-            answer = temp_task.process()
-            self.task_queue.task_done()
-            self.results.put(answer)
+            Args:
+                views (dict[str: numpy.ndarray]): Столбцы сегмента
+            """
+            for name in views:
+                views[name][:] = values[name]
+
+        area_codes = {}
+        values = {"salary": [float(vacancy.salary) for vacancy in vacancies],
+                  "year": [int(vacancy.published_at[:4]) for vacancy in vacancies],
+                  "month": [int(vacancy.published_at[5:7]) for vacancy in vacancies],
+                  "area_code": [area_codes.setdefault(vacancy.area_name, len(area_codes)) for vacancy in vacancies],
+                  "selected": [vacancy_name in vacancy.name for vacancy in vacancies]}
+        size = sum(np.dtype(dtype).itemsize for (_, dtype) in SharedColumns.DTYPES) * len(vacancies)
+        segment = shared_memory.SharedMemory(create=True, size=max(1, size))
+        columns = SharedColumns(segment.name, len(vacancies), list(area_codes))
+        try:
+            columns._apply_to_segment(segment, fill_views)
+        except BaseException:
+            segment.unlink()
+            raise
+        finally:
+            segment.close()
+        return columns
+
+    def apply(self, function):
+        """Вызов функции над NumPy-представлениями столбцов сегмента
 
+        Args:
+            function (Callable[[dict[str: numpy.ndarray]], object]): Функция; представления нельзя сохранять
+                после её завершения
 
-class ReadTask():
-    """Представляет собой одну задачу для выполнения процессом Consumer; читает данные из заданного csv файла и
-        форматирует их в вакансии
+        Returns:
+            object: Результат функции
+        """
+        segment = shared_memory.SharedMemory(self.name)
+        try:
+            return self._apply_to_segment(segment, function)
+        finally:
+            segment.close()
+
+    def _apply_to_segment(self, segment, function):
+        """Вызов функции над NumPy-представлениями столбцов открытого сегмента. При ошибке ссылки на представления
+            из трассировки очищаются, чтобы сегмент можно было закрыть
+
+        Args:
+            segment (shared_memory.SharedMemory): Открытый сегмент
+            function (Callable[[dict[str: numpy.ndarray]], object]): Функция
+
+        Returns:
+            object: Результат функции
+        """
+        import numpy as np
+
+        try:
+            (views, offset) = ({}, 0)
+            for (name, dtype) in self.DTYPES:
+                views[name] = np.ndarray((self.length,), dtype, segment.buf, offset)
+                offset += views[name].nbytes
+            return function(views)
+        except BaseException as exception:
+            traceback.clear_frames(exception.__traceback__)
+            raise
+        finally:
+            views = None
+
+    def release(self):
+        """Удаление сегмента разделяемой памяти; повторный вызов ничего не делает
+
+        """
+        try:
+            segment = shared_memory.SharedMemory(self.name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+
+class ColumnarReadTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; читает вакансии из диапазона csv файла и
+        записывает их столбцы в разделяемую память
 
     Attributes:
+        vacancy_name (str): Название вакансии для составления статистики
         file_name (str): Название файла, из которого нужно брать данные
-        data_set (DadaSet): Объект DadaSet для анализа данных
-        input_connect (InputConnect): Объект InputConnect для форматирования вакансий
+        start (int): Начало диапазона байтов файла
+        end (int | None): Конец диапазона байтов; None - весь файл
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
     """
 
-    def __init__(self, file_name, data_set, input_connect):
+    def __init__(self, vacancy_name, file_name, start=0, end=None, vacancy_filter=None):
         """Инициализирует один объект класса Task
 
         Args:
+            vacancy_name (str): Название вакансии для составления статистики
             file_name (str): Название файла, из которого нужно брать данные
-            input_connect (InputConnect): Объект InputConnect для форматирования вакансий
+            start (int): Начало диапазона байтов файла
+            end (int | None): Конец диапазона байтов; None - весь файл
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
         """
+        self.vacancy_name = vacancy_name
         self.file_name = file_name
-        self.data_set = data_set
-        self.input_connect = input_connect
+        self.start = start
+        self.end = end
+        self.vacancy_filter = vacancy_filter
 
-    def process(self):
+    def process(self, context):
         """Служит командой, которую нужно будет выполнять процессу Consumer
 
+        Args:
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
+
         Returns:
-            list[Vacancy]: Список вакансий за соответствующий год и словари, содержащие статистику
+            SharedColumns: Описание сегмента со столбцами вакансий
         """
-        vacancies = self.data_set.get_vacancies_from_file(self.file_name)
-        formatted_vacancies = self.input_connect.info_formatter(vacancies)
-        return formatted_vacancies
+        vacancies = context['data_set'].get_vacancies_from_file(self.file_name, self.start, self.end,
+                                                                self.vacancy_filter)
+        return SharedColumns.create(vacancies, self.vacancy_name)
 
 
-class CalculateTask():
-    """Представляет собой одну задачу для выполнения процессом Consumer; составляет статистику о вакансиях
-        по определённому году и заданной профессии
+class SampleTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; делает выборку csv файла на уровне
+        чтения: файл делится на диапазоны байтов по границам записей (см. DataSet.get_file_chunks), случайно
+        выбирается доля fraction диапазонов, и разбираются только строки выбранных диапазонов. Сжатый файл -
+        один диапазон и читается целиком
 
     Attributes:
-        data_set (DadaSet): Объект DadaSet для анализа данных
-        vacancies (list[Vacancy]): Вакансии для анализа
-        input_connect (InputConnect): Объект InputConnect для форматирования и составления статистики по данным
+        vacancy_name (str): Название вакансии для составления статистики
+        file_name (str): Название файла, из которого нужно брать данные
+        fraction (float): Доля диапазонов файла в выборке, от 0 до 1
+        seed (int): Начальное значение генератора; выборка из файла зависит только от него и имени файла
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+        chunk_size (int): Размер диапазона байтов
     """
 
-    def __init__(self, vacancy_name, vacancies, input_connect):
+    def __init__(self, vacancy_name, file_name, fraction, seed=0, vacancy_filter=None, chunk_size=None):
         """Инициализирует один объект класса Task
 
         Args:
             vacancy_name (str): Название вакансии для составления статистики
-            vacancies (list[Vacancy]): Вакансии для анализа
-            input_connect (InputConnect): Объект InputConnect для форматирования и составления статистики по данным
+            file_name (str): Название файла, из которого нужно брать данные
+            fraction (float): Доля диапазонов файла в выборке
+            seed (int): Начальное значение генератора
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+            chunk_size (int | None): Размер диапазона байтов; None - PREVIEW_CHUNK_SIZE
         """
         self.vacancy_name = vacancy_name
-        self.vacancies = vacancies
-        self.input_connect = input_connect
+        self.file_name = file_name
+        self.fraction = fraction
+        self.seed = seed
+        self.vacancy_filter = vacancy_filter
+        self.chunk_size = chunk_size or PREVIEW_CHUNK_SIZE
 
-    def process(self):
+    def process(self, context):
         """Служит командой, которую нужно будет выполнять процессу Consumer
 
+        Args:
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
+
         Returns:
-            tuple[list[Vacancy], tuple[dict[int: tuple[int, int]], dict[int: tuple[int, int]],
-             dict[int: int], dict[int: int]]: Список вакансий за соответствующий год и словари, содержащие статистику
+            tuple[int, int, list[VacancyStatistics]]: Размер файла в байтах, размер прочитанных диапазонов в байтах
+                и статистика строк каждого прочитанного диапазона
         """
-        return self.input_connect.year_info_finder(self.vacancies, self.vacancy_name)
+        import random
 
+        data_set = context['data_set']
+        chunks = data_set.get_file_chunks(self.file_name, self.chunk_size)
+        generator = random.Random(f"{self.seed}:{self.file_name}")
+        sample_size = min(len(chunks), math.ceil(self.fraction * len(chunks)))
+        sample = sorted(generator.sample(range(len(chunks)), sample_size))
+        statistics = [context['input_connect'].accumulate_statistics(
+            data_set.get_vacancies_from_file(self.file_name, *chunks[i], self.vacancy_filter), self.vacancy_name)
+            for i in sample]
+        return (sum(end - start for (start, end) in chunks), sum(chunks[i][1] - chunks[i][0] for i in sample),
+                statistics)
 
-def get_statistics():
-    """Получение информации с csv файла и создание графиков, таблиц и общего pdf-файл со статистикой
-        на основе вводимых пользователем данных
 
+class CityRecountTask():
+    """Представляет собой одну задачу для выполнения процессом Consumer; точно пересчитывает статистику зарплат
+        диапазона csv файла только для городов-кандидатов, не создавая вакансий
+
+    Attributes:
+        file_name (str): Название файла, из которого нужно брать данные
+        start (int): Начало диапазона байтов файла
+        end (int | None): Конец диапазона байтов; None - весь файл
+        cities (frozenset[str]): Города-кандидаты
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
     """
 
-    def get_year_file_paths(folder_path):
-        """Получение названия файлов из определённой папки
+    def __init__(self, file_name, start, end, cities, vacancy_filter=None):
+        """Инициализирует один объект класса Task
+
+        Args:
+            file_name (str): Название файла, из которого нужно брать данные
+            start (int): Начало диапазона байтов файла
+            end (int | None): Конец диапазона байтов; None - весь файл
+            cities (Iterable[str]): Города-кандидаты
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+        """
+        self.file_name = file_name
+        self.start = start
+        self.end = end
+        self.cities = frozenset(cities)
+        self.vacancy_filter = vacancy_filter
+
+    def process(self, context):
+        """Служит командой, которую нужно будет выполнять процессу Consumer
 
         Args:
-            folder_path (str): Название папки, из которой нужно брать имена файлов
+            context (dict[str: object]): Объекты DataSet и InputConnect процесса
 
         Returns:
-            list[str]: Названия файлов
+            dict[str: SalaryAccumulator]: Статистика зарплат городов-кандидатов в порядке первого появления
         """
-        return [f"{folder_path}/{file}" for file in listdir(folder_path) if isfile(join(folder_path, file))]
+        cities = {}
+        for row in context['data_set'].get_rows_from_file(self.file_name, self.start, self.end, self.vacancy_filter):
+            if row[2] in self.cities:
+                if row[2] not in cities:
+                    cities[row[2]] = SalaryAccumulator()
+                cities[row[2]].add(float(row[1]))
+        return cities
+
+
+MIN_CHUNK_SIZE = 256 * 1024
+CITY_SHARE_THRESHOLD = 0.01
+TRANSPORTS = ("pickle", "shared_memory")
+
+
+def collect_statistics(file_paths, vacancy_name, processes=None, chunk_size=None, transport="pickle",
+                       vacancy_filter=None, city_capacity=None):
+    """Накопление статистики по csv файлам годов общим пулом процессов. Файлы делятся на примерно равные диапазоны
+        байтов по границам записей, самые большие диапазоны выполняются первыми, а накопленная по частям статистика
+        объединяется в исходном порядке частей. При transport="shared_memory" процессы возвращают не статистику,
+        а столбцы вакансий в разделяемой памяти, которые обрабатываются через NumPy
+
+    Args:
+        file_paths (list[str]): Пути к csv файлам годов
+        vacancy_name (str): Название профессии
+        processes (int | None): Количество процессов общего пула, не меньше 1; None - число ядер без одного
+        chunk_size (int | None): Размер диапазона в байтах; None - подбирается по размеру данных и числу процессов
+        transport (str): Способ передачи данных от процессов: "pickle" или "shared_memory"
+        vacancy_filter (VacancyFilter | None): Учитывать только подходящие вакансии; строки отбираются процессами
+            до создания вакансий
+        city_capacity (int | None): Ограничение памяти на города: части сразу учитывают города только в сводке
+            частых городов (SpaceSaving) с таким количеством счётчиков, без статистики зарплат по всем городам,
+            а затем вторым проходом
+            точно пересчитываются только города, которые могут набрать долю CITY_SHARE_THRESHOLD; для точности
+            вместимость должна быть больше 1 / CITY_SHARE_THRESHOLD. None - статистика по всем городам
+
+    Returns:
+        VacancyStatistics: Накопленная статистика; при city_capacity в cities только города-кандидаты
+    """
 
-    def concat_dictionaries_in_tuples(tuples):
-        """Используя группы словарей соединить каждый i-тый словарь
+    def map_largest_first(tasks, sizes):
+        """Выполнение задач пулом, начиная с самых больших, с возвратом результатов в исходном порядке
 
         Args:
-            tuples (list[tuple[dict[int: int], dict[int: int], dict[int: int], dict[int: int]]]): Группы словарей для слияния
+            tasks (list[AccumulateTask | ColumnarReadTask]): Задачи
+            sizes (list[int]): Размеры задач
 
         Returns:
-            tuple[dict[int: int], dict[int: int], dict[int: int], dict[int: int]]: Словари после слияния
+            list: Результаты задач в исходном порядке
         """
-        (dict1, dict2, dict3, dict4) = {}, {}, {}, {}
-        for dictionaries in tuples:
-            dict1 = dict1 | dictionaries[0]
-            dict2 = dict2 | dictionaries[1]
-            dict3 = dict3 | dictionaries[2]
-            dict4 = dict4 | dictionaries[3]
-        return dict1, dict2, dict3, dict4
+        order = sorted(range(len(tasks)), key=lambda i: sizes[i], reverse=True)
+        answers = [None] * len(tasks)
+        for (i, answer) in zip(order, pool.map(tasks[i] for i in order)):
+            answers[i] = answer
+        return answers
+
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Неизвестный способ передачи: {transport}")
+    pool = get_worker_pool(processes)
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, sum(stat(file_path).st_size for file_path in file_paths)
+                         // (pool.processes * 4))
+    chunks = [(file_path, start, end) for file_path in file_paths
+              for (start, end) in DataSet.get_file_chunks(file_path, chunk_size)]
+    sizes = [end - start for (_, start, end) in chunks]
+    if transport == "shared_memory":
+        columns_list = map_largest_first([ColumnarReadTask(vacancy_name, *chunk, vacancy_filter) for chunk in chunks],
+                                         sizes)
+        try:
+            statistics_list = [columns.apply(lambda views: VacancyStatistics.from_columns(views, columns.area_names,
+                                                                                          city_capacity))
+                               for columns in columns_list]
+        finally:
+            for columns in columns_list:
+                columns.release()
+    else:
+        statistics_list = map_largest_first([AccumulateTask(vacancy_name, *chunk, vacancy_filter, city_capacity)
+                                             for chunk in chunks], sizes)
+    vacancy_statistics = reduce(VacancyStatistics.merge, statistics_list, VacancyStatistics())
+    if vacancy_statistics.city_counter is None:
+        return vacancy_statistics
+    candidates = vacancy_statistics.city_counter.candidates(
+        CITY_SHARE_THRESHOLD * 0.99 * vacancy_statistics.city_counter.total)
+    recounts = map_largest_first([CityRecountTask(*chunk, candidates, vacancy_filter) for chunk in chunks], sizes)
+    vacancy_statistics.cities = reduce(VacancyStatistics.merge, (VacancyStatistics(cities=cities)
+                                                                 for cities in recounts), VacancyStatistics()).cities
+    return vacancy_statistics
+
+
+def calculate_statistics(file_paths, vacancy_name, processes=None, chunk_size=None, transport="pickle",
+                         vacancy_filter=None, city_capacity=None):
+    """Составление статистики по csv файлам годов общим пулом процессов (см. collect_statistics)
+
+    Args:
+        file_paths (list[str]): Пути к csv файлам годов
+        vacancy_name (str): Название профессии
+        processes (int | None): Количество процессов общего пула, не меньше 1; None - число ядер без одного
+        chunk_size (int | None): Размер диапазона в байтах; None - подбирается по размеру данных и числу процессов
+        transport (str): Способ передачи данных от процессов: "pickle" или "shared_memory"
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+        city_capacity (int | None): Ограничение памяти на города, см. collect_statistics
+
+    Returns:
+        Report: Отчёт со статистикой по годам, городам и месяцам и квантилями зарплат; всё накапливается в одном
+            проходе по данным
+    """
+    return create_statistics_report(collect_statistics(file_paths, vacancy_name, processes, chunk_size, transport,
+                                                       vacancy_filter, city_capacity))
+
+
+def create_statistics_report(vacancy_statistics):
+    """Составление отчёта по накопленной статистике
+
+    Args:
+        vacancy_statistics (VacancyStatistics): Накопленная статистика, см. collect_statistics и
+            VacancyStore.collect_statistics
+
+    Returns:
+        Report: Отчёт со статистикой по годам, городам и месяцам и квантилями зарплат
+    """
 
     def sort_dict_by_key(dictionary):
         """Сортировка словаря лексикографически по ключу
@@ -794,6 +3461,477 @@ def get_statistics():
         dict_pairs.sort(key=cmp_to_key(lambda x, y: -1 if x[0] <= y[0] else 1))
         return dict(dict_pairs)
 
+    input_connect = InputConnect()
+    year_statistics = tuple(sort_dict_by_key(dictionary) for dictionary in
+                            input_connect.year_info_calculating(vacancy_statistics.years,
+                                                                vacancy_statistics.selected_years))
+    city_statistics = input_connect._city_info_calculating(
+        vacancy_statistics.cities, sum(accumulator.count for accumulator in vacancy_statistics.years.values()))
+    (salaries_month_level, selected_salary_month_level, vacancies_month_count, selected_vacancy_month_count) = (
+        sort_dict_by_key(dictionary) for dictionary in
+        input_connect.year_info_calculating(vacancy_statistics.months, vacancy_statistics.selected_months))
+    quantile_statistics = (sort_dict_by_key(input_connect.quantile_info_calculating(vacancy_statistics.years)),
+                           sort_dict_by_key(input_connect.quantile_info_calculating(vacancy_statistics.selected_years)),
+                           input_connect.quantile_info_calculating(vacancy_statistics.cities, city_statistics[0]))
+    return Report(reduce(operator.concat, [year_statistics, city_statistics]),
+                  (salaries_month_level, vacancies_month_count, selected_salary_month_level,
+                   selected_vacancy_month_count), quantile_statistics)
+
+
+class VacancyStore:
+    """База SQLite с вакансиями из csv файлов частей для ответов на запросы статистики без повторного чтения csv.
+        База работает в режиме WAL, чтобы отчёты можно было читать во время загрузки; статистика считается
+        группирующими SQL запросами, а поиск по названию - через таблицу FTS5 с триграммами
+
+    Attributes:
+        connect (sqlite3.connect): Объект управления базой данных
+        cursor (sqlite3.connect): Объект управления базой данных
+        db_path (str): Путь к базе данных
+        full_text_search (bool): Есть ли таблица FTS5 с триграммами; без неё поиск идёт через instr
+    """
+    GROUP_COLUMNS = {"years": "year", "cities": "area_name", "months": "month"}
+    SELECTED_GROUPS = {"years": "selected_years", "months": "selected_months"}
+    TRIGRAM_LENGTH = 3
+
+    def __init__(self, db_path):
+        """Инициализация объекта VacancyStore; таблицы создаются, если их нет
+
+        Args:
+            db_path (str): Путь к базе данных
+        """
+        self.connect = sqlite3.connect(db_path)
+        self.cursor = self.connect.cursor()
+        self.db_path = db_path
+        self.cursor.execute("PRAGMA journal_mode=WAL;")
+        self.cursor.execute("PRAGMA synchronous=NORMAL;")
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS vacancies(\nid INTEGER PRIMARY KEY,\nname TEXT,\n"
+                            "salary REAL,\narea_name TEXT,\npublished_at TEXT,\nyear INTEGER,\nmonth TEXT,\n"
+                            "salary_bin INTEGER);")
+        try:
+            self.cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS vacancy_names USING fts5(name, "
+                                "content='vacancies', content_rowid='id', tokenize='trigram case_sensitive 1');")
+            self.full_text_search = True
+        except sqlite3.OperationalError:
+            self.full_text_search = False
+        self.connect.commit()
+
+    def close(self):
+        """Закрытие соединения с базой
+
+        """
+        self.connect.close()
+
+    def load_files(self, file_paths, data_set=None):
+        """Загрузка строк csv файлов частей вместо прежнего содержимого базы. Строки вставляются одной транзакцией
+            без индексов, индексы по (year, area_name) и published_at и таблица поиска строятся после вставки
+
+        Args:
+            file_paths (list[str]): Пути к csv файлам частей в порядке данных
+            data_set (DataSet | None): Объект чтения файлов; None - DataSet по умолчанию
+        """
+        data_set = data_set or DataSet()
+        sketch = VacancyStatistics.SKETCH
+        with self.connect:
+            self.cursor.execute("DROP INDEX IF EXISTS vacancies_year_area;")
+            self.cursor.execute("DROP INDEX IF EXISTS vacancies_published_at;")
+            self.cursor.execute("DELETE FROM vacancies;")
+            for file_path in file_paths:
+                self.cursor.executemany(
+                    "INSERT INTO vacancies(name, salary, area_name, published_at, year, month, salary_bin)\n"
+                    "VALUES(?, ?, ?, ?, ?, ?, ?);",
+                    ((row[0], salary, row[2], row[3], int(row[3][:4]), row[3][:7],
+                      sketch.get_key(salary) if salary > 0 else None)
+                     for (row, salary) in ((row, float(row[1])) for row in data_set.get_rows_from_file(file_path))))
+            self.cursor.execute("CREATE INDEX vacancies_year_area ON vacancies(year, area_name);")
+            self.cursor.execute("CREATE INDEX vacancies_published_at ON vacancies(published_at);")
+            if self.full_text_search:
+                self.cursor.execute("INSERT INTO vacancy_names(vacancy_names) VALUES('rebuild');")
+        self.cursor.execute("ANALYZE;")
+
+    def get_name_condition(self, vacancy_name):
+        """Условие SQL "название содержит строку", как vacancy_name in vacancy.name. Строки от трёх символов ищутся
+            по таблице FTS5, более короткие - через instr, потому что в них нет ни одной триграммы
+
+        Args:
+            vacancy_name (str): Искомая часть названия
+
+        Returns:
+            tuple[str, list[str]]: Условие и его параметры
+        """
+        if not self.full_text_search or len(vacancy_name) < self.TRIGRAM_LENGTH:
+            return "instr(name, ?) > 0", [vacancy_name]
+        query = '"' + vacancy_name.replace('"', '""') + '"'
+        return "id IN (SELECT rowid FROM vacancy_names WHERE vacancy_names MATCH ?)", [query]
+
+    @staticmethod
+    def get_filter_condition(vacancy_filter):
+        """Условие SQL для условий отбора вакансий, как VacancyFilter.accepts_row. Верхняя граница дат
+            превращается в "раньше следующего дня", чтобы условие шло по индексу published_at
+
+        Args:
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+
+        Returns:
+            tuple[str, list]: Условие и его параметры
+        """
+        from datetime import date, timedelta
+
+        (conditions, params) = (["1"], [])
+        if vacancy_filter is None:
+            return conditions[0], params
+        if vacancy_filter.areas is not None:
+            areas = sorted(vacancy_filter.areas)
+            conditions.append(f"area_name IN ({', '.join('?' for _ in areas)})")
+            params += areas
+        (first_date, last_date) = vacancy_filter.date_range or (None, None)
+        if first_date is not None:
+            conditions.append("published_at >= ?")
+            params.append(first_date)
+        if last_date is not None:
+            conditions.append("published_at < ?")
+            params.append((date.fromisoformat(last_date) + timedelta(days=1)).isoformat())
+        (min_salary, max_salary) = vacancy_filter.salary_range or (None, None)
+        if min_salary is not None:
+            conditions.append("salary >= ?")
+            params.append(min_salary)
+        if max_salary is not None:
+            conditions.append("salary <= ?")
+            params.append(max_salary)
+        return " AND ".join(conditions), params
+
+    def find_vacancies(self, vacancy_name, vacancy_filter=None):
+        """Поиск вакансий, название которых содержит строку
+
+        Args:
+            vacancy_name (str): Искомая часть названия
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+
+        Returns:
+            list[Vacancy]: Вакансии в порядке загрузки
+        """
+        (name_condition, name_params) = self.get_name_condition(vacancy_name)
+        (filter_condition, filter_params) = self.get_filter_condition(vacancy_filter)
+        self.cursor.execute(f"SELECT name, salary, area_name, published_at FROM vacancies\n"
+                            f"WHERE {name_condition} AND {filter_condition}\nORDER BY id;", name_params + filter_params)
+        return DataSet().create_vacancy([[name, str(salary), area_name, published_at]
+                                         for (name, salary, area_name, published_at) in self.cursor.fetchall()])
+
+    @staticmethod
+    def create_accumulator(count, total, minimum, maximum, deviations, squares, zero_count):
+        """Создание накопителя по итогам группы. M2 считается по отклонениям от средней группы, посчитанной
+            первым проходом: сумма квадратов отклонений минус поправка на неточность средней. В отличие от
+            суммы квадратов самих зарплат, такие суммы не теряют точность при больших зарплатах
+
+        Args:
+            count (int): Количество зарплат
+            total (float | None): Сумма зарплат; None - зарплат нет
+            minimum (float | None): Наименьшая зарплата
+            maximum (float | None): Наибольшая зарплата
+            deviations (float | None): Сумма отклонений зарплат от средней первого прохода
+            squares (float | None): Сумма квадратов отклонений зарплат от средней первого прохода
+            zero_count (int | None): Количество неположительных зарплат
+
+        Returns:
+            SalaryAccumulator: Накопитель с пустыми корзинами эскиза
+        """
+        if count == 0:
+            return SalaryAccumulator()
+        return SalaryAccumulator(count, total, minimum, maximum, max(0.0, squares - deviations * deviations / count),
+                                 QuantileSketch(zero_count=zero_count))
+
+    def collect_statistics(self, vacancy_name, vacancy_filter=None):
+        """Накопление статистики группирующими запросами: итоги групп и количества по корзинам эскиза. Ключи идут
+            в порядке первого появления, как в VacancyStatistics, поэтому отчёт совпадает с collect_statistics
+
+        Args:
+            vacancy_name (str): Название профессии
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+
+        Returns:
+            VacancyStatistics: Накопленная статистика
+        """
+        (name_condition, name_params) = self.get_name_condition(vacancy_name)
+        (filter_condition, filter_params) = self.get_filter_condition(vacancy_filter)
+        source = f"(SELECT *, {name_condition} AS selected FROM vacancies WHERE {filter_condition})"
+        params = name_params + filter_params
+        vacancy_statistics = VacancyStatistics()
+        for (group_name, column) in self.GROUP_COLUMNS.items():
+            (group, selected_group) = (getattr(vacancy_statistics, group_name), None)
+            if group_name in self.SELECTED_GROUPS:
+                selected_group = getattr(vacancy_statistics, self.SELECTED_GROUPS[group_name])
+            self.cursor.execute(
+                f"WITH source AS {source},\nmeans AS (SELECT {column} AS key, AVG(salary) AS mean,\n"
+                f"AVG(IIF(selected, salary, NULL)) AS selected_mean FROM source GROUP BY {column})\n"
+                f"SELECT {column}, COUNT(*), SUM(salary), MIN(salary), MAX(salary), SUM(salary - mean),\n"
+                f"SUM((salary - mean) * (salary - mean)), SUM(salary <= 0), SUM(selected),\n"
+                f"SUM(IIF(selected, salary, NULL)), MIN(IIF(selected, salary, NULL)), MAX(IIF(selected, salary, NULL)),"
+                f"\nSUM(IIF(selected, salary - selected_mean, NULL)),\n"
+                f"SUM(IIF(selected, (salary - selected_mean) * (salary - selected_mean), NULL)),\n"
+                f"SUM(selected AND salary <= 0)\nFROM source JOIN means ON {column} = means.key\nGROUP BY {column}\n"
+                f"ORDER BY MIN(id);", params)
+            for (key, *totals) in self.cursor.fetchall():
+                group[key] = self.create_accumulator(*totals[:7])
+                if selected_group is not None:
+                    selected_group[key] = self.create_accumulator(*totals[7:])
+            self.cursor.execute(f"SELECT {column}, salary_bin, COUNT(*), SUM(selected)\nFROM {source}\n"
+                                f"WHERE salary_bin IS NOT NULL\nGROUP BY {column}, salary_bin;", params)
+            for (key, salary_bin, count, selected_count) in self.cursor.fetchall():
+                group[key].sketch.bins[salary_bin] = count
+                if selected_group is not None and selected_count > 0:
+                    selected_group[key].sketch.bins[salary_bin] = selected_count
+        for group_name in VacancyStatistics.GROUPS:
+            for accumulator in getattr(vacancy_statistics, group_name).values():
+                if len(accumulator.sketch.bins) > accumulator.sketch.max_bins:
+                    accumulator.sketch.collapse()
+        return vacancy_statistics
+
+    def calculate_statistics(self, vacancy_name, vacancy_filter=None):
+        """Составление статистики по базе (см. calculate_statistics)
+
+        Args:
+            vacancy_name (str): Название профессии
+            vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+
+        Returns:
+            Report: Отчёт со статистикой по годам, городам и месяцам и квантилями зарплат
+        """
+        return create_statistics_report(self.collect_statistics(vacancy_name, vacancy_filter))
+
+
+CONFIDENCE_Z = {0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+PREVIEW_CHUNK_SIZE = 32 * 1024
+
+
+def calculate_preview_statistics(file_paths, vacancy_name, fraction=0.05, seed=0, processes=None,
+                                 vacancy_filter=None, confidence=0.95):
+    """Быстрая оценка статистики по выборке, стратифицированной по файлам частей: из каждого файла случайно
+        выбирается доля fraction диапазонов байтов, и читаются и разбираются только они (см. SampleTask).
+        Количество вакансий по годам и месяцам оценивается умножением количества в прочитанных строках на
+        отношение размера файла к размеру прочитанных диапазонов; средние зарплаты, доли городов и количество
+        вакансий выбранной профессии оцениваются по прочитанным строкам с доверительными интервалами нормального
+        приближения с поправкой на конечность совокупности. Соседние строки файла похожи (например, по дате),
+        поэтому дисперсия оценок считается и по диапазонам как по кластерам, и интервал строится по большей из
+        дисперсий кластерной и простой случайной выборки. Выборка воспроизводима: она зависит только от seed
+        и имён файлов
+
+    Args:
+        file_paths (list[str]): Пути к csv файлам частей
+        vacancy_name (str): Название профессии
+        fraction (float): Доля вакансий в выборке, от 0 до 1
+        seed (int): Начальное значение генератора случайных чисел
+        processes (int | None): Количество процессов общего пула, не меньше 1; None - число ядер без одного
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+        confidence (float): Доверительная вероятность: 0.9, 0.95 или 0.99
+
+    Returns:
+        Report: Отчёт-оценка с доверительными интервалами
+    """
+
+    def sort_dict_by_key(dictionary):
+        """Сортировка словаря по ключу
+
+        Args:
+            dictionary (dict): Словарь для сортировки
+
+        Returns:
+            dict: Отсортированный словарь
+        """
+        return dict(sorted(dictionary.items()))
+
+    def cluster_variance(pairs, finite_correction):
+        """Дисперсия отношения sum(y) / sum(n) по прочитанным диапазонам как по кластерам
+
+        Args:
+            pairs (list[tuple[float, int]]): Сумма признака y и количество строк n в каждом диапазоне
+            finite_correction (float): Поправка на конечность совокупности 1 - n / N
+
+        Returns:
+            float: Дисперсия; 0, если диапазонов меньше двух
+        """
+        count = sum(n for (_, n) in pairs)
+        if len(pairs) < 2 or count == 0:
+            return 0
+        ratio = sum(y for (y, _) in pairs) / count
+        return (finite_correction * len(pairs) / (len(pairs) - 1) * sum((y - ratio * n) ** 2 for (y, n) in pairs)
+                / (count * count))
+
+    def mean_interval(accumulator, finite_correction, group, key):
+        """Доверительный интервал средней зарплаты
+
+        Args:
+            accumulator (SalaryAccumulator): Статистика зарплат выборки
+            finite_correction (float): Поправка на конечность совокупности 1 - n / N
+            group (str): Группа статистики диапазонов из VacancyStatistics.GROUPS
+            key (int | str): Ключ группы
+
+        Returns:
+            tuple[int | None, int | None]: Нижняя и верхняя граница; None - в выборке меньше двух зарплат
+        """
+        if accumulator.count < 2:
+            return None, None
+        pairs = [(getattr(statistics, group)[key].total, getattr(statistics, group)[key].count)
+                 if key in getattr(statistics, group) else (0, 0) for statistics in chunk_statistics]
+        variance = max(accumulator.variance() / accumulator.count * finite_correction,
+                       cluster_variance(pairs, finite_correction))
+        half_width = z * math.sqrt(variance)
+        return int(accumulator.mean() - half_width), int(accumulator.mean() + half_width)
+
+    def share_interval(count, total, finite_correction, pairs):
+        """Доверительный интервал доли по Уилсону; он не вырождается для редких признаков. Поправка на конечность
+            совокупности и сходство строк одного диапазона учитываются через эффективный размер выборки
+            n / (1 - n / N) / d, где d - отношение кластерной дисперсии доли к дисперсии простой выборки, не
+            меньше 1
+
+        Args:
+            count (int): Количество вакансий с признаком в выборке
+            total (int): Размер выборки
+            finite_correction (float): Поправка на конечность совокупности 1 - n / N
+            pairs (list[tuple[int, int]]): Количество вакансий с признаком и всех вакансий в каждом диапазоне
+
+        Returns:
+            tuple[float, float]: Нижняя и верхняя граница доли от 0 до 1
+        """
+        share = count / total if total > 0 else 0
+        if total == 0 or finite_correction <= 0:
+            return share, share
+        simple_variance = share * (1 - share) / total * finite_correction
+        design_effect = max(1.0, cluster_variance(pairs, finite_correction) / simple_variance
+                            if simple_variance > 0 else 1.0)
+        effective_total = total / finite_correction / design_effect
+        denominator = 1 + z * z / effective_total
+        center = (share + z * z / (2 * effective_total)) / denominator
+        half_width = z * math.sqrt(share * (1 - share) / effective_total
+                                   + z * z / (4 * effective_total * effective_total)) / denominator
+        return max(0.0, center - half_width), min(1.0, center + half_width)
+
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Доля выборки должна быть от 0 до 1: {fraction}")
+    if confidence not in CONFIDENCE_Z:
+        raise ValueError(f"Доверительная вероятность должна быть одной из {sorted(CONFIDENCE_Z)}: {confidence}")
+    z = CONFIDENCE_Z[confidence]
+    results = get_worker_pool(processes).map(SampleTask(vacancy_name, file_path, fraction, seed, vacancy_filter)
+                                             for file_path in file_paths)
+    (years_count, months_count) = ({}, {})
+    for (file_size, read_size, file_statistics) in results:
+        for statistics in file_statistics:
+            for (counts, group) in ((years_count, statistics.years), (months_count, statistics.months)):
+                for (key, accumulator) in group.items():
+                    counts[key] = counts.get(key, 0) + accumulator.count * file_size / max(1, read_size)
+    (years_count, months_count) = ({key: round(count) for (key, count) in counts.items()}
+                                   for counts in (years_count, months_count))
+    chunk_statistics = [statistics for (_, _, file_statistics) in results for statistics in file_statistics]
+    sample = reduce(VacancyStatistics.merge, chunk_statistics, VacancyStatistics())
+    input_connect = InputConnect()
+
+    (salaries_year_level, selected_salary_year_level, _, _) = (
+        sort_dict_by_key(dictionary) for dictionary in
+        input_connect.year_info_calculating(sample.years, sample.selected_years))
+    year_corrections = {year: 1 - sample.years[year].count / years_count[year] for year in salaries_year_level}
+    selected_shares = {year: share_interval(sample.selected_years[year].count, sample.years[year].count,
+                                            year_corrections[year],
+                                            [(statistics.selected_years[year].count, statistics.years[year].count)
+                                             if year in statistics.years else (0, 0)
+                                             for statistics in chunk_statistics])
+                       for year in salaries_year_level}
+    vacancies_year_count = {year: years_count[year] for year in salaries_year_level}
+    selected_vacancy_year_count = {year: round(years_count[year] * sample.selected_years[year].count
+                                               / sample.years[year].count) for year in salaries_year_level}
+    (salaries_city_level, vacancies_city_count) = input_connect._city_info_calculating(sample.cities)
+    sample_size = sum(accumulator.count for accumulator in sample.years.values())
+    total_correction = 1 - sample_size / max(1, sum(years_count.values()))
+    intervals = {
+        "salaries_year_level": {year: mean_interval(sample.years[year], year_corrections[year], "years", year)
+                                for year in salaries_year_level},
+        "selected_salary_year_level": {year: mean_interval(sample.selected_years[year], year_corrections[year],
+                                                           "selected_years", year)
+                                       for year in salaries_year_level},
+        "selected_vacancy_year_count": {year: (round(years_count[year] * low), round(years_count[year] * high))
+                                        for (year, (low, high)) in selected_shares.items()},
+        "salaries_city_level": {city: mean_interval(sample.cities[city], total_correction, "cities", city)
+                                for city in salaries_city_level},
+        "vacancies_city_count": {city: tuple(round(bound * 100, 2) for bound in
+                                             share_interval(sample.cities[city].count, sample_size, total_correction,
+                                                            [(statistics.cities[city].count
+                                                              if city in statistics.cities else 0,
+                                                              sum(accumulator.count
+                                                                  for accumulator in statistics.years.values()))
+                                                             for statistics in chunk_statistics]))
+                                 for city in vacancies_city_count}}
+
+    (salaries_month_level, selected_salary_month_level, sample_month_count, sample_selected_month_count) = (
+        sort_dict_by_key(dictionary) for dictionary in
+        input_connect.year_info_calculating(sample.months, sample.selected_months))
+    vacancies_month_count = {month: months_count[month] for month in salaries_month_level}
+    selected_vacancy_month_count = {month: round(months_count[month] * sample_selected_month_count[month]
+                                                 / sample_month_count[month]) for month in salaries_month_level}
+    quantile_statistics = (sort_dict_by_key(input_connect.quantile_info_calculating(sample.years)),
+                           sort_dict_by_key(input_connect.quantile_info_calculating(sample.selected_years)),
+                           input_connect.quantile_info_calculating(sample.cities, salaries_city_level))
+    return Report((salaries_year_level, selected_salary_year_level, vacancies_year_count, selected_vacancy_year_count,
+                   salaries_city_level, vacancies_city_count),
+                  (salaries_month_level, vacancies_month_count, selected_salary_month_level,
+                   selected_vacancy_month_count), quantile_statistics, (fraction, confidence, intervals))
+
+
+def get_partition_paths(folder_path, vacancy_filter=None):
+    """Получение путей к файлам частей из папки. Если в папке есть манифест частей (см. DataSet.csv_create_years),
+        пустые части и части, в которых по сведениям манифеста нет подходящих вакансий, не открываются вовсе
+
+    Args:
+        folder_path (str): Папка с файлами частей
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий
+
+    Returns:
+        list[str]: Пути к файлам частей
+    """
+    manifest_path = join(folder_path, PARTITION_MANIFEST)
+    if not isfile(manifest_path):
+        return [f"{folder_path}/{file}" for file in listdir(folder_path) if isfile(join(folder_path, file))]
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    vacancy_filter = vacancy_filter or VacancyFilter()
+    return [f"{folder_path}/{file}" for (file, info) in manifest["files"].items()
+            if vacancy_filter.accepts_partition(info)]
+
+
+def get_last_months_range(count, today=None):
+    """Диапазон дат за последние месяцы, включая текущий
+
+    Args:
+        count (int): Количество месяцев, не меньше 1
+        today (datetime.date | None): Текущая дата; None - сегодня
+
+    Returns:
+        tuple[str, str]: Первый день первого месяца и текущая дата в виде "ГГГГ-ММ-ДД"
+    """
+    from datetime import date
+
+    today = today or date.today()
+    month_index = today.year * 12 + today.month - count
+    return date(month_index // 12, month_index % 12 + 1, 1).isoformat(), today.isoformat()
+
+
+def get_statistics(processes=None, vacancy_filter=None, preview_fraction=None, seed=0, city_capacity=None,
+                   store_path=None, compression=None):
+    """Получение информации с csv файла и создание графиков, таблиц и общего pdf-файл со статистикой
+        на основе вводимых пользователем данных. Файл разбивается по месяцам, и для статистики открываются
+        только месяцы, в которых могут быть подходящие вакансии
+
+    Args:
+        processes (int | None): Количество процессов общего пула, не меньше 1; None - число ядер без одного
+        vacancy_filter (VacancyFilter | None): Условия отбора вакансий, например
+            VacancyFilter(["Москва"], get_last_months_range(6)); None - все вакансии
+        preview_fraction (float | None): Режим предпросмотра: оценка по выборке такой доли вакансий (см.
+            calculate_preview_statistics); уже разбитый по месяцам файл не разбивается заново, даже если он старше
+            исходного. None - точная статистика
+        seed (int): Начальное значение генератора выборки для режима предпросмотра
+        city_capacity (int | None): Ограничение памяти на города для точной статистики, см. collect_statistics;
+            None - статистика по всем городам
+        store_path (str | None): Путь к базе VacancyStore для точной статистики: месяцы загружаются в неё, если
+            она старше разбиения, и статистика считается SQL запросами. None - статистика по csv файлам
+        compression (str | None): Сжатие файлов месяцев, например ".gz", см. DataSet.split_csv_by_year
+    """
+
     input_requests = ["Введите название файла: ", "Введите название профессии: "]
     # input_info = [input(input_request) for input_request in input_requests]
     input_info = ["vacancies_by_year.csv", "Javascript"]
@@ -801,45 +3939,30 @@ def get_statistics():
         print("Пустой файл")
         return
 
-    input_connect = InputConnect()
     data_set = DataSet()
 
-    data_set.split_csv_by_year(input_info[0])
-    year_file_paths = get_year_file_paths("years")
-
-    tasks = multiprocessing.JoinableQueue()
-    results = multiprocessing.Queue()
-    consumers_count = multiprocessing.cpu_count() - 1
-
-    consumers = [Consumer(tasks, results) for _ in range(consumers_count)]
-    for consumer in consumers:
-        consumer.start()
-    for file_path in year_file_paths:
-        tasks.put(ReadTask(file_path, data_set, input_connect))
-    for _ in range(consumers_count):
-        tasks.put(None)
-    tasks.join()
-    consumers.clear()
-
-    all_vacancies_list = [results.get() for _ in range(len(year_file_paths))]
-    tasks.empty()
-    results.empty()
-
-    tasks = multiprocessing.JoinableQueue()
-    results = multiprocessing.Queue()
-    consumers = [Consumer(tasks, results) for _ in range(consumers_count)]
-    for consumer in consumers:
-        consumer.start()
-    for vacancies_list in all_vacancies_list:
-        tasks.put(CalculateTask(input_info[1], vacancies_list, input_connect))
-    for _ in range(consumers_count):
-        tasks.put(None)
-    tasks.join()
-    consumers.clear()
-
-    all_statistics = concat_dictionaries_in_tuples([results.get() for _ in range(len(year_file_paths))])
-    year_statistics = tuple(sort_dict_by_key(dictionary) for dictionary in all_statistics)
-    city_statistics = input_connect.city_info_finder(reduce(operator.concat, all_vacancies_list))
-    report = Report(reduce(operator.concat, [year_statistics, city_statistics]))
+    manifest_path = join("months", PARTITION_MANIFEST)
+    if preview_fraction is not None and isfile(manifest_path) \
+            and stat(manifest_path).st_mtime < stat(input_info[0]).st_mtime:
+        print("Предпросмотр по прежнему разбиению по месяцам: исходный файл изменился после разбиения")
+    if preview_fraction is None or not isfile(manifest_path):
+        makedirs("months", exist_ok=True)
+        data_set.split_csv_by_year(input_info[0], processes, output_dir="months", pipelined=True, partition="month",
+                                   compression=compression)
+    month_file_paths = get_partition_paths("months", vacancy_filter)
+
+    if preview_fraction is None and store_path is not None:
+        store_is_stale = not isfile(store_path) or stat(store_path).st_mtime < stat(manifest_path).st_mtime
+        vacancy_store = VacancyStore(store_path)
+        if store_is_stale:
+            vacancy_store.load_files(get_partition_paths("months"))
+        report = vacancy_store.calculate_statistics(input_info[1], vacancy_filter)
+        vacancy_store.close()
+    elif preview_fraction is None:
+        report = calculate_statistics(month_file_paths, input_info[1], processes, vacancy_filter=vacancy_filter,
+                                      city_capacity=city_capacity)
+    else:
+        report = calculate_preview_statistics(month_file_paths, input_info[1], preview_fraction, seed, processes,
+                                              vacancy_filter)
 
     report.print_statistics()
@@ -0,0 +1,851 @@
+import csv
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+from datetime import date
+from functools import reduce
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from importlib.util import find_spec
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader
+from openpyxl import load_workbook
+from statistics import ApiReader, Report, WorkerPool, ReadTask, CalculateTask, DataSet, InputConnect, get_worker_pool, \
+    calculate_statistics, ColumnarReadTask, SharedColumns, SalaryAccumulator, VacancyStatistics, get_partition_paths, \
+    get_last_months_range, VacancyFilter, QuantileSketch, SampleTask, calculate_preview_statistics, SpaceSaving, \
+    VacancyStore, HttpCache, HttpCacheMiss, HHruApiConnect, AccumulateTask, WorkerPoolError
+from vacancy import open_compressed
+from benchmark import measure_import_time, HEAVY_MODULES
+
+REPORT_INFO = ({2007: 38916, 2008: 43646}, {2007: 2196, 2008: 17549}, {2007: 43770, 2008: 50412},
+               {2007: 317, 2008: 2460}, {"Москва": 76970, "Санкт-Петербург": 65286, "Тюмень": 45000},
+               {"Москва": "45.16%", "Санкт-Петербург": "16.94%"})
+MONTH_INFO = ({"2007-12": 38916, "2008-01": 43646}, {"2007-12": 2196, "2008-01": 1549},
+              {"2007-12": 43770, "2008-01": 50412}, {"2007-12": 317, "2008-01": 0})
+
+
+class GenerateExcelTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    @staticmethod
+    def read_workbook(file_name):
+        workbook = load_workbook(file_name)
+        return [(worksheet.title,
+                 {key: dimension.width for key, dimension in worksheet.column_dimensions.items()},
+                 [[(cell.value, cell.font.b, cell.border.left.style) for cell in row] for row in worksheet.iter_rows()])
+                for worksheet in workbook.worksheets]
+
+    def test_write_only_equals_regular(self):
+        regular_name, write_only_name = (os.path.join(self.folder.name, name) for name in ("a.xlsx", "b.xlsx"))
+        detail_rows = [[year, f"Вакансия {year}", year * 1.5] for year in range(2000, 2300)]
+        Report(REPORT_INFO).generate_excel("Программист", regular_name,
+                                           detail_sheets={"Вакансии": (["Год", "Название", "Оклад"], detail_rows)})
+        Report(REPORT_INFO).generate_excel("Программист", write_only_name, write_only=True,
+                                           detail_sheets={"Вакансии": (["Год", "Название", "Оклад"],
+                                                                       iter(detail_rows))})
+        self.assertEqual(self.read_workbook(write_only_name), self.read_workbook(regular_name))
+
+
+class GenerateReportsTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_names = {"image": os.path.join(self.folder.name, "graph.png"),
+                           "excel": os.path.join(self.folder.name, "report.xlsx")}
+        self.manifest_path = os.path.join(self.folder.name, "report_hashes.json")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def generate(self, report_info, vacancy_name="Программист"):
+        return Report(report_info).generate_reports(vacancy_name, ("image", "excel"), self.file_names,
+                                                    self.manifest_path)
+
+    def test_unchanged_input_is_skipped(self):
+        self.assertEqual(self.generate(REPORT_INFO), ["image", "excel"])
+        self.assertTrue(all(os.path.isfile(file_name) for file_name in self.file_names.values()))
+        self.assertEqual(self.generate(REPORT_INFO), [])
+
+    def test_changed_input_is_regenerated(self):
+        self.generate(REPORT_INFO)
+        self.assertEqual(self.generate(REPORT_INFO, "Аналитик"), ["image", "excel"])
+        changed_info = (REPORT_INFO[0] | {2008: 1},) + REPORT_INFO[1:]
+        self.assertEqual(self.generate(changed_info, "Аналитик"), ["image", "excel"])
+
+    def test_missing_file_is_regenerated(self):
+        self.generate(REPORT_INFO)
+        os.remove(self.file_names["excel"])
+        self.assertEqual(self.generate(REPORT_INFO), ["excel"])
+
+
+class GenerateBatchTests(unittest.TestCase):
+    def test_files_named_per_profession(self):
+        with tempfile.TemporaryDirectory() as folder:
+            reports = {"Программист": Report(REPORT_INFO), "C++ разработчик": Report(REPORT_INFO)}
+            file_names = Report.generate_batch(reports, folder, artifacts=("image", "excel"))
+            self.assertEqual(file_names["C++ разработчик"],
+                             {"image": os.path.join(folder, "graph_C_разработчик.png"),
+                              "excel": os.path.join(folder, "report_C_разработчик.xlsx")})
+            self.assertTrue(all(os.path.isfile(file_name) for names in file_names.values()
+                                for file_name in names.values()))
+
+    def test_names_differing_in_punctuation(self):
+        names = ["C++ разработчик", "C# разработчик", "C разработчик", "Программист"]
+        slugs = Report.get_batch_slugs(names)
+        self.assertEqual(len(set(slugs.values())), len(names))
+        self.assertEqual(slugs["Программист"], "Программист")
+        self.assertTrue(all(slugs[name].startswith("C_разработчик_") for name in names[:3]))
+        with tempfile.TemporaryDirectory() as folder:
+            file_names = Report.generate_batch({name: Report(REPORT_INFO) for name in names}, folder,
+                                               artifacts=("image", "excel"))
+            self.assertEqual(len(os.listdir(folder)), 2 * len(names))
+            self.assertEqual(file_names["C# разработчик"]["excel"],
+                             os.path.join(folder, f"report_{slugs['C# разработчик']}.xlsx"))
+
+    def test_render_html(self):
+        template = Environment(loader=FileSystemLoader(".")).get_template("pdf_template.html")
+        with tempfile.TemporaryDirectory() as folder:
+            graph_name = os.path.join(folder, "graph_Программист.png")
+            html = Report(REPORT_INFO).render_html(template, "Программист", graph_name)
+            self.assertIn(f'src="{Path(graph_name).resolve().as_uri()}"', html)
+        self.assertNotIn("C:/Users", html)
+        self.assertIn("Средняя зарплата - Программист", html)
+        self.assertIn("45.16%", html)
+        self.assertNotIn("Статистика по месяцам", html)
+        html = Report(REPORT_INFO, MONTH_INFO).render_html(template, "Программист", "graph_Программист.png")
+        self.assertIn("Статистика по месяцам", html)
+        self.assertIn("2008-01", html)
+        self.assertNotIn("graph-img\"", Report(REPORT_INFO).render_html(template, "Программист", None))
+
+    def test_pdf_requires_wkhtmltopdf(self):
+        path = os.environ.get("PATH", "")
+        os.environ["PATH"] = ""
+        try:
+            with self.assertRaises(FileNotFoundError):
+                Report.get_wkhtmltopdf_path()
+            with tempfile.TemporaryDirectory() as folder:
+                with self.assertRaises(FileNotFoundError):
+                    Report.generate_batch({"Программист": Report(REPORT_INFO)}, folder)
+                self.assertEqual(os.listdir(folder), [])
+        finally:
+            os.environ["PATH"] = path
+
+    def test_month_statistics_outputs(self):
+        with tempfile.TemporaryDirectory() as folder:
+            reports = {"Программист": Report(REPORT_INFO, MONTH_INFO), "Аналитик": Report(REPORT_INFO)}
+            file_names = Report.generate_batch(reports, folder, artifacts=("image", "excel"))
+            for write_only in (False, True):
+                Report(REPORT_INFO, MONTH_INFO).generate_excel("Программист", file_names["Программист"]["excel"],
+                                                               write_only=write_only)
+                worksheet = load_workbook(file_names["Программист"]["excel"])["Статистика по месяцам"]
+                self.assertEqual([[cell.value for cell in row] for row in worksheet.iter_rows()][1:],
+                                 [["2007-12", 38916, 43770, 2196, 317], ["2008-01", 43646, 50412, 1549, 0]])
+            self.assertEqual(load_workbook(file_names["Аналитик"]["excel"]).sheetnames,
+                             ["Cтатистика по годам", "Cтатистика по городам"])
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_entry_points_skip_heavy_modules(self):
+        for module_name in ("main", "vacancy", "statistics"):
+            (_, imported_modules) = measure_import_time(module_name, repeat=1)
+            self.assertEqual(imported_modules.intersection(HEAVY_MODULES), set(), module_name)
+
+
+class ExitTask:
+    def process(self, context):
+        os._exit(3)
+
+
+class UnpicklableResultTask:
+    def process(self, context):
+        return lambda: None
+
+
+class WorkerPoolTests(unittest.TestCase):
+    def test_size_at_least_one(self):
+        pool = WorkerPool(0)
+        try:
+            self.assertEqual(pool.processes, 1)
+            self.assertEqual(len(pool.map(ReadTask("years/2007.csv") for _ in range(2))), 2)
+        finally:
+            pool.close()
+
+    def test_results_keep_task_order(self):
+        pool = get_worker_pool(2)
+        vacancies = InputConnect().info_formatter(DataSet().get_vacancies_from_file("years/2007.csv"))
+        (first, second) = pool.map([CalculateTask("Программист", vacancies), CalculateTask("Javascript", vacancies)])
+        self.assertEqual(first, InputConnect().accumulate_statistics(vacancies, "Программист"))
+        self.assertEqual(second, InputConnect().accumulate_statistics(vacancies, "Javascript"))
+        self.assertIs(get_worker_pool(2), pool)
+
+    def test_task_error_is_raised(self):
+        with self.assertRaises(FileNotFoundError):
+            get_worker_pool(2).map([ReadTask("years/1900.csv")])
+
+    def test_unpicklable_result_is_raised(self):
+        pool = get_worker_pool(2)
+        with self.assertRaises(WorkerPoolError):
+            pool.map([UnpicklableResultTask(), ReadTask("years/2007.csv")])
+        self.assertIs(get_worker_pool(2), pool)
+        self.assertEqual(len(pool.map([ReadTask("years/2007.csv")])), 1)
+
+    def test_dead_worker_is_raised_and_pool_rebuilt(self):
+        pool = get_worker_pool(2)
+        with self.assertRaises(WorkerPoolError):
+            pool.map([ExitTask()])
+        new_pool = get_worker_pool(2)
+        self.assertIsNot(new_pool, pool)
+        self.assertEqual(len(new_pool.map(ReadTask("years/2007.csv") for _ in range(2))), 2)
+
+
+class CsvEngineTests(unittest.TestCase):
+    MALFORMED_CSV = ('\ufeffname,salary,area_name\r"Программист\r1С",100,Москва\rкороткая,1\r\rдлинная,1,2,3\r'
+                     '"ООО ""Ромашка""",,"Санкт-Петербург"\rтест,"1,5",Тюмень')
+
+    def read_malformed(self, engine):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "malformed.csv")
+            with open(file_path, "w", encoding="utf-8", newline="") as file:
+                file.write(self.MALFORMED_CSV)
+            return list(DataSet.iter_csv_rows(file_path, engine, chunk_size=16))
+
+    def test_csv_engine_semantics(self):
+        self.assertEqual(self.read_malformed("csv"),
+                         [["name", "salary", "area_name"], ["Программист\n1С", "100", "Москва"],
+                          ['ООО "Ромашка"', "", "Санкт-Петербург"], ["тест", "1,5", "Тюмень"]])
+
+    def assert_same_rows(self, engine):
+        self.assertEqual(self.read_malformed(engine), self.read_malformed("csv"), engine)
+        for file_path in ("years/2007.csv", "years/2008.csv"):
+            self.assertEqual(list(DataSet.iter_csv_rows(file_path, engine, chunk_size=4096)),
+                             list(DataSet.iter_csv_rows(file_path, "csv")), file_path)
+        self.assertEqual(DataSet(engine).csv_reader("years/2008.csv"), DataSet().csv_reader("years/2008.csv"))
+
+    @unittest.skipIf(find_spec("pandas") is None, "pandas не установлен")
+    def test_pandas_reads_same_rows(self):
+        self.assert_same_rows("pandas")
+
+    @unittest.skipIf(find_spec("pyarrow") is None, "pyarrow не установлен")
+    def test_pyarrow_reads_same_rows(self):
+        self.assert_same_rows("pyarrow")
+
+    def test_auto_engine(self):
+        self.assertEqual(DataSet.resolve_csv_engine("auto"), "csv")
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            DataSet.resolve_csv_engine("excel")
+
+
+class OfflineApiReader(ApiReader):
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.fetched_months = []
+
+    def get_month_quotes(self, month):
+        self.fetched_months.append(month)
+        return {"USD": 60.5 + int(month[5:]), "EUR": 70.25}
+
+
+class CachedResponseHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        CachedResponseHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f"ответ {self.path}".encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingHttpCache(HttpCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scans = 0
+
+    def evict(self, kept_path):
+        self.scans += 1
+        super().evict(kept_path)
+
+
+class HttpCacheTests(unittest.TestCase):
+    CBR_XML = ('<?xml version="1.0" encoding="windows-1251"?><ValCurs Date="01.02.2022" name="Foreign Currency Market">'
+               '<Valute ID="R01235"><NumCode>840</NumCode><CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США'
+               '</Name><Value>77,6713</Value></Valute><Valute ID="R01335"><NumCode>398</NumCode>'
+               '<CharCode>KZT</CharCode><Nominal>100</Nominal><Name>Тенге</Name><Value>17,8260</Value></Valute></ValCurs>').encode("cp1251")
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_ttl_and_revalidation(self):
+        server = HTTPServer(("127.0.0.1", 0), CachedResponseHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        CachedResponseHandler.requests = []
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/quotes"
+            cache = HttpCache(self.folder.name)
+            self.assertEqual(cache.get(url, {"b": 2, "a": 1}, ttl=None), "ответ /quotes?b=2&a=1".encode())
+            self.assertEqual(cache.get(url, {"a": 1, "b": 2}, ttl=None), "ответ /quotes?b=2&a=1".encode())
+            self.assertEqual(cache.get(url, {"a": 3}, ttl=0), "ответ /quotes?a=3".encode())
+            self.assertEqual(cache.get(url, {"a": 3}, ttl=0), "ответ /quotes?a=3".encode())
+            self.assertEqual(CachedResponseHandler.requests,
+                             [("/quotes?b=2&a=1", None), ("/quotes?a=3", None), ("/quotes?a=3", '"v1"')])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_offline_mode_and_eviction(self):
+        cache = HttpCache(self.folder.name, max_size=1500, offline=True)
+        with self.assertRaises(HttpCacheMiss):
+            cache.get("http://example.com/", {"page": 0})
+        for page in range(3):
+            cache.store("http://example.com/", bytes(600), {"page": page}, ttl=-1)
+        self.assertEqual(len(os.listdir(self.folder.name)), 2)
+        self.assertEqual(cache.get("http://example.com/", {"page": 2}), bytes(600))
+        with self.assertRaises(HttpCacheMiss):
+            cache.get("http://example.com/", {"page": 0})
+        self.assertEqual(cache.size, sum(os.path.getsize(os.path.join(self.folder.name, file_name))
+                                         for file_name in os.listdir(self.folder.name)))
+
+    def test_scan_only_above_max_size(self):
+        cache = CountingHttpCache(self.folder.name, max_size=3000, offline=True)
+        for page in range(4):
+            cache.store("http://example.com/", bytes(600), {"page": page})
+        self.assertEqual((cache.scans, len(os.listdir(self.folder.name))), (1, 4))
+        cache.store("http://example.com/", bytes(600), {"page": 4})
+        self.assertEqual((cache.scans, len(os.listdir(self.folder.name))), (2, 4))
+
+    def test_sources_through_cache(self):
+        cache = HttpCache(self.folder.name, offline=True)
+        cache.store(ApiReader.CBR_URL, self.CBR_XML, {"date_req": "01/02/2022"})
+        api_reader = ApiReader(os.path.join(self.folder.name, "quotes.db"), cache)
+        self.assertEqual(api_reader.get_month_quotes("2022-02"), {"USD": 77.6713, "KZT": 0.17826})
+        self.assertIsNone(ApiReader.get_month_ttl("2022-02", "2022-03-01"))
+        self.assertIsNotNone(ApiReader.get_month_ttl("2022-03", "2022-03-01"))
+        self.assertGreater(HHruApiConnect.get_day_ttl("2022-02-28", "2022-03-01"),
+                           HHruApiConnect.get_day_ttl("2022-03-01", "2022-03-01"))
+        with self.assertRaises(HttpCacheMiss):
+            HHruApiConnect(cache)._get_vacancy_data_from_HHru("2022-02-28", "00:00:00", "10:00:00", 0)
+
+
+class OfflineDataSet(DataSet):
+    def __init__(self, db_path):
+        super().__init__()
+        self.currency_db = OfflineApiReader(db_path)
+
+    def get_currency_db(self):
+        return self.currency_db
+
+
+class SplitCsvByYearTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, "vacancies.csv")
+        generator = random.Random(1)
+        with open(self.file_path, "w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"])
+            for i in range(13000):
+                currency = "RUR" if i % 2 == 0 else generator.choice(["USD"] * 9 + ["EUR"])
+                row = [generator.choice(["Программист", 'ООО "Ромашка"', "Аналитик,\nданные", ""]),
+                       generator.choice(["", "30000.0", "125000.0"]), generator.choice(["", "60000.0"]), currency,
+                       generator.choice(["Москва", "Тюмень"]),
+                       f"{2007 + i * 3 // 13000}-{generator.randint(1, 12):02d}-03T17:34:36+0300"]
+                writer.writerow(row[:-1] if i % 997 == 0 else row)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def split(self, processes, pipelined=False, partition="year", file_path=None, compression=None):
+        output_dir = os.path.join(self.folder.name, f"{partition}_{processes}_{pipelined}{compression or ''}")
+        os.makedirs(output_dir)
+        data_set = OfflineDataSet(os.path.join(output_dir, "quotes.db"))
+        data_set.split_csv_by_year(file_path or self.file_path, processes, chunk_size=32 * 1024, output_dir=output_dir,
+                                   pipelined=pipelined, partition=partition, compression=compression)
+        files = {}
+        for file_name in os.listdir(output_dir):
+            if file_name.endswith(".csv" + (compression or "")) or file_name.endswith(".json"):
+                with open_compressed(os.path.join(output_dir, file_name)) as file:
+                    files[file_name] = file.read()
+        return files, data_set.currency_db
+
+    def test_parallel_equals_serial(self):
+        (serial_files, serial_db) = self.split(1)
+        (parallel_files, parallel_db) = self.split(2)
+        self.assertEqual(sorted(serial_files), ["2007.csv", "2008.csv", "2009.csv", "manifest.json"])
+        self.assertEqual(parallel_files, serial_files)
+        self.assertEqual(serial_db.fetched_months, ApiReader.get_months(("2007", "2009")))
+        self.assertEqual(parallel_db.fetched_months, serial_db.fetched_months)
+        self.assertEqual(parallel_db.read_currency_quotes_from_db(["USD", "RUR"]),
+                         serial_db.read_currency_quotes_from_db(["USD", "RUR"]))
+
+    def test_pipelined_equals_serial(self):
+        (serial_files, serial_db) = self.split(1)
+        for processes in (1, 2):
+            (pipelined_files, pipelined_db) = self.split(processes, pipelined=True)
+            self.assertEqual(pipelined_files, serial_files)
+            self.assertEqual(pipelined_db.fetched_months, serial_db.fetched_months)
+            self.assertEqual(pipelined_db.read_currency_quotes_from_db(["USD", "RUR"]),
+                             serial_db.read_currency_quotes_from_db(["USD", "RUR"]))
+
+    def test_pipelined_saves_only_data_months(self):
+        (_, serial_db) = self.split(1)
+        data_set = OfflineDataSet(os.path.join(self.folder.name, "quotes.db"))
+        data_set.sample_year_borders = lambda file_path: ("2005", "2011")
+        os.makedirs(os.path.join(self.folder.name, "wide"))
+        data_set.split_csv_by_year(self.file_path, output_dir=os.path.join(self.folder.name, "wide"), pipelined=True)
+        self.assertEqual(data_set.currency_db.read_currency_quotes_from_db(["USD", "RUR"]),
+                         serial_db.read_currency_quotes_from_db(["USD", "RUR"]))
+
+    def test_compressed_input_and_partitions(self):
+        (serial_files, _) = self.split(1)
+        for (extension, compression) in ((".xz", ".gz"), (".gz", ".bz2")):
+            file_path = self.file_path + extension
+            with open(self.file_path, "rb") as source, open_compressed(file_path, "wb", 1) as target:
+                target.write(source.read())
+            for processes in (1, 2):
+                (files, _) = self.split(processes, True, file_path=file_path, compression=compression)
+                manifest = json.loads(files.pop("manifest.json"))
+                self.assertEqual({file_name.replace(compression, ""): data for (file_name, data) in files.items()},
+                                 {file_name: data for (file_name, data) in serial_files.items()
+                                  if file_name.endswith(".csv")})
+                self.assertEqual(list(manifest["files"]), [f"{year}.csv{compression}" for year in (2007, 2008, 2009)])
+                self.assertEqual(list(manifest["files"].values()),
+                                 list(json.loads(serial_files["manifest.json"])["files"].values()))
+        plain_paths = [os.path.join(self.folder.name, "year_1_False", f"{year}.csv") for year in (2007, 2008)]
+        compressed_paths = get_partition_paths(os.path.join(self.folder.name, "year_2_True.bz2"))[:2]
+        self.assertEqual(DataSet.get_file_chunks(compressed_paths[0], 1024),
+                         [(0, os.stat(compressed_paths[0]).st_size)])
+        self.assertEqual(vars(calculate_statistics(compressed_paths, "Программист", 2, chunk_size=1024)),
+                         vars(calculate_statistics(plain_paths, "Программист", 2, chunk_size=1024)))
+        self.assertEqual(DataSet().csv_reader(compressed_paths[1]), DataSet().csv_reader(plain_paths[1]))
+        with self.assertRaises(ValueError):
+            DataSet().split_csv_by_year(self.file_path, compression=".rar")
+
+    def test_month_partitions_and_manifest(self):
+        (serial_files, _) = self.split(1, partition="month")
+        self.assertEqual(self.split(2, partition="month")[0], serial_files)
+        self.assertEqual(self.split(2, pipelined=True, partition="month")[0], serial_files)
+        manifest = json.loads(serial_files.pop("manifest.json"))
+        self.assertEqual(manifest["partition"], "month")
+        self.assertEqual(list(manifest["files"]), sorted(serial_files))
+        self.assertEqual(len(serial_files), 36)
+        (year_files, _) = self.split(1)
+        for (file_name, info) in manifest["files"].items():
+            rows = list(csv.reader(serial_files[file_name].decode("utf-8-sig").split("\r")[1:-1]))
+            self.assertEqual(info, {"rows": len(rows), "min_published_at": min(row[3] for row in rows),
+                                    "max_published_at": max(row[3] for row in rows),
+                                    "min_salary": min(float(row[1]) for row in rows),
+                                    "max_salary": max(float(row[1]) for row in rows),
+                                    "areas": sorted(set(row[2] for row in rows))})
+            self.assertTrue(all(row[3].startswith(file_name[:7]) for row in rows))
+        self.assertEqual(sum(info["rows"] for info in manifest["files"].values()),
+                         sum(info["rows"] for info in json.loads(year_files["manifest.json"])["files"].values()))
+
+    def assertFilteredStatistics(self, file_paths, vacancy_filter, predicate):
+        expected_vacancies = [vacancy for file_path in file_paths
+                              for vacancy in DataSet().get_vacancies_from_file(file_path) if predicate(vacancy)]
+        self.assertEqual([vars(vacancy) for file_path in file_paths
+                          for vacancy in DataSet().get_vacancies_from_file(file_path, vacancy_filter=vacancy_filter)],
+                         [vars(vacancy) for vacancy in expected_vacancies])
+        expected = InputConnect.accumulate_statistics(expected_vacancies, "Программист")
+        for transport in ("pickle", "shared_memory"):
+            actual = calculate_statistics(file_paths, "Программист", 2, transport=transport,
+                                          vacancy_filter=vacancy_filter)
+            self.assertEqual((actual.salaries_year_level, actual.vacancies_year_count,
+                              actual.selected_salary_year_level, actual.selected_vacancy_year_count,
+                              actual.salaries_city_level, actual.vacancies_city_count),
+                             InputConnect().year_info_calculating(expected.years, expected.selected_years)
+                             + InputConnect._city_info_calculating(expected.cities))
+
+    def test_date_range_statistics(self):
+        self.split(2, partition="month")
+        output_dir = os.path.join(self.folder.name, "month_2_False")
+        vacancy_filter = VacancyFilter(date_range=("2008-03-02", "2008-06-30"))
+        file_paths = get_partition_paths(output_dir, vacancy_filter)
+        self.assertEqual(sorted(os.path.basename(file_path) for file_path in file_paths),
+                         ["2008-03.csv", "2008-04.csv", "2008-05.csv", "2008-06.csv"])
+        self.assertEqual(len(get_partition_paths(output_dir)), 36)
+        self.assertFilteredStatistics(file_paths, vacancy_filter,
+                                      lambda vacancy: "2008-03-02" <= vacancy.published_at[:10] <= "2008-06-30")
+        self.assertFilteredStatistics(["years/2008.csv"], VacancyFilter(date_range=("2008-03-15", "2008-06-10")),
+                                      lambda vacancy: "2008-03-15" <= vacancy.published_at[:10] <= "2008-06-10")
+
+    def test_area_and_salary_pushdown(self):
+        self.split(1, partition="month")
+        output_dir = os.path.join(self.folder.name, "month_1_False")
+        self.assertEqual(get_partition_paths(output_dir, VacancyFilter(areas=["Казань"])), [])
+        self.assertEqual(get_partition_paths(output_dir, VacancyFilter(salary_range=(1e9, None))), [])
+        self.assertEqual(len(get_partition_paths(output_dir, VacancyFilter(["Москва"], salary_range=(None, 1e9)))),
+                         36)
+        self.assertFilteredStatistics(["years/2007.csv", "years/2008.csv"],
+                                      VacancyFilter(["Москва", "Тюмень"], ("2007-06-01", None), (50000, 150000)),
+                                      lambda vacancy: vacancy.area_name in ("Москва", "Тюмень")
+                                      and vacancy.published_at[:10] >= "2007-06-01"
+                                      and 50000 <= float(vacancy.salary) <= 150000)
+
+    def test_last_months_range(self):
+        self.assertEqual(get_last_months_range(6, date(2022, 3, 15)), ("2021-10-01", "2022-03-15"))
+        self.assertEqual(get_last_months_range(1, date(2022, 1, 31)), ("2022-01-01", "2022-01-31"))
+
+    def test_sample_year_borders(self):
+        self.assertEqual(DataSet.sample_year_borders(self.file_path), ("2007", "2009"))
+        self.assertEqual(DataSet.sample_year_borders("years/2008.csv"), ("2008", "2008"))
+
+class ChunkedStatisticsTests(unittest.TestCase):
+    FILE_PATHS = ["years/2007.csv", "years/2008.csv"]
+
+    def test_chunks_equal_whole_file(self):
+        data_set = DataSet()
+        chunks = DataSet.get_file_chunks("years/2008.csv", 64 * 1024)
+        self.assertGreater(len(chunks), 1)
+        vacancies = [vacancy for (start, end) in chunks
+                     for vacancy in data_set.get_vacancies_from_file("years/2008.csv", start, end)]
+        expected = data_set.get_vacancies_from_file("years/2008.csv")
+        self.assertEqual([vars(vacancy) for vacancy in vacancies], [vars(vacancy) for vacancy in expected])
+
+    def test_month_statistics(self):
+        report = calculate_statistics(self.FILE_PATHS, "Программист", 2)
+        data_set = DataSet()
+        vacancies = [vacancy for file_path in self.FILE_PATHS
+                     for vacancy in data_set.get_vacancies_from_file(file_path)]
+        months = sorted(set(vacancy.published_at[:7] for vacancy in vacancies))
+        self.assertEqual(list(report.vacancies_month_count), months)
+        self.assertEqual(list(report.selected_vacancy_month_count), months)
+        for month in (months[0], months[len(months) // 2], months[-1]):
+            salaries = [float(vacancy.salary) for vacancy in vacancies if vacancy.published_at.startswith(month)]
+            selected = [float(vacancy.salary) for vacancy in vacancies
+                        if vacancy.published_at.startswith(month) and "Программист" in vacancy.name]
+            self.assertEqual(report.vacancies_month_count[month], len(salaries))
+            self.assertEqual(report.salaries_month_level[month], int(sum(salaries) / len(salaries)))
+            self.assertEqual(report.selected_vacancy_month_count[month], len(selected))
+        self.assertEqual(sum(report.vacancies_month_count.values()), len(vacancies))
+        shared = calculate_statistics(self.FILE_PATHS, "Программист", 2, transport="shared_memory")
+        self.assertEqual(vars(shared), vars(report))
+
+    def test_statistics_independent_of_chunk_size(self):
+        whole = calculate_statistics(self.FILE_PATHS, "Программист", 2, chunk_size=1 << 40)
+        chunked = calculate_statistics(self.FILE_PATHS, "Программист", 2, chunk_size=64 * 1024)
+        self.assertEqual(vars(chunked), vars(whole))
+
+
+class AccumulatorTests(unittest.TestCase):
+    SALARIES = [40000.0, 57500.0, 85000.0, 12000.5, 300000.0, 57500.0, 1.0]
+
+    @staticmethod
+    def accumulate(salaries):
+        accumulator = SalaryAccumulator()
+        for salary in salaries:
+            accumulator.add(salary)
+        return accumulator
+
+    def assertAccumulatorsEqual(self, first, second):
+        self.assertEqual((first.count, first.minimum, first.maximum), (second.count, second.minimum, second.maximum))
+        self.assertAlmostEqual(first.total, second.total, delta=abs(second.total) * 1e-12)
+        self.assertAlmostEqual(first.m2, second.m2, delta=abs(second.m2) * 1e-9)
+
+    def test_moments(self):
+        accumulator = self.accumulate(self.SALARIES)
+        mean = sum(self.SALARIES) / len(self.SALARIES)
+        self.assertAlmostEqual(accumulator.mean(), mean)
+        self.assertAlmostEqual(accumulator.variance(),
+                               sum((salary - mean) ** 2 for salary in self.SALARIES) / (len(self.SALARIES) - 1),
+                               delta=1e-3)
+        self.assertEqual(SalaryAccumulator().mean(), 0)
+
+    def test_merge_associative_and_commutative(self):
+        whole = self.accumulate(self.SALARIES)
+        (a, b, c) = (self.accumulate(self.SALARIES[:2]), self.accumulate(self.SALARIES[2:5]),
+                     self.accumulate(self.SALARIES[5:]))
+        for merged in (a.merge(b).merge(c), a.merge(b.merge(c)), c.merge(a).merge(b), b.merge(SalaryAccumulator())
+                       .merge(c).merge(a)):
+            self.assertAccumulatorsEqual(merged, whole)
+
+    def test_chunked_statistics_merge_to_whole(self):
+        data_set = DataSet()
+        whole = InputConnect.accumulate_statistics(data_set.get_vacancies_from_file("years/2008.csv"), "Программист")
+        parts = [InputConnect.accumulate_statistics(data_set.get_vacancies_from_file("years/2008.csv", start, end),
+                                                    "Программист")
+                 for (start, end) in DataSet.get_file_chunks("years/2008.csv", 128 * 1024)]
+        merged = parts[0]
+        for part in parts[:0:-1]:
+            merged = merged.merge(part)
+        for group in VacancyStatistics.GROUPS:
+            self.assertEqual(set(getattr(merged, group)), set(getattr(whole, group)), group)
+            for (key, accumulator) in getattr(whole, group).items():
+                self.assertAccumulatorsEqual(getattr(merged, group)[key], accumulator)
+        self.assertEqual(sorted(whole.months), [f"2008-{month:02d}" for month in range(1, 13)])
+
+
+class QuantileSketchTests(unittest.TestCase):
+    LEVELS = (0, 0.01, 0.25, 0.5, 0.75, 0.99, 1)
+
+    @staticmethod
+    def sketch(values, **kwargs):
+        sketch = QuantileSketch(**kwargs)
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def assertWithinRelativeError(self, sketch, values):
+        ordered = sorted(values)
+        for level in self.LEVELS:
+            exact = ordered[int(level * (len(ordered) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(level) - exact), sketch.relative_accuracy * exact + 1e-9,
+                                 level)
+
+    def test_relative_error_bound(self):
+        generator = random.Random(7)
+        for relative_accuracy in (0.01, 0.05):
+            values = [generator.lognormvariate(11, 1.2) for _ in range(20000)] + [1e8, 3.5]
+            sketch = self.sketch(values, relative_accuracy=relative_accuracy)
+            self.assertWithinRelativeError(sketch, values)
+            self.assertLessEqual(len(sketch.bins), sketch.get_key(max(values)) - sketch.get_key(min(values)) + 1)
+
+    def test_merge_is_exact(self):
+        generator = random.Random(3)
+        values = [generator.choice([15000.0, 40000.5, 120000.0, generator.uniform(1, 1e6)]) for _ in range(5000)]
+        (a, b, c) = (self.sketch(values[:100]), self.sketch(values[100:3000]), self.sketch(values[3000:]))
+        whole = self.sketch(values)
+        for merged in (a.merge(b).merge(c), c.merge(b.merge(a)), b.merge(QuantileSketch()).merge(c).merge(a)):
+            self.assertEqual(merged, whole)
+        self.assertEqual(whole.count(), len(values))
+        with self.assertRaises(ValueError):
+            whole.merge(QuantileSketch(0.02))
+
+    def test_bounded_bins(self):
+        values = [1.5 ** power for power in range(-200, 200)]
+        sketch = self.sketch(values, relative_accuracy=0.01, max_bins=64)
+        self.assertEqual(len(sketch.bins), 64)
+        self.assertEqual(sketch.count(), len(values))
+        ordered = sorted(values)
+        exact = ordered[int(0.99 * (len(ordered) - 1))]
+        self.assertLessEqual(abs(sketch.quantile(0.99) - exact), 0.01 * exact)
+
+    def test_empty_and_zero(self):
+        self.assertEqual(QuantileSketch().quantile(0.5), 0)
+        self.assertEqual(self.sketch([0, 0, 5000]).quantile(0.5), 0)
+        self.assertEqual(SalaryAccumulator().quantiles(), (0, 0, 0))
+
+    def test_report_quantiles(self):
+        report = calculate_statistics(["years/2007.csv", "years/2008.csv"], "Программист", 2)
+        vacancies = DataSet().get_vacancies_from_file("years/2008.csv")
+        salaries = sorted(float(vacancy.salary) for vacancy in vacancies)
+        for (level, estimate) in zip((0.25, 0.5, 0.75), report.salary_quantiles_year_level[2008]):
+            exact = salaries[int(level * (len(salaries) - 1))]
+            self.assertLessEqual(abs(estimate - exact), QuantileSketch.RELATIVE_ACCURACY * exact + 1)
+        self.assertEqual(list(report.salary_quantiles_city_level), list(report.salaries_city_level))
+        self.assertEqual(list(report.selected_salary_quantiles_year_level), [2007, 2008])
+
+
+class PreviewStatisticsTests(unittest.TestCase):
+    FILE_PATHS = ["years/2007.csv", "years/2008.csv", "years/2022.csv"]
+    EXACT_FIELDS = ("salaries_year_level", "vacancies_year_count", "selected_salary_year_level",
+                    "selected_vacancy_year_count", "salaries_city_level", "vacancies_city_count",
+                    "salaries_month_level", "vacancies_month_count", "selected_vacancy_month_count")
+
+    def test_reads_part_of_file(self):
+        context = {"data_set": DataSet(), "input_connect": InputConnect()}
+        exact = InputConnect().accumulate_statistics(DataSet().get_vacancies_from_file("years/2008.csv"), "")
+        (file_size, read_size, chunk_statistics) = SampleTask("Программист", "years/2008.csv", 0.2, 5).process(context)
+        statistics = reduce(VacancyStatistics.merge, chunk_statistics)
+        self.assertEqual(file_size, os.path.getsize("years/2008.csv"))
+        self.assertLess(read_size, file_size * 0.25)
+        self.assertLess(statistics.years[2008].count, exact.years[2008].count * 0.25)
+        self.assertGreater(statistics.years[2008].count, 0)
+        self.assertEqual(SampleTask("Программист", "years/2008.csv", 0.2, 5).process(context)[2], chunk_statistics)
+
+    def test_full_fraction_equals_exact(self):
+        exact = calculate_statistics(self.FILE_PATHS, "Программист", 2)
+        preview = calculate_preview_statistics(self.FILE_PATHS, "Программист", 1, processes=2)
+        for field in self.EXACT_FIELDS:
+            self.assertEqual(getattr(preview, field), getattr(exact, field), field)
+        for (year, (low, high)) in preview.confidence_intervals["salaries_year_level"].items():
+            self.assertEqual((low, high), (exact.salaries_year_level[year], exact.salaries_year_level[year]))
+
+    def test_seeded_estimate_covers_exact_values(self):
+        exact = calculate_statistics(self.FILE_PATHS, "Программист", 2)
+        preview = calculate_preview_statistics(self.FILE_PATHS, "Программист", 0.2, seed=5, processes=2)
+        self.assertEqual(vars(calculate_preview_statistics(self.FILE_PATHS, "Программист", 0.2, seed=5,
+                                                           processes=2)), vars(preview))
+        self.assertNotEqual(calculate_preview_statistics(self.FILE_PATHS, "Программист", 0.2, seed=6,
+                                                         processes=2).salaries_year_level,
+                            preview.salaries_year_level)
+        for (year, count) in exact.selected_salary_year_level.items():
+            self.assertAlmostEqual(preview.selected_salary_year_level[year] / count, 1, delta=0.05)
+        for (year, (low, high)) in preview.confidence_intervals["salaries_year_level"].items():
+            self.assertLessEqual(low, exact.salaries_year_level[year])
+            self.assertGreaterEqual(high, exact.salaries_year_level[year])
+        (low, high) = preview.confidence_intervals["vacancies_city_count"]["Москва"]
+        self.assertTrue(low <= float(exact.vacancies_city_count["Москва"][:-1]) <= high)
+        self.assertIn("Оценка по выборке 20%", preview.render_html(
+            Environment(loader=FileSystemLoader(".")).get_template("pdf_template.html"), "Программист"))
+        self.assertEqual(preview.get_extra_tables("Программист")[-1][0], "Доверительные интервалы")
+
+
+class HeavyHitterCityTests(unittest.TestCase):
+    FILE_PATHS = ["years/2007.csv", "years/2008.csv", "years/2022.csv"]
+    CITY_FIELDS = ("salaries_city_level", "vacancies_city_count", "salary_quantiles_city_level")
+
+    def test_space_saving_guarantees(self):
+        generator = random.Random(11)
+        items = [f"город {int(generator.paretovariate(0.8))}" for _ in range(20000)]
+        exact = {item: items.count(item) for item in set(items)}
+        parts = [SpaceSaving(50) for _ in range(4)]
+        for (i, item) in enumerate(items):
+            parts[i % 4].add(item)
+        counter = reduce(SpaceSaving.merge, parts)
+        self.assertEqual((len(counter.counts), counter.total), (50, len(items)))
+        for (item, count) in counter.counts.items():
+            self.assertGreaterEqual(count, exact.get(item, 0))
+            self.assertLessEqual(count - counter.errors[item], exact.get(item, 0))
+        frequent = [item for (item, count) in exact.items() if count > len(items) / 50]
+        self.assertTrue(set(frequent) <= set(counter.candidates(len(items) / 50)))
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+
+    def test_chunks_keep_only_counter(self):
+        statistics = VacancyStatistics(city_counter=SpaceSaving(2))
+        for (i, city) in enumerate(["Москва", "Казань", "Москва", "Пермь", "Москва", "Тверь"]):
+            statistics.add(float(i * 1000), "2022-01-03", city, i % 2 == 0)
+        self.assertEqual(statistics.cities, {})
+        self.assertEqual((statistics.city_counter.total, statistics.city_counter.counts),
+                         (6, {"Москва": 3, "Тверь": 3}))
+        self.assertEqual(statistics.years[2022].count, 6)
+        task = AccumulateTask("Программист", "years/2008.csv", city_capacity=3)
+        chunk_statistics = task.process({"data_set": DataSet(), "input_connect": InputConnect()})
+        self.assertEqual(chunk_statistics.cities, {})
+        self.assertLessEqual(len(chunk_statistics.city_counter.counts), 3)
+
+    def test_bounded_cities_equal_exact(self):
+        exact = calculate_statistics(self.FILE_PATHS, "Программист", 2)
+        for transport in ("pickle", "shared_memory"):
+            bounded = calculate_statistics(self.FILE_PATHS, "Программист", 2, chunk_size=64 * 1024,
+                                           transport=transport, city_capacity=200)
+            self.assertEqual(vars(bounded), vars(exact), transport)
+
+    def test_many_settlements(self):
+        generator = random.Random(5)
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "2022.csv")
+            with open(file_path, "w", encoding="utf-8-sig", newline="") as file:
+                writer = csv.writer(file, lineterminator="\r")
+                writer.writerow(["name", "salary", "area_name", "published_at"])
+                for i in range(30000):
+                    city = f"Посёлок {int(generator.paretovariate(1.1))}" if i % 3 else f"Село {i}"
+                    name = "Программист" if i % 4 == 0 else "Инженер"
+                    writer.writerow([name, float(generator.randint(1, 300) * 1000), city,
+                                     f"2022-{i % 12 + 1:02}-03T10:00:00+0300"])
+            exact = calculate_statistics([file_path], "Программист", 2, chunk_size=128 * 1024)
+            bounded = calculate_statistics([file_path], "Программист", 2, chunk_size=128 * 1024, city_capacity=150)
+        self.assertGreater(len(exact.vacancies_city_count), 3)
+        for field in self.CITY_FIELDS:
+            self.assertEqual(getattr(bounded, field), getattr(exact, field), field)
+
+
+class VacancyStoreTests(unittest.TestCase):
+    FILE_PATHS = ["years/2007.csv", "years/2008.csv", "years/2022.csv"]
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = VacancyStore(os.path.join(self.folder.name, "vacancies.db"))
+        self.store.load_files(self.FILE_PATHS)
+
+    def tearDown(self):
+        self.store.close()
+        self.folder.cleanup()
+
+    def test_statistics_equal_python_path(self):
+        vacancy_filters = [None, VacancyFilter(["Москва", "Саратов"]),
+                           VacancyFilter(None, ("2008-03-01", "2008-05-31"), (10000, 50000))]
+        for vacancy_name in ("Программист", "1С", ""):
+            for vacancy_filter in vacancy_filters:
+                expected = calculate_statistics(self.FILE_PATHS, vacancy_name, 2, vacancy_filter=vacancy_filter)
+                actual = self.store.calculate_statistics(vacancy_name, vacancy_filter)
+                self.assertEqual(vars(actual), vars(expected), vacancy_name)
+
+    def test_variance_of_large_salaries(self):
+        file_path = os.path.join(self.folder.name, "2022.csv")
+        with open(file_path, "w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file, lineterminator="\r")
+            writer.writerow(["name", "salary", "area_name", "published_at"])
+            for i in range(20000):
+                writer.writerow(["Программист" if i % 3 else "Инженер", 123456789.0 + i % 7 + 0.25 * (i % 5),
+                                 "Москва", f"2022-{i % 12 + 1:02}-03T10:00:00+0300"])
+        self.store.load_files([file_path])
+        expected = InputConnect().accumulate_statistics(DataSet().get_vacancies_from_file(file_path), "Программист")
+        actual = self.store.collect_statistics("Программист")
+        for group_name in ("years", "selected_years", "months", "cities"):
+            for (key, accumulator) in getattr(expected, group_name).items():
+                self.assertAlmostEqual(getattr(actual, group_name)[key].variance() / accumulator.variance(), 1,
+                                       delta=1e-9, msg=(group_name, key))
+
+    def test_search_and_reload(self):
+        self.assertEqual(self.store.cursor.execute("PRAGMA journal_mode;").fetchone()[0], "wal")
+        vacancies = [vacancy for file_path in self.FILE_PATHS
+                     for vacancy in DataSet().get_vacancies_from_file(file_path)]
+        for vacancy_name in ("Программист", "программист", "1С", 'ООО "', "С"):
+            self.assertEqual([vars(vacancy) for vacancy in self.store.find_vacancies(vacancy_name)],
+                             [vars(vacancy) for vacancy in vacancies if vacancy_name in vacancy.name], vacancy_name)
+        self.store.load_files(self.FILE_PATHS[:1])
+        self.assertEqual(len(self.store.find_vacancies("")), len(DataSet().get_vacancies_from_file(self.FILE_PATHS[0])))
+        plan = " ".join(str(row) for row in self.store.cursor.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM vacancies WHERE year = 2007 AND area_name = 'Москва';"))
+        self.assertIn("vacancies_year_area", plan)
+
+
+class SharedMemoryTransportTests(unittest.TestCase):
+    FILE_PATHS = ["years/2007.csv", "years/2008.csv"]
+
+    def test_same_statistics_as_pickle(self):
+        expected = calculate_statistics(self.FILE_PATHS, "Программист", 2, transport="pickle")
+        actual = calculate_statistics(self.FILE_PATHS, "Программист", 2, transport="shared_memory")
+        self.assertEqual(vars(actual), vars(expected))
+
+    def test_columns_match_vacancies(self):
+        columns = get_worker_pool(2).map([ColumnarReadTask("Программист", "years/2007.csv")])[0]
+        try:
+            vacancies = InputConnect().info_formatter(DataSet().get_vacancies_from_file("years/2007.csv"))
+            salaries = columns.apply(lambda views: views["salary"].tolist())
+            names = columns.apply(lambda views: [columns.area_names[code] for code in views["area_code"]])
+            self.assertEqual(salaries, [float(vacancy.salary) for vacancy in vacancies])
+            self.assertEqual(names, [vacancy.area_name for vacancy in vacancies])
+        finally:
+            columns.release()
+        with self.assertRaises(FileNotFoundError):
+            columns.apply(len)
+
+    def test_segments_released_on_error(self):
+        tasks = [ColumnarReadTask("Программист", "years/2007.csv"), ColumnarReadTask("Программист", "years/1900.csv")]
+        released = []
+        release = SharedColumns.release
+        SharedColumns.release = lambda columns: released.append(columns) or release(columns)
+        try:
+            with self.assertRaises(FileNotFoundError):
+                get_worker_pool(2).map(tasks)
+        finally:
+            SharedColumns.release = release
+        self.assertEqual(len(released), 1)
+        with self.assertRaises(FileNotFoundError):
+            released[0].apply(len)
+
+
+if __name__ == "__main__":
+    unittest.main()
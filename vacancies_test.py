@@ -1,5 +1,31 @@
+import csv
+import gzip
+import io
+import json
+import os
+import pickle
+import tempfile
 import unittest
-from vacancy import normalize_input_info, csv_filter, info_filter, info_sorter
+from contextlib import redirect_stdout
+from prettytable import PrettyTable, ALL
+from vacancy import normalize_input_info, csv_filter, info_filter, info_sorter, info_formatter, csv_reader, \
+    get_formatted_vacancies, print_vacancies, export_vacancies, find_csv_chunk_borders, parse_formatted_vacancies, \
+    CellMemo, open_compressed, open_text_file, get_cache_path
+
+VACANCIES_CSV = '''name,description,key_skills,experience_id,premium,employer_name,salary_from,salary_to,salary_gross,\
+salary_currency,area_name,published_at
+Программист,"<p>Пишет <b>код</b></p>","Python
+Git",between1And3,False,Яндекс,50000.0,80000.0,True,RUR,Москва,2022-07-05T18:19:30+0300
+Аналитик,<p>Считает</p>,SQL,noExperience,True,СКБ Контур,1000.0,2000.0,False,USD,Екатеринбург,2022-07-06T10:00:00+0300
+Тестировщик,<p>Проверяет</p>,,moreThan6,False,Яндекс,30000.0,40000.0,False,RUR,Москва,2022-07-07T11:00:00+0300
+'''
+
+
+def write_vacancies_csv(folder, text=VACANCIES_CSV):
+    file_name = os.path.join(folder, "vacancies.csv")
+    with open(file_name, mode="w", encoding="utf-8-sig", newline="") as file:
+        file.write(text)
+    return file_name
 
 
 class NormalizeInputTests(unittest.TestCase):
@@ -318,5 +344,232 @@ class InfoSorterTests(unittest.TestCase):
               "Дата публикации вакансии": "2012-12-27T12:49:59+0300#27.12.2012", "Название региона": "Кышма"}])
 
 
+class FormattedVacanciesCacheTests(unittest.TestCase):
+    def test_cached_result_equals_parsed(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = write_vacancies_csv(folder)
+            cache_dir = os.path.join(folder, "cache")
+            (headers, info) = csv_reader(file_name)
+            expected = info_formatter(csv_filter(headers, info))
+            self.assertEqual(get_formatted_vacancies(file_name, cache_dir), expected)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            self.assertEqual(get_formatted_vacancies(file_name, cache_dir), expected)
+
+    def test_changed_file_replaces_entry(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = write_vacancies_csv(folder)
+            cache_dir = os.path.join(folder, "cache")
+            get_formatted_vacancies(file_name, cache_dir)
+            write_vacancies_csv(folder, VACANCIES_CSV.replace("Яндекс", "Сбер"))
+            result = get_formatted_vacancies(file_name, cache_dir)
+            self.assertEqual([row["Компания"] for row in result], ["Сбер", "СКБ Контур"])
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_rewrite_keeping_size_and_mtime(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = write_vacancies_csv(folder)
+            cache_dir = os.path.join(folder, "cache")
+            os.utime(file_name, ns=(0, os.stat(file_name).st_mtime_ns - 60 * 10 ** 9))
+            file_stat = os.stat(file_name)
+            get_formatted_vacancies(file_name, cache_dir)
+            write_vacancies_csv(folder, VACANCIES_CSV.replace("Яндекс", "Яндекф"))
+            os.utime(file_name, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+            self.assertEqual(os.stat(file_name).st_size, file_stat.st_size)
+            result = get_formatted_vacancies(file_name, cache_dir)
+            self.assertEqual([row["Компания"] for row in result], ["Яндекф", "СКБ Контур"])
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_fresh_entry_skips_content_check(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = write_vacancies_csv(folder)
+            cache_dir = os.path.join(folder, "cache")
+            expected = get_formatted_vacancies(file_name, cache_dir)
+            cache_path = get_cache_path(file_name, cache_dir)
+            with open(cache_path, "rb") as file:
+                (_, keys, rows) = pickle.load(file)
+            with open(cache_path, "wb") as file:
+                pickle.dump(("другой хэш", keys, rows), file)
+            future = os.stat(file_name).st_ctime_ns + 10 ** 9
+            os.utime(cache_path, ns=(future, future))
+            self.assertEqual(get_formatted_vacancies(file_name, cache_dir), expected)
+            os.utime(cache_path, ns=(0, 0))
+            self.assertEqual(get_formatted_vacancies(file_name, cache_dir), expected)
+            with open(cache_path, "rb") as file:
+                self.assertNotEqual(pickle.load(file)[0], "другой хэш")
+
+    def test_size_eviction(self):
+        with tempfile.TemporaryDirectory() as folder:
+            cache_dir = os.path.join(folder, "cache")
+            first_name = write_vacancies_csv(folder)
+            get_formatted_vacancies(first_name, cache_dir)
+            os.makedirs(os.path.join(folder, "other"))
+            second_name = write_vacancies_csv(os.path.join(folder, "other"))
+            get_formatted_vacancies(second_name, cache_dir, cache_max_size=1)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+
+class PrintVacanciesTests(unittest.TestCase):
+    table_fields = ["№", "Название", "Описание", "Навыки", "Опыт работы", "Премиум-вакансия", "Компания", "Оклад",
+                    "Название региона", "Дата публикации вакансии"]
+
+    @staticmethod
+    def render_full_table(info_dictionaries, start_end_nums, table_fields):
+        info_table = PrettyTable(PrintVacanciesTests.table_fields[1:])
+        for info_dictionary in info_dictionaries:
+            values = list(info_dictionary.values())
+            values.pop(2)
+            info_table.add_row(values)
+        published_at_data = list(filter(lambda x: x != '', info_table.get_string(
+            fields=["Дата публикации вакансии"], border=False, header=False).replace(' ', '').split('\n')))
+        info_table.del_column("Дата публикации вакансии")
+        info_table.add_column("Дата публикации вакансии", [x[x.find('#') + 1:] for x in published_at_data])
+        info_table.add_autoindex('№')
+        info_table.hrules = ALL
+        info_table.align = 'l'
+        info_table.max_width = 20
+        return info_table.get_string(start=start_end_nums[0], end=start_end_nums[1], fields=table_fields) + "\n"
+
+    def assert_same_output(self, start_end_nums, table_fields):
+        (headers, info) = csv_reader(self.file_name)
+        info_dictionaries = info_formatter(csv_filter(headers, info)) * 7
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_vacancies(info_dictionaries, start_end_nums, table_fields)
+        self.assertEqual(output.getvalue(),
+                         self.render_full_table(info_dictionaries, start_end_nums, table_fields))
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_name = write_vacancies_csv(self.folder.name)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_full_range(self):
+        self.assert_same_output([0, 10000], self.table_fields)
+
+    def test_window(self):
+        self.assert_same_output([3, 9], ["№", "Название", "Оклад", "Дата публикации вакансии"])
+
+    def test_window_after_end(self):
+        self.assert_same_output([20, 10000], self.table_fields)
+
+
+class ExportVacanciesTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.info_dictionaries = get_formatted_vacancies(write_vacancies_csv(self.folder.name), None)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_csv_gzip_export(self):
+        file_name = os.path.join(self.folder.name, "export.csv.gz")
+        self.assertEqual(export_vacancies(self.info_dictionaries, file_name,
+                                          ["№", "Название", "Навыки", "Дата публикации вакансии"]), 2)
+        with gzip.open(file_name, "rt", encoding="utf-8", newline='') as file:
+            self.assertEqual(list(csv.reader(file)),
+                             [["№", "Название", "Навыки", "Дата публикации вакансии"],
+                              ["1", "Программист", "Python\nGit", "05.07.2022"],
+                              ["2", "Аналитик", "SQL", "06.07.2022"]])
+
+    def test_compressed_jsonl_export(self):
+        file_name = os.path.join(self.folder.name, "export.jsonl.xz")
+        export_vacancies(self.info_dictionaries, file_name, ["№", "Название"])
+        with open_text_file(file_name) as file:
+            self.assertEqual([json.loads(line) for line in file],
+                             [{"№": 1, "Название": "Программист"}, {"№": 2, "Название": "Аналитик"}])
+
+    def test_jsonl_export_skips_unknown_fields(self):
+        file_name = os.path.join(self.folder.name, "export.jsonl")
+        export_vacancies(iter(self.info_dictionaries), file_name, ["№", "Компания", "Опыт"])
+        with open(file_name, encoding="utf-8") as file:
+            self.assertEqual([json.loads(line) for line in file],
+                             [{"№": 1, "Компания": "Яндекс"}, {"№": 2, "Компания": "СКБ Контур"}])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_vacancies(self.info_dictionaries, os.path.join(self.folder.name, "export.xml"), ["№"])
+
+
+class ParallelFormattingTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_borders_skip_quoted_newlines(self):
+        file_name = write_vacancies_csv(self.folder.name, 'a,b\n"1\n2",3\n4,5\n')
+        self.assertEqual(find_csv_chunk_borders(file_name, 1), [(0, 7), (7, 15), (15, 19)])
+
+    def test_borders_with_carriage_return_terminator(self):
+        file_name = write_vacancies_csv(self.folder.name, 'a,b\r"1\r2",3\r4,5')
+        self.assertEqual(find_csv_chunk_borders(file_name, 5, 7), [(7, 15), (15, 18)])
+
+    def test_parallel_equals_serial(self):
+        (header, rows) = VACANCIES_CSV.split("Программист", 1)
+        file_name = write_vacancies_csv(self.folder.name, header + ("Программист" + rows) * 5)
+        self.assertEqual(parse_formatted_vacancies(file_name, 2, 64), parse_formatted_vacancies(file_name))
+
+    def test_compressed_input(self):
+        file_name = write_vacancies_csv(self.folder.name)
+        for extension in (".gz", ".bz2", ".xz"):
+            with open(file_name, "rb") as source, open_compressed(file_name + extension, "wb", 1) as target:
+                target.write(source.read())
+            self.assertEqual(csv_reader(file_name + extension), csv_reader(file_name))
+            self.assertEqual(parse_formatted_vacancies(file_name + extension, 2, 64),
+                             parse_formatted_vacancies(file_name))
+
+
+class CellMemoTests(unittest.TestCase):
+    def test_counters(self):
+        memos = {}
+        csv_filter(["name", "published_at"], [["<b>Ячейка</b>", "a"], ["<b>Ячейка</b>", "b"]] * 3, memos)
+        self.assertEqual(memos["normalize:name"].statistics(), {"hits": 5, "misses": 1, "enabled": True})
+        self.assertEqual(memos["normalize:published_at"].statistics(), {"hits": 0, "misses": 0, "enabled": False})
+
+    def test_disabled_on_low_hit_rate(self):
+        memo = CellMemo(str.upper, probe_size=10)
+        for value in range(10):
+            memo(str(value))
+        self.assertEqual(memo.statistics(), {"hits": 0, "misses": 10, "enabled": False})
+        self.assertEqual(memo("a"), "A")
+        self.assertEqual(memo.statistics(), {"hits": 0, "misses": 10, "enabled": False})
+
+    def test_kept_on_high_hit_rate(self):
+        memo = CellMemo(str.upper, probe_size=10)
+        for _ in range(20):
+            memo("a")
+        self.assertEqual(memo.statistics(), {"hits": 19, "misses": 1, "enabled": True})
+
+    def test_formatter_memos(self):
+        memos = {}
+        info_formatter([{"salary_from": "10000.0", "published_at": "2022-07-05T18:19:30+0300"}] * 4, memos)
+        self.assertEqual(memos["format:salary_from"].statistics(), {"hits": 3, "misses": 1, "enabled": True})
+        self.assertEqual(memos["format:published_at"].statistics(), {"hits": 3, "misses": 1, "enabled": True})
+
+    def test_shared_memos_across_stages(self):
+        with tempfile.TemporaryDirectory() as folder:
+            (title, info) = csv_reader(write_vacancies_csv(folder))
+        memos = {}
+        shared = info_formatter(csv_filter(title, info, memos), memos)
+        self.assertEqual(shared, info_formatter(csv_filter(title, info)))
+        self.assertEqual(shared[0]["Оклад"], "50 000 - 80 000 (Рубли) (Без вычета налогов)")
+        self.assertIn("normalize:salary_from", memos)
+        self.assertIn("format:salary_from", memos)
+
+    def test_statistics_surfaced(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = write_vacancies_csv(folder)
+            (serial, parallel) = ({}, {})
+            parse_formatted_vacancies(file_name, 1, memo_statistics=serial)
+            parse_formatted_vacancies(file_name, 2, 64, memo_statistics=parallel)
+        for memo_statistics in (serial, parallel):
+            self.assertEqual(memo_statistics["normalize:area_name"]["hits"] + memo_statistics["normalize:area_name"]
+                             ["misses"], 2)
+            self.assertFalse(memo_statistics["normalize:description"]["enabled"])
+
+
 if __name__ == "__main__":
     unittest.main()
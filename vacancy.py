@@ -1,9 +1,17 @@
 import csv
 import re
 import os
-from functools import cmp_to_key
-from prettytable import PrettyTable
-from prettytable import ALL
+import io
+import mmap
+import gzip
+import bz2
+import lzma
+import multiprocessing
+import json
+import hashlib
+import pickle
+from functools import cmp_to_key, lru_cache
+from importlib.util import find_spec
 
 
 def normalize_input_info(input_info):
@@ -65,7 +73,7 @@ def csv_reader(file_name):
     Returns:
         title, info: Результат чтения
     """
-    with open(file_name, encoding="utf-8-sig") as file:
+    with open_text_file(file_name, encoding="utf-8-sig") as file:
         reader = [x for x in csv.reader(file)]
         title = reader.pop(0)
         titleCount = len(title)
@@ -73,12 +81,155 @@ def csv_reader(file_name):
     return title, info
 
 
-def csv_filter(title, info):
+MEMOIZED_COLUMNS = ("name", "key_skills", "experience_id", "premium", "employer_name", "salary_from", "salary_to",
+                    "salary_gross", "salary_currency", "area_name")
+
+
+class CellMemo:
+    """Ограниченный LRU-кэш функции обработки ячеек одного столбца. Каждые probe_size вызовов проверяется доля
+        попаданий, и если она ниже min_hit_rate, кэш отключается
+
+    Attributes:
+        function (Callable[[str], str]): Функция обработки ячейки
+        enabled (bool): Используется ли кэш
+        min_hit_rate (float): Минимальная доля попаданий, при которой кэш остаётся включённым
+        probe_size (int): Количество вызовов между проверками доли попаданий
+        calls (int): Количество вызовов с момента последней проверки
+        hits (int): Количество попаданий в кэш на момент последней проверки
+        misses (int): Количество промахов кэша на момент последней проверки
+    """
+
+    def __init__(self, function, enabled=True, max_size=4096, min_hit_rate=0.3, probe_size=4096):
+        """Инициализация объекта CellMemo
+
+        Args:
+            function (Callable[[str], str]): Функция обработки ячейки
+            enabled (bool): Включён ли кэш изначально
+            max_size (int): Максимальное количество значений в кэше
+            min_hit_rate (float): Минимальная доля попаданий, при которой кэш остаётся включённым
+            probe_size (int): Количество вызовов между проверками доли попаданий
+        """
+        self.function = function
+        self.cached_function = lru_cache(max_size)(function)
+        self.enabled = enabled
+        self.min_hit_rate = min_hit_rate
+        self.probe_size = probe_size
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, value):
+        """Обработка ячейки через кэш, если он включён
+
+        Args:
+            value (str): Значение ячейки
+
+        Returns:
+            str: Результат обработки
+        """
+        if not self.enabled:
+            return self.function(value)
+        result = self.cached_function(value)
+        self.calls += 1
+        if self.calls == self.probe_size:
+            self.update_counters()
+        return result
+
+    def update_counters(self):
+        """Обновление счётчиков по LRU-кэшу и отключение кэша, если доля попаданий с прошлой проверки низкая
+
+        """
+        info = self.cached_function.cache_info()
+        (window_hits, window_misses) = (info.hits - self.hits, info.misses - self.misses)
+        (self.hits, self.misses) = (info.hits, info.misses)
+        self.calls = 0
+        if window_hits < self.min_hit_rate * (window_hits + window_misses):
+            self.enabled = False
+            self.cached_function.cache_clear()
+
+    def statistics(self):
+        """Получение счётчиков кэша
+
+        Returns:
+            dict[str: int | bool]: Попадания, промахи и включён ли кэш
+        """
+        if self.enabled:
+            info = self.cached_function.cache_info()
+            return {"hits": info.hits, "misses": info.misses, "enabled": True}
+        return {"hits": self.hits, "misses": self.misses, "enabled": False}
+
+
+def get_memo(memos, key, function, enabled=True):
+    """Получение кэша из словаря кэшей; кэш создаётся, только если его ещё нет
+
+    Args:
+        memos (dict[str: CellMemo]): Кэши по ключам
+        key (str): Ключ кэша вида "этап:столбец"
+        function (Callable[[str], str]): Функция обработки ячейки
+        enabled (bool): Включён ли новый кэш изначально
+
+    Returns:
+        CellMemo: Кэш
+    """
+    if key not in memos:
+        memos[key] = CellMemo(function, enabled)
+    return memos[key]
+
+
+def get_memo_statistics(memos):
+    """Получение счётчиков всех кэшей
+
+    Args:
+        memos (dict[str: CellMemo]): Кэши по ключам
+
+    Returns:
+        dict[str: dict[str: int | bool]]: Счётчики по ключам, см. CellMemo.statistics
+    """
+    return {key: memo.statistics() for (key, memo) in memos.items()}
+
+
+def merge_memo_statistics(first, second):
+    """Сложение счётчиков кэшей разных частей файла. Кэш считается включённым, если он остался включённым
+        хотя бы в одной части
+
+    Args:
+        first (dict[str: dict[str: int | bool]]): Счётчики по ключам
+        second (dict[str: dict[str: int | bool]]): Счётчики по ключам
+
+    Returns:
+        dict[str: dict[str: int | bool]]: Сложенные счётчики
+    """
+    merged = dict(first)
+    for (key, statistics) in second.items():
+        if key not in merged:
+            merged[key] = statistics
+            continue
+        merged[key] = {"hits": merged[key]["hits"] + statistics["hits"],
+                       "misses": merged[key]["misses"] + statistics["misses"],
+                       "enabled": merged[key]["enabled"] or statistics["enabled"]}
+    return merged
+
+
+def print_memo_statistics(memo_statistics):
+    """Печать счётчиков кэшей обработки ячеек
+
+    Args:
+        memo_statistics (dict[str: dict[str: int | bool]]): Счётчики по ключам
+    """
+    for (key, statistics) in memo_statistics.items():
+        print(f"{key}: попаданий {statistics['hits']}, промахов {statistics['misses']}, "
+              f"{'включён' if statistics['enabled'] else 'отключён'}")
+
+
+def csv_filter(title, info, memos=None):
     """Преобразование данных из csv файла в список словарей
 
         Args:
             title (list[str]): Названия столбцов
             info (list[list[str]]): Основные данные csv файла
+            memos (dict[str: CellMemo] | None): Кэши по ключам; кэши нормализации хранятся под ключами
+                "normalize:столбец", недостающие создаются и добавляются в словарь, чтобы вызывающий код мог
+                прочитать их счётчики. Один словарь можно передавать и в info_formatter
 
         Returns:
             list[dict[str,str]]: Список строк в виде словарей
@@ -98,20 +249,26 @@ def csv_filter(title, info):
         temp_info = re.sub(r"\s+", " ", temp_info)
         return str.strip(temp_info)
 
+    if memos is None:
+        memos = {}
+    normalizers = [get_memo(memos, f"normalize:{column}", normalize_csv_file, column in MEMOIZED_COLUMNS)
+                   for column in title]
     info_dictionaries = []
     for info_row in info:
         info_dictionary = {}
         for i in range(len(title)):
-            info_dictionary[title[i]] = normalize_csv_file(info_row[i])
+            info_dictionary[title[i]] = normalizers[i](info_row[i])
         info_dictionaries.append(info_dictionary)
     return info_dictionaries
 
 
-def info_formatter(vacancies):
+def info_formatter(vacancies, memos=None):
     """Нормализация данных в вакансиях
 
     Args:
         vacancies (list[Vacancy] | Vacancy): Список вакансий
+        memos (dict[str: CellMemo] | None): Кэши по ключам; кэши форматирования окладов и дат хранятся под ключами
+            "format:столбец", недостающие создаются и добавляются в словарь
 
     Returns:
         list[Vacancy] | Vacancy: Результат форматирования
@@ -145,7 +302,7 @@ def info_formatter(vacancies):
             new_info_dictionary (dict[str,str]): Новый список словарей для результата общего метода
             value (str): Значение оклада
         """
-        new_info_dictionary['Оклад'] = formatter_string_number(value)
+        new_info_dictionary['Оклад'] = salary_from_memo(value)
 
     def formatter_salary_to(new_info_dictionary, value):
         """Преобразование верхней линии оклада в нормированный вид
@@ -154,7 +311,7 @@ def info_formatter(vacancies):
             new_info_dictionary (dict[str,str]): Новый список словарей для результата общего метода
             value (str): Значение оклада
         """
-        new_info_dictionary['Оклад'] = f"{new_info_dictionary['Оклад']} - {formatter_string_number(value)}"
+        new_info_dictionary['Оклад'] = f"{new_info_dictionary['Оклад']} - {salary_to_memo(value)}"
 
     def formatter_salary_currency(new_info_dictionary, value):
         """Преобразование валюты, написаной на английском, к русскому виду
@@ -182,7 +339,18 @@ def info_formatter(vacancies):
             new_info_dictionary (dict[str,str]): Новый список словарей для результата общего метода
             value (str): Значение времени выкладывания вакансии для форматирования
         """
-        new_info_dictionary["Дата публикации вакансии"] = f"{value}#{value[8:10]}.{value[5:7]}.{value[0:4]}"
+        new_info_dictionary["Дата публикации вакансии"] = f"{value}#{published_at_memo(value[0:10])}"
+
+    def formatter_date(date):
+        """Преобразование даты из вида ГГГГ-ММ-ДД в вид ДД.ММ.ГГГГ
+
+        Args:
+            date (str): Дата для форматирования
+
+        Returns:
+            str: Результат форматирования
+        """
+        return f"{date[8:10]}.{date[5:7]}.{date[0:4]}"
 
     def formatter_premium(new_info_dictionary, value):
         """Преобразование значения премиум вакансии, написаного на английском, к русскому виду
@@ -252,17 +420,365 @@ def info_formatter(vacancies):
         "area_name": formatter_standard_field_value
     }
 
+    if memos is None:
+        memos = {}
+    salary_from_memo = get_memo(memos, "format:salary_from", formatter_string_number)
+    salary_to_memo = get_memo(memos, "format:salary_to", formatter_string_number)
+    published_at_memo = get_memo(memos, "format:published_at", formatter_date)
+
     formatted_info_dictionaries = []
     for info_dictionary in vacancies:
         formatted_info_dictionary = {}
         for item_key, item_value in info_dictionary.items():
-            dic_func[item_key](formatted_info_dictionary, item_value, item_key)
+            if item_key in dic_naming:
+                dic_func[item_key](formatted_info_dictionary, item_value, item_key)
+            else:
+                dic_func[item_key](formatted_info_dictionary, item_value)
         if 'salary_currency' in formatted_info_dictionary:
             formatted_info_dictionary.pop('salary_currency')
         formatted_info_dictionaries.append(formatted_info_dictionary)
     return formatted_info_dictionaries
 
 
+CHUNK_SIZE = 8 * 1024 * 1024
+
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma", ".zst": "zstandard"}
+COMPRESSION_LEVELS = {".gz": 6, ".bz2": 9, ".xz": 6, ".zst": 3}
+
+
+def get_compression(file_name):
+    """Определение сжатия файла по расширению
+
+    Args:
+        file_name (str): Имя файла
+
+    Returns:
+        str | None: Расширение сжатия из COMPRESSIONS; None - файл не сжат
+    """
+    return next((extension for extension in COMPRESSIONS if file_name.endswith(extension)), None)
+
+
+def open_compressed(file_name, mode="rb", level=None):
+    """Открытие файла в двоичном режиме с потоковым сжатием или распаковкой по расширению: .gz, .bz2, .xz и, если
+        установлен пакет zstandard, .zst. Несжатые файлы открываются как есть. Сжатые файлы нельзя читать
+        с произвольного байта, поэтому они не делятся на диапазоны и читаются целиком
+
+    Args:
+        file_name (str): Имя файла
+        mode (str): "rb", "wb" или "ab"
+        level (int | None): Уровень сжатия при записи; None - из COMPRESSION_LEVELS
+
+    Returns:
+        io.BufferedIOBase: Двоичный поток
+    """
+    compression = get_compression(file_name)
+    if compression is None:
+        return open(file_name, mode)
+    level = COMPRESSION_LEVELS[compression] if level is None else level
+    writing = mode[0] != "r"
+    if compression == ".gz":
+        return gzip.open(file_name, mode, compresslevel=level)
+    if compression == ".bz2":
+        return bz2.open(file_name, mode, compresslevel=level)
+    if compression == ".xz":
+        return lzma.open(file_name, mode, preset=level if writing else None)
+    if find_spec("zstandard") is None:
+        raise ValueError(f"Для сжатия .zst нужен пакет zstandard: {file_name}")
+    import zstandard
+
+    return zstandard.open(file_name, mode, cctx=zstandard.ZstdCompressor(level=level) if writing else None)
+
+
+def open_text_file(file_name, mode="r", encoding="utf-8", newline=None, level=None):
+    """Открытие файла в текстовом режиме; сжатие выбирается по расширению, см. open_compressed
+
+    Args:
+        file_name (str): Имя файла
+        mode (str): "r", "w" или "a"
+        encoding (str): Кодировка
+        newline (str | None): Обработка переводов строк, как у open
+        level (int | None): Уровень сжатия при записи
+
+    Returns:
+        io.TextIOWrapper: Текстовый поток
+    """
+    if get_compression(file_name) is None:
+        return open(file_name, mode, encoding=encoding, newline=newline)
+    return io.TextIOWrapper(open_compressed(file_name, f"{mode}b", level), encoding=encoding, newline=newline)
+
+
+LINE_END_PATTERN = re.compile(rb'[\r\n]')
+
+
+def find_csv_chunk_borders(file_name, chunk_size, start=0, end=None, max_count=None):
+    """Разбиение csv файла на диапазоны байтов примерно по chunk_size, границы которых совпадают с концами
+        записей. Концом записи считается "\\r", "\\n" или "\\r\\n" вне кавычек
+
+    Args:
+        file_name (str): Имя csv файла
+        chunk_size (int): Желаемый размер диапазона в байтах
+        start (int): Смещение начала первой записи
+        end (int | None): Смещение конца последней записи; None - конец файла
+        max_count (int | None): Максимальное количество диапазонов
+
+    Returns:
+        list[tuple[int, int]]: Начало и конец каждого диапазона
+    """
+    borders = []
+    with open(file_name, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return borders
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = len(data) if end is None else end
+
+            def is_record_end(position):
+                return data[position - 1] in b'\r\n' and data[position - 1:position + 1] != b'\r\n'
+
+            chunk_start = start
+            while chunk_start < end and (max_count is None or len(borders) < max_count):
+                position = min(chunk_start + max(chunk_size, 1), end)
+                quoted = data[chunk_start:position].count(b'"') % 2 == 1
+                while position < end and (quoted or not is_record_end(position)):
+                    line_end = LINE_END_PATTERN.search(data, position, end)
+                    line_end = end if line_end is None else line_end.end()
+                    quoted ^= data[position:line_end].count(b'"') % 2 == 1
+                    position = line_end
+                borders.append((chunk_start, position))
+                chunk_start = position
+    return borders
+
+
+def read_csv_chunk(file_name, start, end, encoding="utf-8"):
+    """Чтение записей csv файла из диапазона байтов
+
+    Args:
+        file_name (str): Имя csv файла
+        start (int): Начало диапазона
+        end (int): Конец диапазона
+        encoding (str): Кодировка файла
+
+    Returns:
+        list[list[str]]: Записи из диапазона
+    """
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    return list(csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding=encoding)))
+
+
+def format_csv_chunk(task):
+    """Чтение, очистка и форматирование вакансий из одного диапазона байтов csv файла. Выполняется в процессе пула
+
+    Args:
+        task (tuple[str, list[str], int, int]): Имя csv файла, названия столбцов, начало и конец диапазона
+
+    Returns:
+        tuple[list[dict[str,str]], dict[str: dict[str: int | bool]]]: Отформатированные вакансии диапазона
+            и счётчики кэшей обработки ячеек
+    """
+    (file_name, title, start, end) = task
+    info = [data for data in read_csv_chunk(file_name, start, end) if '' not in data and len(data) == len(title)]
+    memos = {}
+    return info_formatter(csv_filter(title, info, memos), memos), get_memo_statistics(memos)
+
+
+def get_formatted_vacancies_parallel(file_name, processes=None, chunk_size=CHUNK_SIZE, memo_statistics=None):
+    """Чтение, очистка и форматирование вакансий пулом процессов. Файл делится на диапазоны байтов по границам
+        записей, каждый процесс сам разбирает свой диапазон, порядок строк сохраняется. Сжатый файл (см.
+        open_compressed) на диапазоны не делится и разбирается в текущем процессе
+
+    Args:
+        file_name (str): Имя csv файла
+        processes (int | None): Количество процессов; None - по числу ядер
+        chunk_size (int): Размер диапазона в байтах
+        memo_statistics (dict | None): Словарь, в который добавляются сложенные по частям счётчики кэшей обработки
+            ячеек
+
+    Returns:
+        list[dict[str,str]]: Отформатированные вакансии
+    """
+    if memo_statistics is None:
+        memo_statistics = {}
+    if get_compression(file_name) is not None:
+        (title, info) = csv_reader(file_name)
+        memos = {}
+        formatted_info = info_formatter(csv_filter(title, info, memos), memos)
+        memo_statistics.update(merge_memo_statistics(memo_statistics, get_memo_statistics(memos)))
+        return formatted_info
+    header_borders = find_csv_chunk_borders(file_name, 1, max_count=1)
+    if len(header_borders) == 0:
+        return []
+    header_end = header_borders[0][1]
+    title = read_csv_chunk(file_name, 0, header_end, "utf-8-sig")[0]
+    tasks = [(file_name, title, start, end) for (start, end) in find_csv_chunk_borders(file_name, chunk_size,
+                                                                                         header_end)]
+    formatted_info = []
+    with multiprocessing.Pool(processes) as pool:
+        for (chunk, chunk_statistics) in pool.imap(format_csv_chunk, tasks):
+            formatted_info.extend(chunk)
+            memo_statistics.update(merge_memo_statistics(memo_statistics, chunk_statistics))
+    return formatted_info
+
+
+CACHE_DIR = ".vacancy_cache"
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+
+def get_cache_path(file_name, cache_dir):
+    """Получение пути к файлу кэша для csv файла. Ключ строится по пути, размеру и времени изменения файла без
+        чтения содержимого; содержимое проверяется по хэшу при чтении кэша, см. read_vacancies_cache
+
+    Args:
+        file_name (str): Имя csv файла
+        cache_dir (str): Папка с файлами кэша
+
+    Returns:
+        str: Путь к файлу кэша
+    """
+    file_stat = os.stat(file_name)
+    path_hash = hashlib.blake2b(os.path.abspath(file_name).encode(), digest_size=8).hexdigest()
+    state_hash = hashlib.blake2b(f"{file_stat.st_size}:{file_stat.st_mtime_ns}".encode(), digest_size=16)
+    return os.path.join(cache_dir, f"{path_hash}_{state_hash.hexdigest()}.pickle")
+
+
+def get_content_hash(file_name):
+    """Хэш содержимого файла
+
+    Args:
+        file_name (str): Имя файла
+
+    Returns:
+        str: Хэш содержимого
+    """
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(file_name, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+def read_vacancies_cache(cache_path, file_name):
+    """Чтение отформатированных вакансий из файла кэша. Размер и время изменения csv файла можно сохранить при
+        перезаписи (cp -p, touch -r, rsync), но время изменения его метаданных (ctime) при этом обновляется. Поэтому
+        если запись кэша не новее ctime файла, содержимое файла сверяется с хэшем из записи; иначе файл не читается
+
+    Args:
+        cache_path (str): Путь к файлу кэша
+        file_name (str): Имя csv файла
+
+    Returns:
+        list[dict[str,str]] | None: Отформатированные вакансии; None - запись устарела или в старом формате
+    """
+    with open(cache_path, 'rb') as file:
+        entry = pickle.load(file)
+        entry_mtime_ns = os.fstat(file.fileno()).st_mtime_ns
+    if not isinstance(entry, tuple) or len(entry) != 3:
+        return None
+    (content_hash, keys, rows) = entry
+    if entry_mtime_ns <= os.stat(file_name).st_ctime_ns and get_content_hash(file_name) != content_hash:
+        return None
+    os.utime(cache_path)
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def write_vacancies_cache(cache_path, info_dictionaries, cache_max_size, content_hash):
+    """Запись отформатированных вакансий в файл кэша в виде хэша содержимого csv файла, заголовка и кортежей
+        значений. Устаревшие записи
+        для того же csv файла удаляются, а самые старые записи вытесняются, пока кэш больше cache_max_size.
+        Записи, которые за это время удалил другой процесс, пропускаются
+
+    Args:
+        cache_path (str): Путь к файлу кэша
+        info_dictionaries (list[dict[str,str]]): Отформатированные вакансии
+        cache_max_size (int): Максимальный размер папки кэша в байтах
+        content_hash (str): Хэш содержимого csv файла, см. get_content_hash
+    """
+    cache_dir, cache_name = os.path.split(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    keys = tuple(info_dictionaries[0].keys()) if len(info_dictionaries) != 0 else ()
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        pickle.dump((content_hash, keys, [tuple(dic.values()) for dic in info_dictionaries]), file,
+                    pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+
+    path_prefix = cache_name[:cache_name.find('_') + 1]
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith(".pickle") or entry.name == cache_name:
+            continue
+        try:
+            if entry.name.startswith(path_prefix):
+                os.remove(entry.path)
+            else:
+                entry_stat = entry.stat()
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+        except FileNotFoundError:
+            continue
+    cache_size = os.stat(cache_path).st_size + sum(entry[1] for entry in entries)
+    for (_, size, path) in sorted(entries):
+        if cache_size <= cache_max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        cache_size -= size
+
+
+def parse_formatted_vacancies(file_name, processes=1, chunk_size=CHUNK_SIZE, memo_statistics=None):
+    """Чтение, очистка и форматирование вакансий из csv файла в одном процессе или пулом процессов
+
+    Args:
+        file_name (str): Имя csv файла
+        processes (int | None): Количество процессов; 1 - без пула, None - по числу ядер
+        chunk_size (int): Размер диапазона байтов для одного процесса пула
+        memo_statistics (dict | None): Словарь, в который добавляются счётчики кэшей обработки ячеек,
+            см. get_memo_statistics
+
+    Returns:
+        list[dict[str,str]]: Отформатированные вакансии
+    """
+    if processes == 1:
+        (headers, info) = csv_reader(file_name)
+        memos = {}
+        formatted_info = info_formatter(csv_filter(headers, info, memos), memos)
+        if memo_statistics is not None:
+            memo_statistics.update(get_memo_statistics(memos))
+        return formatted_info
+    return get_formatted_vacancies_parallel(file_name, processes, chunk_size, memo_statistics)
+
+
+def get_formatted_vacancies(file_name, cache_dir=CACHE_DIR, cache_max_size=CACHE_MAX_SIZE, processes=1,
+                            chunk_size=CHUNK_SIZE, memo_statistics=None):
+    """Чтение, очистка и форматирование вакансий из csv файла. Если файл не менялся с прошлого запуска,
+        результат берётся из кэша на диске
+
+    Args:
+        file_name (str): Имя csv файла
+        cache_dir (str | None): Папка с файлами кэша; None отключает кэш
+        cache_max_size (int): Максимальный размер папки кэша в байтах
+        processes (int | None): Количество процессов для разбора; 1 - без пула, None - по числу ядер
+        chunk_size (int): Размер диапазона байтов для одного процесса пула
+        memo_statistics (dict | None): Словарь для счётчиков кэшей обработки ячеек; при попадании в кэш на диске
+            остаётся пустым
+
+    Returns:
+        list[dict[str,str]]: Отформатированные вакансии
+    """
+    if cache_dir is None:
+        return parse_formatted_vacancies(file_name, processes, chunk_size, memo_statistics)
+    cache_path = get_cache_path(file_name, cache_dir)
+    if os.path.isfile(cache_path):
+        formatted_info = read_vacancies_cache(cache_path, file_name)
+        if formatted_info is not None:
+            return formatted_info
+    content_hash = get_content_hash(file_name)
+    formatted_info = parse_formatted_vacancies(file_name, processes, chunk_size, memo_statistics)
+    write_vacancies_cache(cache_path, formatted_info, cache_max_size, content_hash)
+    return formatted_info
+
+
 def info_filter(info_dictionaries, filtering_parameter):
     """Фильтрация списка словарей, соответствующих строкам csv файла
         Args:
@@ -447,46 +963,114 @@ def info_sorter(info_dictionaries, sort_field, reverse_sort):
     return info_dictionaries
 
 
+TABLE_FIELDS = [
+    "№",
+    "Название",
+    "Описание",
+    "Навыки",
+    "Опыт работы",
+    "Премиум-вакансия",
+    "Компания",
+    "Оклад",
+    "Название региона",
+    "Дата публикации вакансии"
+]
+
+
 def print_vacancies(info_dictionaries, start_end_nums, table_fields):
-    """Печать талицы с вакансиями
+    """Печать талицы с вакансиями. В таблицу попадают только строки из диапазона вывода, дата публикации
+        переводится в вид ДД.ММ.ГГГГ при добавлении строки
 
     Args:
         info_dictionaries (list[dict[str,str]]): Список словарей
         start_end_nums (list[int, int]): Диапозон номеров вакансий
         table_fields (list[str]): Название столбцов для вывода в таблицу
     """
-    info_table = PrettyTable([
-        "Название",
-        "Описание",
-        "Навыки",
-        "Опыт работы",
-        "Премиум-вакансия",
-        "Компания",
-        "Оклад",
-        "Название региона",
-        "Дата публикации вакансии"
-    ])
-    for info_dictionary in info_dictionaries:
-        values = list(map(lambda key: info_dictionary[key], info_dictionary))
+    from prettytable import PrettyTable, ALL
+
+    info_table = PrettyTable(TABLE_FIELDS)
+    for index in range(len(info_dictionaries))[start_end_nums[0]:start_end_nums[1]]:
+        values = list(info_dictionaries[index].values())
         values.pop(2)
-        info_table.add_row(values)
-    published_at_data = list(filter(lambda x: x != '', info_table.get_string(
-        fields=["Дата публикации вакансии"], border=False, header=False).replace(' ', '').split('\n')))
-    info_table.del_column("Дата публикации вакансии")
-    info_table.add_column("Дата публикации вакансии", list(map(lambda x: x[x.find('#') + 1:], published_at_data)))
-    info_table.add_autoindex('№')
+        values[8] = values[8][values[8].find('#') + 1:]
+        info_table.add_row([index + 1] + values)
     info_table.hrules = ALL
     info_table.align = 'l'
     info_table.max_width = 20
-    print(info_table.get_string(start=start_end_nums[0], end=start_end_nums[1], fields=table_fields))
+    print(info_table.get_string(fields=table_fields))
+
+
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+
+def open_export_file(file_name, level=None):
+    """Открытие файла для потоковой записи через буфер. Сжатие выбирается по расширению, см. open_compressed
+
+    Args:
+        file_name (str): Имя файла для записи
+        level (int | None): Уровень сжатия; None - из COMPRESSION_LEVELS
+
+    Returns:
+        io.TextIOWrapper: Текстовый поток для записи
+    """
+    if get_compression(file_name) is not None:
+        return io.TextIOWrapper(io.BufferedWriter(open_compressed(file_name, 'wb', level), EXPORT_BUFFER_SIZE),
+                                encoding="utf-8", newline='')
+    return open(file_name, mode="w", encoding="utf-8", newline='', buffering=EXPORT_BUFFER_SIZE)
+
+
+def export_vacancies(info_dictionaries, file_name, table_fields):
+    """Потоковая запись отфильтрованных и отсортированных вакансий в csv или jsonl файл, по одной строке за раз.
+        Формат выбирается по расширению: .csv, .jsonl и они же со сжатием, например .csv.gz или .jsonl.xz
+
+    Args:
+        info_dictionaries (Iterable[dict[str,str]]): Вакансии после фильтрации и сортировки
+        file_name (str): Имя файла для записи
+        table_fields (list[str]): Название столбцов для записи
+
+    Returns:
+        int: Количество записанных вакансий
+    """
+    compression = get_compression(file_name)
+    export_format = file_name[:-len(compression)] if compression is not None else file_name
+    export_format = export_format[export_format.rfind('.') + 1:]
+    if export_format not in ("csv", "jsonl"):
+        raise ValueError(f"Неизвестный формат экспорта: {export_format}")
+    table_fields = [field for field in table_fields if field in TABLE_FIELDS]
+    date_index = table_fields.index("Дата публикации вакансии") if "Дата публикации вакансии" in table_fields \
+        else None
+    count = 0
+    with open_export_file(file_name) as file:
+        if export_format == "csv":
+            file_writer = csv.writer(file)
+            file_writer.writerow(table_fields)
+        for count, info_dictionary in enumerate(info_dictionaries, 1):
+            values = [count if field == '№' else info_dictionary[field] for field in table_fields]
+            if date_index is not None:
+                values[date_index] = values[date_index][values[date_index].find('#') + 1:]
+            if export_format == "csv":
+                file_writer.writerow(values)
+            else:
+                file.write(json.dumps(dict(zip(table_fields, values)), ensure_ascii=False))
+                file.write('\n')
+    return count
 
 
 ######################################################################################################################
 
 
-def get_vacancies():
+def get_vacancies(cache_dir=CACHE_DIR, cache_max_size=CACHE_MAX_SIZE, export_file_name=None, processes=1,
+                  chunk_size=CHUNK_SIZE, debug=False):
     """Получение информации с csv файла в виде таблицы с вакансиями на основе вводимых пользователем данных
 
+    Args:
+        cache_dir (str | None): Папка с кэшем отформатированных вакансий; None отключает кэш
+        cache_max_size (int): Максимальный размер папки кэша в байтах
+        export_file_name (str | None): Файл csv/jsonl (можно .gz), в который выгружаются все найденные вакансии
+            вместо печати таблицы
+        processes (int | None): Количество процессов для разбора файла; 1 - без пула, None - по числу ядер
+        chunk_size (int): Размер диапазона байтов для одного процесса пула
+        debug (bool): Печатать счётчики попаданий и промахов кэшей обработки ячеек
     """
     input_requests = [
         "Введите название файла: ",
@@ -500,14 +1084,19 @@ def get_vacancies():
     normalize_result = normalize_input_info(input_info)
     if normalize_result != "Нормализация прошла успешно":
         return normalize_result
-    (headers, info) = csv_reader(input_info[0])
-    filtered_csv_data = csv_filter(headers, info)
-    if len(filtered_csv_data) == 0:
+    memo_statistics = {}
+    formatted_info = get_formatted_vacancies(input_info[0], cache_dir, cache_max_size, processes, chunk_size,
+                                             memo_statistics)
+    if debug:
+        print_memo_statistics(memo_statistics)
+    if len(formatted_info) == 0:
         return "Нет данных"
-    formatted_info = info_formatter(filtered_csv_data)
     filtered_info = info_filter(formatted_info, input_info[1])
     if len(filtered_info) == 0:
         return "Ничего не найдено"
     if input_info[2] != '№':
         filtered_info = info_sorter(filtered_info, input_info[2], input_info[3])
+    if export_file_name is not None:
+        export_vacancies(filtered_info, export_file_name, input_info[5])
+        return
     print_vacancies(filtered_info, input_info[4], input_info[5])